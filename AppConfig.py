@@ -2,6 +2,9 @@ import os
 import sys
 
 from status_updater import StatusUpdater
+from state_cache import StateCache
+from artifact_cache import ArtifactCache
+from http_cache import HttpJsonCache
 
 class AppConfig:
     _instance = None
@@ -20,7 +23,35 @@ class AppConfig:
             self.env_path = os.path.join(self.base_path, "env")  # Open WebUI environment
             self.env_pipelines_path = os.path.join(self.base_path, "env_pipelines")  # Pipelines environment
             self.pipelines_repo_path = os.path.join(self.base_path, "pipelines")
+            self.pipelines_clone_depth = 1  # Shallow clone depth for the pipelines repository; None clones the full history
+            self.pipelines_ref = None  # Optional branch, tag or commit SHA to pin the pipelines repository to
             self.conda_exe = os.path.join(self.miniconda_path, "Scripts", "conda.exe")
+            self.install_state = None  # Set by InstallStateProbe once startup probing completes
+            self.state_cache = StateCache(os.path.join(self.base_path, "install_state_cache.json"))
+            self.download_workers = 4  # Parallel connections for range-capable downloads
+            self.download_chunk_size = 8 * 1024 * 1024  # Size of each parallel byte range
+            self.artifact_cache = ArtifactCache(
+                os.path.join(self.base_path, "cache"),
+                max_bytes=10 * 1024 ** 3,  # Installers, conda packages and pip wheels kept across reinstalls
+            )
+            self.http_cache = HttpJsonCache(os.path.join(self.base_path, "http_cache.json"))
+            self.update_check_ttl = 6 * 60 * 60  # Seconds a release metadata response is used without revalidation
+            self.openwebui_update_channel = "stable"  # "stable" or "prerelease"
+            self.openwebui_max_version = None  # Optional highest Open WebUI version updates may install, e.g. "0.5.20"
+            self.env_backend = "conda"  # "conda" or "micromamba"
+            self.package_backend = "pip"  # "pip" or "uv"
+            self.micromamba_exe = os.path.join(self.base_path, "micromamba", "micromamba.exe")
+            self.uv_exe = os.path.join(self.base_path, "uv", "uv.exe")
+            self.use_env_templates = True  # Clone new environments from a prebuilt python=3.11 template
+            self.offline_bundle_dir = os.path.join(self.base_path, "offline_bundle")
+            self.offline_bundle = None  # Set to an OfflineBundle when installing from an imported bundle
+            self.logs_dir = os.path.join(self.base_path, "logs")  # Output of the Open WebUI and Pipelines servers
+            self.server_log_max_bytes = 10 * 1024 * 1024  # Size at which a server log is rotated
+            self.server_log_backups = 3  # Rotated server logs kept per server
+            self.supervisor_status_port = 8765  # Local port of the ProcessSupervisor status API
+            self.openwebui_start_timeout = 30 * 60  # Seconds Open WebUI may take to answer; the first start downloads models
+            self.dedup_after_install = True  # Hardlink identical package files across environments after installs
+            self.force_dependency_install = False  # Reinstall requirements on update even if requirements.txt is unchanged
 
     @staticmethod
     def get_default_base_path():
@@ -72,6 +103,34 @@ class AppConfig:
             return False
         return True
 
+    def env_state_paths(self, env_path):
+        """
+        Returns the files whose mtime/size change whenever packages in a Conda environment change.
+        Used to invalidate cached facts about that environment.
+        """
+        return [
+            os.path.join(env_path, "conda-meta", "history"),
+            os.path.join(env_path, "Lib", "site-packages"),
+            os.path.join(env_path, "lib", "python3.11", "site-packages"),
+        ]
+
+    @property
+    def pipelines_state_paths(self):
+        """
+        Returns the files whose mtime/size change whenever the pipelines repository HEAD moves.
+        """
+        git_dir = os.path.join(self.pipelines_repo_path, ".git")
+        head_file = os.path.join(git_dir, "HEAD")
+        paths = [head_file, os.path.join(git_dir, "packed-refs")]
+        try:
+            with open(head_file, "r", encoding="utf-8") as f:
+                head = f.read().strip()
+            if head.startswith("ref: "):
+                paths.append(os.path.join(git_dir, *head[len("ref: "):].split("/")))
+        except OSError:
+            pass
+        return paths
+
     @property
     def status_display(self):
         """Get or create the StatusDisplay."""
@@ -1,11 +1,11 @@
 import os
 import shutil
 import sys
-import requests
 import pythoncom
 from win32com.shell import shell, shellcon
 from win32com.client import Dispatch
 from AppConfig import AppConfig
+from downloader import Downloader
 
 
 class AppDesktopIntegration:
@@ -35,13 +35,10 @@ class AppDesktopIntegration:
         try:
             if not os.path.exists(self.exe_path):
                 print("Executable not found. Downloading...")
-                response = requests.get(self.repo_url, stream=True)
-                if response.status_code == 200:
-                    with open(self.exe_path, "wb") as exe_file:
-                        shutil.copyfileobj(response.raw, exe_file)
-                    print("Executable downloaded successfully.")
-                else:
-                    raise Exception(f"Failed to download the executable. HTTP Code: {response.status_code}")
+                # Prefer the versioned asset URL, which comes with a published checksum
+                asset_url, sha256 = Downloader.github_release_asset("BrainDriveAI/InstallerAutoUpdater", self.exe_name)
+                Downloader().download(asset_url or self.repo_url, self.exe_path, sha256=sha256)
+                print("Executable downloaded successfully.")
             else:
                 print("Executable already exists.")
         except Exception as e:
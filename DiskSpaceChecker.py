@@ -1,15 +1,89 @@
 import os
 import shutil
+import threading
+import time
+from contextlib import contextmanager
 from AppConfig import AppConfig
 
 class DiskSpaceChecker:
-    def __init__(self):
+    """
+    Shared monitor for the free space on the drive holding the base path.
+
+    Free space is sampled on a background thread: every IDLE_INTERVAL seconds normally,
+    and every ACTIVE_INTERVAL seconds while an install or download is writing to disk.
+    Callers read the cached sample instead of issuing their own disk_usage call, and
+    cards can subscribe to be told when free space crosses their required size.
+    """
+    _instance = None
+
+    IDLE_INTERVAL = 60.0
+    ACTIVE_INTERVAL = 2.0
+
+    def __new__(cls):
+        if not cls._instance:
+            cls._instance = super(DiskSpaceChecker, cls).__new__(cls)
+            cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
         """
-        Initializes the DiskSpaceChecker class.
+        Initializes the DiskSpaceChecker singleton.
         Fetches the base path directory from the AppConfig singleton.
         """
-        self.config = AppConfig()
-        self.base_path = self.config.base_path
+        if not hasattr(self, "base_path"):  # Prevent reinitialization
+            self.config = AppConfig()
+            self.base_path = self.config.base_path
+            self.lock = threading.Lock()
+            self.wakeup = threading.Event()
+            self.free_bytes = None
+            self.sampled_at = 0.0
+            self.active_count = 0
+            self.subscriptions = []  # [required_bytes, callback, last_result]
+            self.thread = None
+
+    @property
+    def interval(self):
+        return self.ACTIVE_INTERVAL if self.active_count else self.IDLE_INTERVAL
+
+    def _path_to_check(self):
+        if os.path.exists(self.base_path):
+            return self.base_path
+        return os.path.splitdrive(self.base_path)[0] or os.path.dirname(self.base_path)  # Use the drive, e.g., "C:\\"
+
+    def sample(self):
+        """
+        Reads the free space now, updates the cached reading and notifies subscribers of threshold crossings.
+        :return: Free space in bytes.
+        """
+        total, used, free = shutil.disk_usage(self._path_to_check())
+        with self.lock:
+            self.free_bytes = free
+            self.sampled_at = time.monotonic()
+            crossed = []
+            for subscription in self.subscriptions:
+                required_bytes, callback, last_result = subscription
+                enough = free >= required_bytes
+                if enough != last_result:
+                    subscription[2] = enough
+                    crossed.append((callback, enough))
+        for callback, enough in crossed:
+            try:
+                callback(enough, free)
+            except Exception as e:
+                print(f"Error in disk space callback: {e}")
+        return free
+
+    def free_space(self, max_age=None):
+        """
+        Returns the free space in bytes from the cached reading, sampling only if it is older than max_age.
+        :param max_age: Maximum age of the reading in seconds; defaults to the current sampling interval.
+        """
+        max_age = self.interval if max_age is None else max_age
+        with self.lock:
+            free_bytes, sampled_at = self.free_bytes, self.sampled_at
+        if free_bytes is None or time.monotonic() - sampled_at > max_age:
+            return self.sample()
+        return free_bytes
 
     def has_enough_space(self, required_space_gb):
         """
@@ -21,17 +95,8 @@ class DiskSpaceChecker:
             # Convert required space from string to float
             required_space_gb = float(required_space_gb)
 
-            # Determine the path to check
-            path_to_check = self.base_path
-            if not os.path.exists(self.base_path):
-                print(f"Base path does not exist. Falling back to the drive: {os.path.splitdrive(self.base_path)[0]}")
-                path_to_check = os.path.splitdrive(self.base_path)[0]  # Use the drive, e.g., "C:\\"
-
-            # Get the free space in bytes
-            total, used, free = shutil.disk_usage(path_to_check)
-
             # Convert free space from bytes to GB
-            free_space_gb = free / (1024 ** 3)
+            free_space_gb = self.free_space() / (1024 ** 3)
 
             return free_space_gb >= required_space_gb
         except ValueError:
@@ -40,3 +105,52 @@ class DiskSpaceChecker:
         except Exception as e:
             print(f"Error checking disk space: {e}")
             return False
+
+    def subscribe(self, required_space_gb, callback):
+        """
+        Calls callback(enough, free_bytes) now and whenever free space crosses the required size.
+        Callbacks run on the monitor thread.
+        :param required_space_gb: The required space in GB as a string (e.g., "3.5").
+        """
+        required_bytes = float(required_space_gb) * 1024 ** 3
+        with self.lock:
+            self.subscriptions.append([required_bytes, callback, None])
+        self.start()
+        self.wakeup.set()  # Sample right away so the subscriber gets its first reading
+
+    def unsubscribe(self, callback):
+        with self.lock:
+            self.subscriptions = [s for s in self.subscriptions if s[1] is not callback]
+
+    @contextmanager
+    def active(self):
+        """
+        Marks a disk-heavy operation (install, download) so free space is sampled at the fast rate while it runs.
+        """
+        with self.lock:
+            self.active_count += 1
+        self.wakeup.set()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.active_count -= 1
+            self.wakeup.set()
+
+    def start(self):
+        """
+        Starts the sampling thread if it is not running yet.
+        """
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.sample()
+            except OSError as e:
+                print(f"Error checking disk space: {e}")
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
@@ -0,0 +1,194 @@
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+
+
+class PortWatch:
+    """
+    The monitored state of one local server.
+    """
+    def __init__(self, name, port, health_path):
+        self.name = name
+        self.port = port
+        self.health_path = health_path
+        self.state = None  # "down", "starting" (port open, health check failing) or "healthy"
+        self.backoff = PortMonitor.MIN_BACKOFF
+        self.next_check = 0.0
+        self.subscribers = []
+
+
+class PortMonitor:
+    """
+    Watches the local servers (Open WebUI, Pipelines, Ollama) from a single background thread
+    and publishes state changes to subscribers.
+
+    While a server is down or starting its port is probed with exponential backoff, so a
+    server that is expected to start is noticed within a fraction of a second while idle
+    ports cost almost nothing. Once the port accepts connections, an HTTP request to the
+    server's health endpoint decides whether it is actually serving; healthy servers are
+    then re-checked at a slow, fixed interval.
+    """
+    _instance = None
+
+    MIN_BACKOFF = 0.25  # Seconds between probes right after a start is expected
+    MAX_BACKOFF = 8.0  # Longest gap between probes of a server that is down
+    HEALTH_INTERVAL = 10.0  # Seconds between health checks of a healthy server
+    CONNECT_TIMEOUT = 0.5
+    HTTP_TIMEOUT = 2.0
+
+    DEFAULT_WATCHES = [
+        ("open-webui", 8080, "/health"),
+        ("pipelines", 9099, "/"),
+        ("ollama", 11434, "/"),
+    ]
+
+    def __new__(cls):
+        if not cls._instance:
+            cls._instance = super(PortMonitor, cls).__new__(cls)
+            cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        if not hasattr(self, "watches"):  # Prevent reinitialization
+            self.watches = {}
+            self.lock = threading.Lock()
+            self.wakeup = threading.Event()
+            self.thread = None
+            for name, port, health_path in self.DEFAULT_WATCHES:
+                self.watch(name, port, health_path)
+
+    def watch(self, name, port, health_path="/"):
+        """
+        Adds a server to monitor.
+        :param name: Unique name of the server, e.g. "open-webui".
+        :param port: The local port the server listens on.
+        :param health_path: HTTP path that answers once the server is serving.
+        """
+        with self.lock:
+            self.watches[name] = PortWatch(name, port, health_path)
+        self.wakeup.set()
+
+    def subscribe(self, name, callback):
+        """
+        Registers a callback for state changes of a server and starts monitoring.
+        The callback runs on the monitor thread as callback(name, state). If the state
+        is already known, the callback is called once right away.
+        """
+        with self.lock:
+            watch = self.watches[name]
+            watch.subscribers.append(callback)
+            state = watch.state
+        if state is not None:
+            self._notify(callback, name, state)
+        self.start()
+
+    def unsubscribe(self, name, callback):
+        with self.lock:
+            if callback in self.watches[name].subscribers:
+                self.watches[name].subscribers.remove(callback)
+
+    def get_state(self, name):
+        """
+        Returns the last known state of a server, or None if it was not checked yet.
+        """
+        with self.lock:
+            return self.watches[name].state
+
+    def expect(self, name):
+        """
+        Tells the monitor a server is being started, so it is probed at the fastest rate again.
+        """
+        with self.lock:
+            watch = self.watches[name]
+            watch.backoff = self.MIN_BACKOFF
+            watch.next_check = 0.0
+        self.start()
+        self.wakeup.set()
+
+    def wait_for(self, name, states=("healthy",), timeout=None):
+        """
+        Blocks until a server reaches one of the given states.
+        :return: True if the state was reached, False on timeout.
+        """
+        reached = threading.Event()
+
+        def on_change(_, state):
+            if state in states:
+                reached.set()
+
+        self.subscribe(name, on_change)
+        try:
+            return reached.wait(timeout)
+        finally:
+            self.unsubscribe(name, on_change)
+
+    def start(self):
+        """
+        Starts the monitor thread if it is not running yet.
+        """
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                due = [watch for watch in self.watches.values() if watch.next_check <= now]
+            for watch in due:
+                self._check(watch)
+
+            with self.lock:
+                next_check = min(watch.next_check for watch in self.watches.values())
+            self.wakeup.wait(max(next_check - time.monotonic(), 0))
+            self.wakeup.clear()
+
+    def _check(self, watch):
+        if not self._port_open(watch.port):
+            state = "down"
+        elif self._healthy(watch):
+            state = "healthy"
+        else:
+            state = "starting"
+
+        with self.lock:
+            if state == "healthy":
+                watch.backoff = self.MIN_BACKOFF
+                watch.next_check = time.monotonic() + self.HEALTH_INTERVAL
+            else:
+                watch.next_check = time.monotonic() + watch.backoff
+                watch.backoff = min(watch.backoff * 2, self.MAX_BACKOFF)
+            changed = state != watch.state
+            watch.state = state
+            subscribers = list(watch.subscribers)
+
+        if changed:
+            print(f"{watch.name} (port {watch.port}) is {state}.")
+            for callback in subscribers:
+                self._notify(callback, watch.name, state)
+
+    @staticmethod
+    def _notify(callback, name, state):
+        try:
+            callback(name, state)
+        except Exception as e:
+            print(f"Error in {name} state callback: {e}")
+
+    def _port_open(self, port):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.CONNECT_TIMEOUT)
+            return sock.connect_ex(("127.0.0.1", port)) == 0
+
+    def _healthy(self, watch):
+        url = f"http://127.0.0.1:{watch.port}{watch.health_path}"
+        try:
+            with urllib.request.urlopen(url, timeout=self.HTTP_TIMEOUT) as response:
+                return response.status < 500
+        except urllib.error.HTTPError as e:
+            # The server answered, so it is serving even if this path is not a health endpoint
+            return e.code < 500
+        except OSError:
+            return False
@@ -0,0 +1,408 @@
+import json
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import psutil
+from AppConfig import AppConfig
+from PortMonitor import PortMonitor
+from server_log import ServerLog
+
+
+class ManagedProcess:
+    """
+    A server process owned by the ProcessSupervisor and its restart bookkeeping.
+    """
+
+    def __init__(self, name, command, cwd=None, pid_file=None, log=None, start_timeout=None):
+        """
+        :param name: Name of the server; also its PortMonitor watch, e.g. "open-webui".
+        :param command: Command list that starts the server.
+        :param cwd: Working directory of the server.
+        :param pid_file: Optional file the current PID is written to, for stopping it from a later session.
+        :param log: The ServerLog the server's output is drained into.
+        :param start_timeout: Seconds the server may take to pass its first health check.
+            Defaults to ProcessSupervisor.START_TIMEOUT.
+        """
+        self.name = name
+        self.command = command
+        self.cwd = cwd
+        self.pid_file = pid_file
+        self.log = log
+        self.start_timeout = start_timeout or ProcessSupervisor.START_TIMEOUT
+        self.process = None
+        self.wanted = False  # Whether the server should be running
+        self.state = "stopped"  # "stopped", "starting", "running", "unhealthy", "restarting" or "failed"
+        self.started_at = None
+        self.healthy_at = None
+        self.unhealthy_since = None
+        self.restart_at = None
+        self.restart_delay = ProcessSupervisor.MIN_RESTART_DELAY
+        self.restarts = 0
+        self.recent_restarts = deque()  # Monotonic times of restarts inside RESTART_WINDOW
+        self.last_exit_code = None
+        self.last_failure = None
+
+    @property
+    def pid(self):
+        return self.process.pid if self.process else None
+
+    @property
+    def uptime(self):
+        """
+        Seconds the current process has been running, or 0 if it is not running.
+        """
+        if self.started_at is None or self.state in ("stopped", "restarting", "failed"):
+            return 0.0
+        return time.monotonic() - self.started_at
+
+    def snapshot(self):
+        """
+        Returns the process's status as a JSON-serializable dictionary.
+        """
+        return {
+            "name": self.name,
+            "state": self.state,
+            "pid": self.pid,
+            "uptime": round(self.uptime, 1),
+            "restarts": self.restarts,
+            "last_exit_code": self.last_exit_code,
+            "last_failure": self.last_failure,
+            "health": PortMonitor().get_state(self.name),
+        }
+
+
+class ProcessSupervisor:
+    """
+    Owns the Open WebUI and Pipelines server processes and keeps them running.
+
+    Health comes from the shared PortMonitor: a server is running once its HTTP health
+    check passes. A process that exits, never becomes healthy within its start timeout, or
+    stops answering for HANG_TIMEOUT after it was healthy is killed (with its children,
+    since `conda run` starts the server as a child) and restarted after an exponentially
+    growing delay. More than MAX_RESTARTS restarts within RESTART_WINDOW is treated as a
+    restart storm: the server is left in the "failed" state until it is started again.
+
+    Status is available from status()/status_all(), from subscribe() callbacks, and as
+    JSON from a local HTTP endpoint started with start_status_api(). Server output is
+    drained into rotating log files under AppConfig.logs_dir (see ServerLog); the recent
+    lines are available from tail() and the endpoint's /logs/<name> path.
+    """
+    _instance = None
+
+    POLL_INTERVAL = 1.0
+    MIN_RESTART_DELAY = 1.0
+    MAX_RESTART_DELAY = 60.0
+    START_TIMEOUT = 180.0  # Default seconds a new process may take to pass its first health check
+    HANG_TIMEOUT = 60.0  # Seconds a healthy process may fail health checks before it is restarted
+    STABLE_UPTIME = 300.0  # Seconds of health after which the restart delay is reset
+    MAX_RESTARTS = 5
+    RESTART_WINDOW = 600.0
+    STOP_TIMEOUT = 5.0
+
+    def __new__(cls):
+        if not cls._instance:
+            cls._instance = super(ProcessSupervisor, cls).__new__(cls)
+            cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        if not hasattr(self, "processes"):  # Prevent reinitialization
+            self.config = AppConfig()
+            self.processes = {}
+            self.lock = threading.RLock()
+            self.wakeup = threading.Event()
+            self.subscribers = []
+            self.thread = None
+            self.status_server = None
+
+    def register(self, name, command, cwd=None, pid_file=None, start_timeout=None):
+        """
+        Adds or updates a server the supervisor can start. See ManagedProcess for the parameters.
+        Servers that do slow work before they listen, like Open WebUI downloading its models
+        on the first start, need a start_timeout longer than the default.
+        """
+        with self.lock:
+            managed = self.processes.get(name)
+            if managed is None:
+                log = ServerLog(
+                    name,
+                    self.config.logs_dir,
+                    self.config.server_log_max_bytes,
+                    self.config.server_log_backups,
+                )
+                self.processes[name] = ManagedProcess(name, command, cwd, pid_file, log, start_timeout)
+            else:
+                managed.command, managed.cwd, managed.pid_file = command, cwd, pid_file
+                managed.start_timeout = start_timeout or self.START_TIMEOUT
+
+    def subscribe(self, callback):
+        """
+        Registers a callback called as callback(name, snapshot) whenever a server changes state.
+        Callbacks run on the supervisor thread.
+        """
+        with self.lock:
+            self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self.lock:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+
+    def status(self, name):
+        with self.lock:
+            return self.processes[name].snapshot()
+
+    def status_all(self):
+        with self.lock:
+            return {name: managed.snapshot() for name, managed in self.processes.items()}
+
+    def tail(self, name, count=None):
+        """
+        Returns the most recent output lines of a server, oldest first.
+        :param count: Number of lines to return. Defaults to all lines kept in memory.
+        """
+        with self.lock:
+            log = self.processes[name].log
+        return log.tail(count)
+
+    def start(self, name):
+        """
+        Starts a registered server and keeps it running until stop() is called.
+        :return: The PID of the started process.
+        """
+        with self.lock:
+            managed = self.processes[name]
+            managed.wanted = True
+            managed.restarts = 0
+            managed.recent_restarts.clear()
+            managed.restart_delay = self.MIN_RESTART_DELAY
+            if managed.process is None or managed.process.poll() is not None:
+                self._launch(managed)
+            pid = managed.pid
+        self._ensure_thread()
+        return pid
+
+    def stop(self, name):
+        """
+        Stops a server and stops supervising it.
+        """
+        with self.lock:
+            managed = self.processes.get(name)
+            if managed is None:
+                return
+            managed.wanted = False
+            process = managed.process
+            managed.process = None
+            self._set_state(managed, "stopped")
+        if process is not None:
+            self._kill_tree(process)
+        self._remove_pid_file(managed)
+
+    def stop_all(self):
+        for name in list(self.processes):
+            self.stop(name)
+
+    def _launch(self, managed):
+        """
+        Starts the process of a server and drains its output into its log. Called with the lock held.
+        """
+        CREATE_NO_WINDOW = 0x08000000
+        managed.process = subprocess.Popen(
+            managed.command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",  # A stray byte must not stop the reader and stall the server
+            cwd=managed.cwd,
+            env=os.environ.copy(),
+            creationflags=CREATE_NO_WINDOW if os.name == "nt" else 0,
+        )
+        # Without a reader the server blocks once the pipe buffer is full
+        managed.log.attach(managed.process)
+        managed.started_at = time.monotonic()
+        managed.healthy_at = None
+        managed.unhealthy_since = None
+        managed.restart_at = None
+        if managed.pid_file:
+            with open(managed.pid_file, "w") as f:
+                f.write(str(managed.process.pid))
+        print(f"{managed.name} started with PID {managed.process.pid}.")
+        self._set_state(managed, "starting")
+        PortMonitor().expect(managed.name)
+
+    def _set_state(self, managed, state):
+        if managed.state == state:
+            return
+        managed.state = state
+        snapshot = managed.snapshot()
+        for callback in list(self.subscribers):
+            try:
+                callback(managed.name, snapshot)
+            except Exception as e:
+                print(f"Error in {managed.name} supervisor callback: {e}")
+
+    def _ensure_thread(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            with self.lock:
+                supervised = [managed for managed in self.processes.values() if managed.wanted]
+            for managed in supervised:
+                try:
+                    self._supervise(managed)
+                except Exception as e:
+                    print(f"Error supervising {managed.name}: {e}")
+            self.wakeup.wait(self.POLL_INTERVAL)
+            self.wakeup.clear()
+
+    def _supervise(self, managed):
+        with self.lock:
+            failed_process = self._check(managed, time.monotonic())
+        # Killed outside the lock, so status readers are not held up while it shuts down
+        if failed_process is not None and failed_process.poll() is None:
+            self._kill_tree(failed_process)
+
+    def _check(self, managed, now):
+        """
+        Advances a server's state. Called with the lock held.
+        :return: The process to kill if the server failed, otherwise None.
+        """
+        if not managed.wanted or managed.state == "failed":
+            return None
+
+        if managed.state == "restarting":
+            if now >= managed.restart_at:
+                try:
+                    self._launch(managed)
+                except OSError as e:
+                    return self._schedule_restart(managed, f"could not be started: {e}")
+            return None
+
+        exit_code = managed.process.poll()
+        if exit_code is not None:
+            managed.last_exit_code = exit_code
+            return self._schedule_restart(managed, f"exited with code {exit_code}")
+
+        health = PortMonitor().get_state(managed.name)
+        if health == "healthy":
+            if managed.healthy_at is None:
+                managed.healthy_at = now
+            managed.unhealthy_since = None
+            if now - managed.healthy_at >= self.STABLE_UPTIME:
+                managed.restart_delay = self.MIN_RESTART_DELAY
+            self._set_state(managed, "running")
+            return None
+
+        if managed.healthy_at is None:
+            if now - managed.started_at > managed.start_timeout:
+                return self._schedule_restart(managed, f"not healthy {managed.start_timeout:.0f}s after starting")
+            return None
+
+        if managed.unhealthy_since is None:
+            managed.unhealthy_since = now
+            self._set_state(managed, "unhealthy")
+        elif now - managed.unhealthy_since > self.HANG_TIMEOUT:
+            return self._schedule_restart(managed, f"failed health checks for {self.HANG_TIMEOUT:.0f}s")
+        return None
+
+    def _schedule_restart(self, managed, reason):
+        """
+        Schedules the restart of a failed server, unless it is restarting too often.
+        Called with the lock held.
+        :return: The failed process, which the caller kills.
+        """
+        print(f"{managed.name} {reason}.")
+        managed.last_failure = reason
+        process = managed.process
+        managed.process = None
+
+        now = time.monotonic()
+        while managed.recent_restarts and now - managed.recent_restarts[0] > self.RESTART_WINDOW:
+            managed.recent_restarts.popleft()
+        if len(managed.recent_restarts) >= self.MAX_RESTARTS:
+            print(
+                f"{managed.name} restarted {len(managed.recent_restarts)} times in "
+                f"{self.RESTART_WINDOW:.0f}s. Giving up until it is started again."
+            )
+            self._remove_pid_file(managed)
+            self._set_state(managed, "failed")
+            return process
+
+        managed.recent_restarts.append(now)
+        managed.restarts += 1
+        managed.restart_at = now + managed.restart_delay
+        print(f"Restarting {managed.name} in {managed.restart_delay:.0f}s (restart {managed.restarts}).")
+        managed.restart_delay = min(managed.restart_delay * 2, self.MAX_RESTART_DELAY)
+        self._set_state(managed, "restarting")
+        return process
+
+    def _kill_tree(self, process):
+        try:
+            parent = psutil.Process(process.pid)
+            children = parent.children(recursive=True)
+            for child in children:
+                child.terminate()
+            parent.terminate()
+            _, alive = psutil.wait_procs([parent, *children], timeout=self.STOP_TIMEOUT)
+            for leftover in alive:
+                leftover.kill()
+        except psutil.NoSuchProcess:
+            pass
+        except Exception as e:
+            print(f"Error stopping process {process.pid}: {e}")
+
+    @staticmethod
+    def _remove_pid_file(managed):
+        if managed.pid_file and os.path.exists(managed.pid_file):
+            try:
+                os.remove(managed.pid_file)
+            except OSError as e:
+                print(f"Could not remove PID file {managed.pid_file}: {e}")
+
+    def start_status_api(self, port=None):
+        """
+        Serves the status of all servers as JSON on http://127.0.0.1:<port>/status,
+        and each server's recent output on /logs/<name>.
+        :param port: Port to listen on. Defaults to AppConfig.supervisor_status_port.
+        """
+        if self.status_server is not None:
+            return
+        port = port or self.config.supervisor_status_port
+        supervisor = self
+
+        class StatusHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.rstrip("/")
+                if path in ("", "/status"):
+                    body = supervisor.status_all()
+                elif path.startswith("/logs/") and path[len("/logs/"):] in supervisor.processes:
+                    body = supervisor.tail(path[len("/logs/"):])
+                else:
+                    self.send_error(404)
+                    return
+                body = json.dumps(body).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Status polls would flood the console
+
+        try:
+            self.status_server = ThreadingHTTPServer(("127.0.0.1", port), StatusHandler)
+        except OSError as e:
+            print(f"Could not start the supervisor status API on port {port}: {e}")
+            return
+        threading.Thread(target=self.status_server.serve_forever, daemon=True).start()
+        print(f"Supervisor status API listening on http://127.0.0.1:{port}/status")
@@ -0,0 +1,259 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ArtifactCache:
+    """
+    Local cache for everything an install downloads, kept across reinstalls and repairs.
+
+    Layout under the cache directory:
+    - installers/: content-addressed installer files (named by SHA-256), indexed by URL
+    - conda_pkgs/: used as conda's pkgs_dirs
+    - pip/: used as pip's --cache-dir
+    - wheels/: a wheelhouse of installed wheels (see BaseInstaller.cache_wheels), used as pip's --find-links
+
+    The cache is capped in size; the least recently used entries are evicted first.
+    Eviction walks the whole cache, so it runs once when an install ends rather than after
+    every download or pip command: installs run inside session(), and the cache is only
+    evicted when the last concurrent session ends. Entries used since the earliest of those
+    sessions started are kept, and nothing is evicted while any session is still running,
+    since a parallel conda create may be extracting into the pkgs directory.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir, max_bytes):
+        """
+        :param cache_dir: Root directory of the cache.
+        :param max_bytes: Size cap for the whole cache in bytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.installers_dir = os.path.join(cache_dir, "installers")
+        self.conda_pkgs_dir = os.path.join(cache_dir, "conda_pkgs")
+        self.pip_cache_dir = os.path.join(cache_dir, "pip")
+        self.wheels_dir = os.path.join(cache_dir, "wheels")
+        self.index_path = os.path.join(cache_dir, self.INDEX_FILE)
+        self.lock = threading.Lock()
+        self.active_sessions = 0
+        self.session_started = None  # Wall-clock start of the earliest running session
+
+    def ensure_dirs(self):
+        for path in (self.installers_dir, self.conda_pkgs_dir, self.pip_cache_dir, self.wheels_dir):
+            os.makedirs(path, exist_ok=True)
+
+    def env(self):
+        """
+        Returns the environment variables that point conda and pip at the cache.
+        """
+        self.ensure_dirs()
+        return {
+            "CONDA_PKGS_DIRS": self.conda_pkgs_dir,
+            "PIP_CACHE_DIR": self.pip_cache_dir,
+            "PIP_FIND_LINKS": self.wheels_dir,
+            "UV_CACHE_DIR": os.path.join(self.pip_cache_dir, "uv"),
+            "UV_FIND_LINKS": self.wheels_dir,
+        }
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"installers": {}, "stats": {}}
+
+    def _save_index(self, index):
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+        os.replace(temp_path, self.index_path)
+
+    def record(self, kind, hits=0, misses=0):
+        """
+        Adds hit/miss counts for a kind of artifact (e.g. "installers", "pip").
+        """
+        with self.lock:
+            self.ensure_dirs()
+            index = self._load_index()
+            stats = index.setdefault("stats", {}).setdefault(kind, {"hits": 0, "misses": 0})
+            stats["hits"] += hits
+            stats["misses"] += misses
+            self._save_index(index)
+
+    def fetch(self, url, destination, downloader, sha256=None, **download_kwargs):
+        """
+        Places the file for a URL at destination, downloading it only on a cache miss.
+
+        :param url: The URL of the artifact.
+        :param destination: Where the caller wants the file.
+        :param downloader: The Downloader used on a cache miss.
+        :param sha256: Optional expected SHA-256 hex digest.
+        :param download_kwargs: Extra arguments passed to Downloader.download (step_text, start, end).
+        :return: The destination path.
+        """
+        self.ensure_dirs()
+        with self.lock:
+            entry = self._load_index().get("installers", {}).get(url)
+
+        blob_path = os.path.join(self.installers_dir, entry["sha256"]) if entry else None
+        hit = (
+            blob_path is not None
+            and os.path.exists(blob_path)
+            and (sha256 is None or entry["sha256"].lower() == sha256.lower())
+        )
+
+        if hit:
+            print(f"Artifact cache hit: {url}")
+        else:
+            print(f"Artifact cache miss: {url}")
+            download_path = os.path.join(self.installers_dir, f"download-{hashlib.sha256(url.encode()).hexdigest()[:16]}")
+            downloader.download(url, download_path, sha256=sha256, **download_kwargs)
+            digest = downloader.file_sha256(download_path)
+            blob_path = os.path.join(self.installers_dir, digest)
+            os.replace(download_path, blob_path)
+            entry = {"sha256": digest, "filename": os.path.basename(destination), "size": os.path.getsize(blob_path)}
+
+        with self.lock:
+            index = self._load_index()
+            entry["last_used"] = time.time()
+            index.setdefault("installers", {})[url] = entry
+            stats = index.setdefault("stats", {}).setdefault("installers", {"hits": 0, "misses": 0})
+            stats["hits" if hit else "misses"] += 1
+            self._save_index(index)
+
+        if os.path.abspath(blob_path) != os.path.abspath(destination):
+            if os.path.exists(destination):
+                os.remove(destination)
+            try:
+                os.link(blob_path, destination)
+            except OSError:
+                shutil.copy2(blob_path, destination)
+        return destination
+
+    @contextmanager
+    def session(self):
+        """
+        Marks the cache as in use by an install. When the last running session ends, the
+        cache is evicted down to max_bytes, keeping everything used since the sessions began.
+        """
+        with self.lock:
+            if self.active_sessions == 0:
+                self.session_started = time.time()
+            self.active_sessions += 1
+            started = self.session_started
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.active_sessions -= 1
+                last = self.active_sessions == 0
+            if last:
+                self.evict(keep_newer_than=started)
+                print(self.report())
+
+    def track(self, func):
+        """
+        Wraps a function so it runs inside a session, e.g. as the target of an install thread.
+        """
+        def tracked(*args, **kwargs):
+            with self.session():
+                return func(*args, **kwargs)
+        return tracked
+
+    def _entries(self):
+        """
+        Lists the evictable entries of the cache as (path, size, last_used) tuples.
+        Installers use the index timestamps; conda packages are evicted per package,
+        pip cache and wheelhouse files individually.
+        """
+        entries = []
+        index = self._load_index()
+        for entry in index.get("installers", {}).values():
+            blob_path = os.path.join(self.installers_dir, entry["sha256"])
+            if os.path.exists(blob_path):
+                entries.append((blob_path, entry.get("size", 0), entry.get("last_used", 0)))
+
+        if os.path.isdir(self.conda_pkgs_dir):
+            for name in os.listdir(self.conda_pkgs_dir):
+                if name in ("urls", "urls.txt", "cache"):
+                    continue
+                path = os.path.join(self.conda_pkgs_dir, name)
+                try:
+                    entries.append((path, self._path_size(path), self._last_used(path)))
+                except OSError:
+                    continue
+
+        for root_dir in (self.pip_cache_dir, self.wheels_dir):
+            for dirpath, _, filenames in os.walk(root_dir):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        entries.append((path, os.path.getsize(path), self._last_used(path)))
+                    except OSError:
+                        continue
+        return entries
+
+    @staticmethod
+    def _last_used(path):
+        stat = os.stat(path)
+        return max(stat.st_atime, stat.st_mtime)
+
+    @staticmethod
+    def _path_size(path):
+        if os.path.isfile(path):
+            return os.path.getsize(path)
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, filename))
+                except OSError:
+                    continue
+        return total
+
+    def evict(self, keep_newer_than=None):
+        """
+        Removes least recently used entries until the cache fits within max_bytes.
+        Does nothing while a session is running.
+        :param keep_newer_than: Optional timestamp; entries used at or after it are never evicted.
+        :return: Number of bytes freed.
+        """
+        with self.lock:
+            if self.active_sessions:
+                return 0
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            freed = 0
+            for path, size, last_used in sorted(entries, key=lambda entry: entry[2]):
+                if total - freed <= self.max_bytes:
+                    break
+                if keep_newer_than is not None and last_used >= keep_newer_than:
+                    continue
+                try:
+                    if os.path.isdir(path):
+                        shutil.rmtree(path)
+                    else:
+                        os.remove(path)
+                    freed += size
+                except OSError as e:
+                    print(f"Failed to evict {path} from the artifact cache: {e}")
+            if freed:
+                print(f"Artifact cache evicted {freed} bytes.")
+            return freed
+
+    def report(self):
+        """
+        Returns a human readable summary of cache size and hit/miss counts.
+        """
+        with self.lock:
+            index = self._load_index()
+            total = sum(size for _, size, _ in self._entries())
+        lines = [f"Artifact cache: {total / 1024 ** 3:.2f} GB of {self.max_bytes / 1024 ** 3:.2f} GB used"]
+        for kind, stats in sorted(index.get("stats", {}).items()):
+            lines.append(f"  {kind}: {stats['hits']} hits, {stats['misses']} misses")
+        return "\n".join(lines)
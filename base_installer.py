@@ -1,5 +1,16 @@
+import os
+import shutil
+import subprocess
 from abc import ABC, abstractmethod
 from AppConfig import AppConfig 
+from command_runner import CommandRunner
+from DiskSpaceChecker import DiskSpaceChecker
+from downloader import Downloader
+from env_template import EnvironmentTemplate
+from file_dedup import FileDeduplicator
+from package_backends import get_env_backend, get_package_backend
+from progress_parser import InstallProgressParser
+from update_planner import UpdatePlanner
 
 class BaseInstaller(ABC):
     """
@@ -12,6 +23,10 @@ class BaseInstaller(ABC):
         self._is_installed = False
         self._has_env = False
         self.config = AppConfig()
+        self.command_runner = CommandRunner()
+        self.last_result = None
+        self._env_backend = None
+        self._package_backend = None
 
     @property
     def is_installed(self):
@@ -29,6 +44,312 @@ class BaseInstaller(ABC):
         """
         return self._has_env
 
+    @property
+    def env_backend(self):
+        """
+        The backend used to create environments (conda or micromamba), chosen from AppConfig.
+        """
+        if self._env_backend is None:
+            self._env_backend = get_env_backend(self.config)
+        return self._env_backend
+
+    @property
+    def package_backend(self):
+        """
+        The backend used to install Python packages (pip or uv), chosen from AppConfig.
+        """
+        if self._package_backend is None:
+            self._package_backend = get_package_backend(self.config)
+        return self._package_backend
+
+    def install_packages(self, env_path, args, step_text, start=0, end=100, expected_packages=50):
+        """
+        Install Python packages into an environment with the configured package backend.
+
+        :param env_path: The prefix of the environment.
+        :param args: Arguments for the install command, e.g. ["--upgrade", "open-webui"].
+        :param step_text: Step label shown while the packages are installed.
+        :return: The tail of the process's stdout and stderr as a tuple (stdout, stderr).
+        """
+        cmd_list = self.package_backend.install_cmd(self.find_env_python(env_path), args)
+        output = self.run_with_progress(cmd_list, step_text, start, end, expected_packages)
+        print(f"Installed with {self.package_backend.name} in {self.last_result.wall_time:.1f}s")
+        return output
+
+    def update_packages(self, env_path, args, step_text, expected_packages=50):
+        """
+        Update an environment by reinstalling only the packages whose versions change.
+        The plan is shown before anything is installed. If planning fails, falls back to a
+        full install with the given arguments.
+
+        :param env_path: The prefix of the environment.
+        :param args: pip install arguments describing the target, e.g. ["--upgrade", "open-webui"].
+        :param step_text: Step label shown while the update runs.
+        :return: True if any package was installed, False if the environment was already up to date.
+        """
+        planner = UpdatePlanner(self)
+        try:
+            plan = planner.plan(env_path, args)
+        except (subprocess.CalledProcessError, OSError, ValueError, KeyError) as e:
+            print(f"Could not plan the update ({e}). Running a full install instead.")
+            self.install_packages(env_path, args, step_text, expected_packages=expected_packages)
+            return True
+
+        planner.show(plan, step_text)
+        if plan.is_empty:
+            print(f"{env_path} is up to date. Skipping install.")
+            return False
+        return planner.apply(plan, step_text)
+
+    def install_from_lock(self, lock, env_path, step_text, start=0, end=100, expected_packages=50, source_digest=None):
+        """
+        Install the exact package set of a lockfile, skipping dependency resolution.
+
+        :param lock: The LockFile of the environment.
+        :param env_path: The prefix of the environment.
+        :param source_digest: Digest of the input the lockfile must have been generated from, if any.
+        :return: True if the packages were installed from the lockfile, False if the caller should resolve instead.
+        """
+        if not lock.is_current(source_digest):
+            return False
+        print(f"Installing from lockfile {lock.path}...")
+        try:
+            self.install_packages(env_path, lock.install_args(), step_text, start, end, expected_packages)
+            return True
+        except subprocess.CalledProcessError as e:
+            print(f"Installing from lockfile failed (return code {e.returncode}). Resolving dependencies instead.")
+            return False
+
+    def write_lock(self, lock, env_path, source_digest=None):
+        """
+        Regenerate a lockfile from an environment. Failures are reported but never fail the install.
+        Skipped for offline bundle installs, since pinning the hashes queries PyPI for every package.
+        :return: True if the lockfile was written.
+        """
+        if self.config.offline_bundle:
+            print(f"Installed from an offline bundle, not updating lockfile {lock.path}.")
+            return False
+        try:
+            lock.generate(env_path, source_digest)
+            return True
+        except (RuntimeError, OSError) as e:
+            print(f"Could not write lockfile {lock.path}: {e}")
+            return False
+
+    def cache_wheels(self, env_path, args):
+        """
+        Saves the wheels of an install into the artifact cache's wheelhouse, which pip and uv
+        search through --find-links, so a repeat install finds them without the index.
+        pip takes the files from its own cache, so this mostly copies what was just downloaded.
+        Failures only cost a later download, so they are reported but never fail the install.
+
+        :param env_path: The prefix of the environment the packages were installed into.
+        :param args: The pip install arguments of the install, e.g. ["-r", "requirements.txt"].
+        """
+        if self.config.offline_bundle:
+            return  # Offline installs already come from the bundle's wheelhouse
+        cache = self.config.artifact_cache
+        cache.ensure_dirs()
+        try:
+            self.run_command(
+                [
+                    self.find_env_python(env_path),
+                    "-m", "pip",
+                    "wheel",
+                    "--wheel-dir", cache.wheels_dir,
+                    *args,
+                ],
+                on_line=lambda line, stream_name: None,
+            )
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"Could not add the installed wheels to the artifact cache: {e}")
+
+    def deduplicate_files(self):
+        """
+        Hardlink identical package files across the Open WebUI and Pipelines environments.
+        Relinking changes directory mtimes but no installed package, so state cache entries
+        that were current before the pass are re-stamped afterwards instead of going stale.
+        Failures only cost disk space, so they are reported but never fail the install.
+        :return: A DedupReport, or None if deduplication is disabled or failed.
+        """
+        if not self.config.dedup_after_install:
+            return None
+        # The conda package caches are left alone: conda already hardlinks environments from them
+        env_paths = [self.config.env_path, self.config.env_pipelines_path]
+        state_cache = self.config.state_cache
+        current_keys = {
+            env_path: state_cache.current_keys(self.config.env_state_paths(env_path))
+            for env_path in env_paths
+        }
+        if self.status_updater:
+            self.status_updater.update_details("Deduplicating files shared between environments...")
+        try:
+            report = FileDeduplicator(env_paths).run()
+        except OSError as e:
+            print(f"File deduplication failed: {e}")
+            return None
+        finally:
+            for env_path, keys in current_keys.items():
+                state_cache.refresh(keys, self.config.env_state_paths(env_path))
+        if self.status_updater:
+            self.status_updater.update_details(str(report))
+        return report
+
+    def run_command(self, cmd_list, cwd=None, capture_output=True, on_line=None):
+        """
+        Runs a command, streaming its output line by line. Prevents console windows from appearing.
+
+        :param cmd_list: List of command and arguments to run.
+        :param cwd: Directory to execute the command in.
+        :param capture_output: Whether to capture and return stdout and stderr.
+        :param on_line: Optional callback for each output line. Defaults to forwarding lines to the status updater.
+        :return: The tail of the process's stdout and stderr as a tuple (stdout, stderr).
+        :raises: subprocess.CalledProcessError if the command fails.
+        """
+        try:
+            # Free space is sampled at the fast rate while conda or pip write to disk
+            with DiskSpaceChecker().active():
+                result = self.command_runner.run(
+                    cmd_list,
+                    cwd=cwd,
+                    env=self._command_env(),
+                    on_line=on_line or self._on_command_output,
+                    capture_output=capture_output,
+                )
+            self.last_result = result
+
+            # Check for errors and raise if process failed
+            if result.returncode != 0:
+                raise subprocess.CalledProcessError(
+                    result.returncode, cmd_list, output=result.stdout, stderr=result.stderr
+                )
+
+            return result.stdout, result.stderr
+        except subprocess.CalledProcessError as e:
+            print(f"Command failed: {' '.join(e.cmd)}, Return Code: {e.returncode}")
+            print(f"Error Output: {e.stderr}")
+            raise
+        except Exception as e:
+            print(f"Unexpected error while running command: {e}")
+            raise
+
+    def run_with_progress(self, cmd_list, step_text, start=0, end=100, expected_packages=50, cwd=None):
+        """
+        Runs a pip or conda command and reports its parsed progress to the status updater.
+
+        :param cmd_list: List of command and arguments to run.
+        :param step_text: Step label shown while the command runs.
+        :param start: Progress bar value at the start of the command.
+        :param end: Progress bar value when the command completes.
+        :param expected_packages: Rough number of packages pip will collect.
+        :param cwd: Directory to execute the command in.
+        :return: The tail of the process's stdout and stderr as a tuple (stdout, stderr).
+        """
+        parser = InstallProgressParser(self.status_updater, step_text, start, end, expected_packages)
+        output = self.run_command(cmd_list, cwd=cwd, on_line=parser)
+        parser.finish()
+
+        artifact_cache = self.config.artifact_cache
+        if parser.cached_packages or parser.downloaded_packages:
+            artifact_cache.record("pip", hits=parser.cached_packages, misses=parser.downloaded_packages)
+        return output
+
+    def create_environment(self, env_name, env_path, packages=None, step_text="Creating Environment..."):
+        """
+        Create a Python 3.11 Conda environment.
+        Uses the offline bundle's package set when one is loaded, otherwise clones the
+        shared python=3.11 template so the environment does not need its own solve.
+
+        :param env_name: The name of the environment (e.g. "env").
+        :param env_path: The prefix of the environment.
+        :param packages: Additional packages to install. Defaults to None.
+        :param step_text: Step label shown while the environment is created.
+        """
+        bundle = self.config.offline_bundle
+        if bundle and bundle.has_env(env_name):
+            # Recreate the exact package set from the offline bundle without touching the network
+            self.run_with_progress(
+                [
+                    self.config.conda_exe,
+                    "create",
+                    "--prefix", env_path,
+                    "--file", bundle.local_explicit_list(env_name),
+                    "--offline",
+                    "-y",
+                ],
+                step_text,
+            )
+            return
+
+        if self.config.use_env_templates and self.env_backend.supports_clone:
+            try:
+                EnvironmentTemplate(["python=3.11"]).clone_to(self, env_path, packages, step_text)
+                return
+            except subprocess.CalledProcessError as e:
+                print(f"Creating {env_name} from the template failed, falling back to a full create: {e}")
+                if os.path.exists(env_path):
+                    shutil.rmtree(env_path, ignore_errors=True)
+
+        self.run_with_progress(
+            self.env_backend.create_cmd(env_path, ["python=3.11", *(packages or [])]),
+            step_text,
+        )
+
+    def find_env_python(self, env_path):
+        """
+        Find the Python executable within a Conda environment.
+        :param env_path: Path to the environment.
+        :return: Path to the Python executable.
+        :raises: FileNotFoundError if no executable is found.
+        """
+        possible_locations = [
+            os.path.join(env_path, "python.exe"),
+            os.path.join(env_path, "bin", "python"),
+            os.path.join(env_path, "Scripts", "python.exe"),
+        ]
+
+        for path in possible_locations:
+            if os.path.exists(path):
+                return path
+
+        raise FileNotFoundError(
+            "Could not locate the Python executable in the environment. "
+            f"Tried locations: {possible_locations}"
+        )
+
+    def export_conda_package_set(self, bundle, env_name, env_path):
+        """
+        Adds an environment's explicit conda package set to an offline bundle.
+        :param bundle: The OfflineBundle being exported.
+        :param env_name: Name of the environment inside the bundle.
+        :param env_path: Path to the environment.
+        """
+        stdout, _ = self.run_command(
+            [self.config.conda_exe, "list", "--explicit", "--prefix", env_path],
+            on_line=lambda line, stream_name: None,
+        )
+        pkgs_dirs = [
+            self.config.artifact_cache.conda_pkgs_dir,
+            os.path.join(self.config.miniconda_path, "pkgs"),
+        ]
+        bundle.add_conda_package_set(env_name, stdout, pkgs_dirs, Downloader())
+
+    def _command_env(self):
+        """
+        Returns the environment for installer commands, pointing conda and pip at the artifact cache.
+        """
+        env = os.environ.copy()  # Ensure environment variables are inherited
+        env.update(self.config.artifact_cache.env())
+        return env
+
+    def _on_command_output(self, line, stream_name):
+        """
+        Default per-line output handler: logs the line and shows it as status details.
+        """
+        print(line)
+        if self.status_updater and line.strip():
+            self.status_updater.update_details(line.strip(), throttle=True)
+
 
     @abstractmethod
     def check_installed(self):
@@ -0,0 +1,218 @@
+"""
+Times the same install with the conda/pip and micromamba/uv backends against a local package index.
+
+    pip download open-webui -d wheelhouse
+    python bench_backends.py wheelhouse open-webui [--python 3.11] [--offline] [--runs 1]
+
+The wheelhouse is served as a PEP 503 simple index on a loopback port, so the package
+backends resolve and download over HTTP as they would from PyPI, without PyPI's latency
+or rate limits. Each backend pair creates a fresh environment (timed) and installs the
+packages into it from the index with its cache disabled (timed). --offline creates the
+environments from the conda package cache only. Backends that are not installed are
+skipped. Results are printed and written to bench_output.txt.
+"""
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from package_backends import ENV_BACKENDS, PACKAGE_BACKENDS
+
+DISTRIBUTION_SUFFIXES = (".whl", ".tar.gz", ".zip")
+
+
+def project_name(filename):
+    """
+    Returns the PEP 503 normalized project name of a wheel or sdist file name.
+    """
+    if filename.endswith(".whl"):
+        name = filename.split("-", 1)[0]
+    else:
+        name = filename.rsplit("-", 1)[0]
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class SimpleIndexHandler(BaseHTTPRequestHandler):
+    """
+    Serves a directory of distributions as a PEP 503 simple index:
+    /simple/ lists the projects, /simple/<project>/ links its files with their SHA-256,
+    and /files/<filename> serves a file.
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def _respond(self, send_body):
+        projects = self.server.projects
+        parts = [part for part in self.path.split("?", 1)[0].split("/") if part]
+        if parts == ["simple"]:
+            links = "".join(f'<a href="/simple/{name}/">{name}</a>\n' for name in sorted(projects))
+            self._send(links, send_body)
+        elif len(parts) == 2 and parts[0] == "simple" and parts[1] in projects:
+            links = "".join(
+                f'<a href="/files/{escape(filename)}#sha256={self.server.digests[filename]}">{escape(filename)}</a>\n'
+                for filename in projects[parts[1]]
+            )
+            self._send(links, send_body)
+        elif len(parts) == 2 and parts[0] == "files" and parts[1] in self.server.digests:
+            with open(os.path.join(self.server.directory, parts[1]), "rb") as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+        else:
+            self.send_error(404)
+
+    def _send(self, links, send_body):
+        body = f"<!DOCTYPE html>\n<html><body>\n{links}</body></html>\n".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+def start_index_server(directory):
+    """
+    Starts a SimpleIndexHandler server for a directory of distributions on a free loopback port.
+    :return: The server; its index URL is http://127.0.0.1:<server.server_port>/simple/.
+    """
+    projects = {}
+    digests = {}
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(DISTRIBUTION_SUFFIXES):
+            continue
+        with open(os.path.join(directory, filename), "rb") as f:
+            digests[filename] = hashlib.sha256(f.read()).hexdigest()
+        projects.setdefault(project_name(filename), []).append(filename)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SimpleIndexHandler)
+    server.daemon_threads = True
+    server.directory = directory
+    server.projects = projects
+    server.digests = digests
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def find_env_python(env_path):
+    for path in (os.path.join(env_path, "python.exe"), os.path.join(env_path, "bin", "python")):
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No Python executable in {env_path}")
+
+
+def timed(cmd, env):
+    """
+    Runs a command to completion and returns the elapsed seconds.
+    :raises: subprocess.CalledProcessError with the command's output if it fails.
+    """
+    started = time.perf_counter()
+    subprocess.run(cmd, env=env, check=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    return time.perf_counter() - started
+
+
+def bench_pair(env_backend, package_backend, work_dir, python_spec, packages, index_url, offline):
+    """
+    Creates a fresh environment with env_backend and installs packages into it with package_backend.
+    :return: A tuple (create seconds, install seconds).
+    """
+    env_path = os.path.join(work_dir, f"env-{env_backend.name}-{package_backend.name}")
+    create_cmd = env_backend.create_cmd(env_path, [f"python={python_spec}", "pip"])
+    if offline:
+        create_cmd.append("--offline")
+    # No caches or extra indexes from the user's configuration, so every run downloads from the local index
+    env = os.environ.copy()
+    for name in ("PIP_FIND_LINKS", "PIP_EXTRA_INDEX_URL", "UV_FIND_LINKS", "UV_EXTRA_INDEX_URL"):
+        env.pop(name, None)
+    env.update({"PIP_NO_CACHE_DIR": "1", "UV_NO_CACHE": "1", "PIP_DISABLE_PIP_VERSION_CHECK": "1"})
+    try:
+        create_seconds = timed(create_cmd, env)
+        install_cmd = package_backend.install_cmd(find_env_python(env_path), ["--index-url", index_url, *packages])
+        install_seconds = timed(install_cmd, env)
+    finally:
+        shutil.rmtree(env_path, ignore_errors=True)
+    return create_seconds, install_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("wheelhouse", help="Directory of wheels and sdists served as the package index.")
+    parser.add_argument("packages", nargs="+", help="Packages to install, e.g. open-webui.")
+    parser.add_argument("--python", default="3.11", help="Python version of the environments.")
+    parser.add_argument("--offline", action="store_true", help="Create environments from the conda package cache only.")
+    parser.add_argument("--conda", default=shutil.which("conda"), help="Path of the conda executable.")
+    parser.add_argument("--micromamba", default=None, help="Path of the micromamba executable.")
+    parser.add_argument("--uv", default=None, help="Path of the uv executable.")
+    parser.add_argument("--runs", type=int, default=1, help="Installs per backend pair; the median is reported.")
+    parser.add_argument("--output", default="bench_output.txt", help="File the results are written to.")
+    args = parser.parse_args()
+
+    # The backends only read the executable paths from the configuration
+    config = SimpleNamespace(conda_exe=args.conda or "", micromamba_exe=args.micromamba, uv_exe=args.uv)
+    env_backends = [backend(config) for backend in ENV_BACKENDS.values()]
+    package_backends = [backend(config) for backend in PACKAGE_BACKENDS.values()]
+
+    server = start_index_server(os.path.abspath(args.wheelhouse))
+    index_url = f"http://127.0.0.1:{server.server_port}/simple/"
+    lines = [
+        f"Backend benchmark: python={args.python} + {' '.join(args.packages)} from "
+        f"{sum(len(files) for files in server.projects.values())} local files, median of {args.runs} runs"
+    ]
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            for env_backend in env_backends:
+                for package_backend in package_backends:
+                    label = f"{env_backend.name}/{package_backend.name}"
+                    missing = [backend.name for backend in (env_backend, package_backend) if not backend.is_available()]
+                    if missing:
+                        lines.append(f"  {label:>16}: skipped, {' and '.join(missing)} not installed")
+                        continue
+                    try:
+                        runs = [
+                            bench_pair(
+                                env_backend, package_backend, work_dir, args.python,
+                                args.packages, index_url, args.offline,
+                            )
+                            for _ in range(args.runs)
+                        ]
+                    except subprocess.CalledProcessError as e:
+                        print(e.stdout)
+                        lines.append(f"  {label:>16}: failed, {' '.join(e.cmd)} returned {e.returncode}")
+                        continue
+                    create_seconds = statistics.median(run[0] for run in runs)
+                    install_seconds = statistics.median(run[1] for run in runs)
+                    lines.append(
+                        f"  {label:>16}: create {create_seconds:7.2f}s, install {install_seconds:7.2f}s, "
+                        f"total {create_seconds + install_seconds:7.2f}s"
+                    )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    report = "\n".join(lines)
+    print(report)
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compares the time and on-disk size of shallow and full clones of the pipelines repository.
+
+    python bench_clone.py [--source https://github.com/open-webui/pipelines.git] [--depth 1] [--runs 3]
+
+The source is mirrored once into a local bare repository, which dulwich's git:// server
+serves on a loopback port, so the clones measure pack negotiation and checkout with
+dulwich (as used by PipelinesInstaller) rather than GitHub's latency. dulwich cannot make
+shallow clones of file:// URLs, hence the server. Results are printed and written to
+bench_output.txt.
+"""
+import argparse
+import io
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from dulwich import porcelain
+from dulwich.repo import Repo
+from dulwich.server import DictBackend, TCPGitServer
+
+PIPELINES_REPO_URL = "https://github.com/open-webui/pipelines.git"
+
+
+def tree_size(path):
+    """
+    Returns the total size in bytes of the files under path.
+    """
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, filename)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def start_git_server(repo_path):
+    """
+    Serves a bare repository as git://127.0.0.1:<port>/repo.git from a daemon thread.
+    :return: A tuple (server, port).
+    """
+    backend = DictBackend({b"/repo.git": Repo(repo_path)})
+    server = TCPGitServer(backend, "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_address[1]
+
+
+def time_clone(url, target, depth):
+    """
+    Clones url with dulwich and returns (seconds, total bytes, .git bytes).
+    """
+    started = time.perf_counter()
+    porcelain.clone(url, target, depth=depth, errstream=io.BytesIO())
+    elapsed = time.perf_counter() - started
+    sizes = tree_size(target), tree_size(os.path.join(target, ".git"))
+    shutil.rmtree(target)
+    return (elapsed, *sizes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", default=PIPELINES_REPO_URL, help="Repository to mirror and clone.")
+    parser.add_argument("--depth", type=int, default=1, help="Depth of the shallow clone.")
+    parser.add_argument("--runs", type=int, default=3, help="Clones per configuration; the median is reported.")
+    parser.add_argument("--output", default="bench_output.txt", help="File the results are written to.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repo_path = os.path.join(temp_dir, "repo.git")
+        print(f"Mirroring {args.source}...")
+        porcelain.clone(args.source, repo_path, bare=True, errstream=io.BytesIO()).close()
+        server, port = start_git_server(repo_path)
+        url = f"git://127.0.0.1:{port}/repo.git"
+        lines = [f"Clone benchmark: {args.source} served over git:// on loopback, median of {args.runs} runs"]
+        try:
+            for label, depth in ((f"depth {args.depth}", args.depth), ("full history", None)):
+                runs = [time_clone(url, os.path.join(temp_dir, "clone"), depth) for _ in range(args.runs)]
+                elapsed = statistics.median(run[0] for run in runs)
+                total_mb, git_mb = (size / 1024 ** 2 for size in runs[-1][1:])
+                lines.append(
+                    f"  {label:>14}: {elapsed:6.2f}s, {total_mb:7.1f} MB on disk ({git_mb:.1f} MB in .git)"
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    report = "\n".join(lines)
+    print(report)
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Compares parallel and single-stream Downloader throughput against a local range-capable server.
+
+    python bench_downloader.py [--size-mb 64] [--workers 4] [--chunk-mb 8] [--rate-mb 8] [--runs 3]
+
+Loopback is faster than any real mirror, so the server can cap the rate of each
+connection (--rate-mb) to stand in for a CDN that throttles per connection, which is
+the case parallel ranges are meant for. Results are printed and written to bench_output.txt.
+"""
+import argparse
+import hashlib
+import os
+import re
+import statistics
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from downloader import Downloader
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the server's payload with ETag, Last-Modified, Range and If-Range support.
+    A Range whose If-Range does not match the current ETag gets the whole file (200), and
+    a Range starting past the end gets 416, as a real server would answer.
+    """
+
+    protocol_version = "HTTP/1.1"
+    WRITE_SIZE = 64 * 1024
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark and test output readable
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def _respond(self, send_body):
+        payload = self.server.payload
+        size = len(payload)
+        start, end, status = 0, size - 1, 200
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", range_header or "")
+        if match and self.server.accepts_ranges and if_range in (None, self.server.etag, self.server.last_modified):
+            start = int(match.group(1))
+            if start >= size:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+            status = 206
+
+        self.send_response(status)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Last-Modified", self.server.last_modified)
+        if self.server.accepts_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if not send_body:
+            return
+
+        rate = self.server.rate_per_connection
+        started = time.monotonic()
+        sent = 0
+        position = start
+        while position <= end:
+            block = payload[position:min(position + self.WRITE_SIZE, end + 1)]
+            self.wfile.write(block)
+            position += len(block)
+            sent += len(block)
+            if rate:
+                # Sleep until this connection is back under its rate
+                delay = sent / rate - (time.monotonic() - started)
+                if delay > 0:
+                    time.sleep(delay)
+
+
+def start_range_server(payload, etag='"v1"', accepts_ranges=True, rate_per_connection=None):
+    """
+    Starts a RangeRequestHandler server on a free loopback port in a daemon thread.
+    :param payload: The bytes served for every path.
+    :param etag: The ETag of the payload; change it together with the payload to simulate a new release.
+    :param accepts_ranges: Whether Range requests are honoured and Accept-Ranges is sent.
+    :param rate_per_connection: Optional cap in bytes/sec for each connection.
+    :return: The server; its URL is http://127.0.0.1:<server.server_port>/<any path>.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeRequestHandler)
+    server.daemon_threads = True
+    server.payload = payload
+    server.etag = etag
+    server.last_modified = formatdate(usegmt=True)
+    server.accepts_ranges = accepts_ranges
+    server.rate_per_connection = rate_per_connection
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def time_download(url, destination, workers, chunk_size, sha256):
+    """
+    Downloads url once and returns the elapsed seconds.
+    """
+    started = time.perf_counter()
+    Downloader(workers=workers, chunk_size=chunk_size).download(url, destination, sha256=sha256)
+    elapsed = time.perf_counter() - started
+    os.remove(destination)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=64, help="Size of the served file.")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel connections.")
+    parser.add_argument("--chunk-mb", type=int, default=8, help="Size of each parallel byte range.")
+    parser.add_argument("--rate-mb", type=float, default=8.0, help="Per-connection cap of the throttled runs.")
+    parser.add_argument("--runs", type=int, default=3, help="Downloads per configuration; the median is reported.")
+    parser.add_argument("--output", default="bench_output.txt", help="File the results are written to.")
+    args = parser.parse_args()
+
+    payload = os.urandom(args.size_mb * 1024 ** 2)
+    sha256 = hashlib.sha256(payload).hexdigest()
+    chunk_size = args.chunk_mb * 1024 ** 2
+    lines = [
+        f"Downloader benchmark: {args.size_mb} MB file, {args.workers} workers, "
+        f"{args.chunk_mb} MB ranges, median of {args.runs} runs"
+    ]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        destination = os.path.join(temp_dir, "payload.bin")
+        for rate_mb in (None, args.rate_mb):
+            server = start_range_server(payload, rate_per_connection=rate_mb and rate_mb * 1024 ** 2)
+            url = f"http://127.0.0.1:{server.server_port}/payload.bin"
+            label = f"{rate_mb:g} MB/s per connection" if rate_mb else "unthrottled"
+            try:
+                for name, workers in (("single stream", 1), ("parallel", args.workers)):
+                    times = [time_download(url, destination, workers, chunk_size, sha256) for _ in range(args.runs)]
+                    elapsed = statistics.median(times)
+                    lines.append(
+                        f"  {label:>24}, {name:>13}: {elapsed:6.2f}s, {args.size_mb / elapsed:8.1f} MB/s"
+                    )
+            finally:
+                server.shutdown()
+                server.server_close()
+
+    report = "\n".join(lines)
+    print(report)
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
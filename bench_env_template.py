@@ -0,0 +1,81 @@
+"""
+Compares creating an environment with `conda create` against cloning it from an EnvironmentTemplate.
+
+    python bench_env_template.py [--spec python=3.11] [--extra git] [--offline] [--runs 3]
+
+Both paths build the same package spec: a full create solves and links the spec into a
+new prefix; the template path builds the spec once (reported separately, as it is paid
+once per machine) and then times `conda create --clone` plus the install of any --extra
+packages, the way BaseInstaller.create_environment does. Results are printed and written
+to bench_output.txt.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from types import SimpleNamespace
+from package_backends import CondaEnvBackend
+
+
+def timed(cmd):
+    """
+    Runs a command to completion and returns the elapsed seconds.
+    :raises: subprocess.CalledProcessError if it fails.
+    """
+    started = time.perf_counter()
+    subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--spec", nargs="+", default=["python=3.11"], help="Package spec of the template.")
+    parser.add_argument("--extra", nargs="*", default=[], help="Packages installed on top of the clone, e.g. git.")
+    parser.add_argument("--offline", action="store_true", help="Use only the conda package cache.")
+    parser.add_argument("--conda", default=shutil.which("conda"), help="Path of the conda executable.")
+    parser.add_argument("--runs", type=int, default=3, help="Environments per path; the median is reported.")
+    parser.add_argument("--output", default="bench_output.txt", help="File the results are written to.")
+    args = parser.parse_args()
+
+    backend = CondaEnvBackend(SimpleNamespace(conda_exe=args.conda or ""))
+    if not backend.is_available():
+        parser.error("conda was not found; pass --conda.")
+    flags = ["--offline"] if args.offline else []
+    spec = " ".join(args.spec + args.extra)
+    lines = [f"Environment benchmark: {spec}, median of {args.runs} runs"]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        template_path = os.path.join(work_dir, "template")
+        template_seconds = timed([*backend.create_cmd(template_path, args.spec), *flags])
+
+        create_times = []
+        clone_times = []
+        for run in range(args.runs):
+            env_path = os.path.join(work_dir, f"create-{run}")
+            create_times.append(timed([*backend.create_cmd(env_path, args.spec + args.extra), *flags]))
+            shutil.rmtree(env_path, ignore_errors=True)
+
+            env_path = os.path.join(work_dir, f"clone-{run}")
+            seconds = timed([*backend.clone_cmd(template_path, env_path), *flags])
+            if args.extra:
+                seconds += timed([*backend.install_cmd(env_path, args.extra), *flags])
+            clone_times.append(seconds)
+            shutil.rmtree(env_path, ignore_errors=True)
+
+    create_seconds = statistics.median(create_times)
+    clone_seconds = statistics.median(clone_times)
+    lines.append(f"  {'conda create':>22}: {create_seconds:7.2f}s")
+    lines.append(f"  {'clone from template':>22}: {clone_seconds:7.2f}s (speedup {create_seconds / clone_seconds:.1f}x)")
+    lines.append(f"  {'template build (once)':>22}: {template_seconds:7.2f}s")
+
+    report = "\n".join(lines)
+    print(report)
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,15 @@
 import os
 import sys
 import threading
-import time
-import urllib.request
 import subprocess
 from tkinter import messagebox
 from base_card import BaseCard
 import tkinter as tk
 from PIL import Image, ImageTk
-import socket
 from ButtonStateManager import ButtonStateManager
 from DiskSpaceChecker import DiskSpaceChecker
+from downloader import Downloader
+from PortMonitor import PortMonitor
 
 class Ollama(BaseCard):
     def __init__(self):
@@ -21,16 +20,12 @@ class Ollama(BaseCard):
         )
         self.installed = False
 
-    def is_port_open(self, port=11434):
+    def is_port_open(self):
         """
-        Check if a specific port is open.
-        :param port: Port number to check (default is 11434).
+        Check if Ollama's port (11434) is open, from the shared PortMonitor's last reading.
         :return: True if the port is open, False otherwise.
         """
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            sock.settimeout(1)  # Timeout for the connection attempt
-            result = sock.connect_ex(('127.0.0.1', port))
-            return result == 0  # 0 means the port is open
+        return PortMonitor().get_state("ollama") in ("starting", "healthy")
 
     def install(self, status_updater=None):
         """Handle the installation of Ollama."""
@@ -43,14 +38,25 @@ class Ollama(BaseCard):
                 )
 
                 # Define the URL and target path for the installer
-                ollama_url = "https://ollama.com/download/OllamaSetup.exe"
                 installer_name = "OllamaSetup.exe"
                 installer_path = os.path.join(os.getcwd(), installer_name)  # Save in current directory
 
-                # Download the installer
-                with urllib.request.urlopen(ollama_url) as response, open(installer_path, 'wb') as out_file:
-                    data = response.read()
-                    out_file.write(data)
+                # Download the installer from the latest release, checked against the digest published with it
+                ollama_url, ollama_sha256 = Downloader.github_release_asset("ollama/ollama", installer_name)
+                if not ollama_url:
+                    ollama_url = "https://ollama.com/download/OllamaSetup.exe"
+
+                # Download the installer in chunks instead of holding it in memory,
+                # reusing the copy in the artifact cache when there is one
+                self.config.artifact_cache.fetch(
+                    ollama_url,
+                    installer_path,
+                    Downloader(self.config.status_updater),
+                    sha256=ollama_sha256,
+                    step_text="Step: [1/3] Downloading Ollama...",
+                    start=0,
+                    end=50,
+                )
 
                 self.config.status_updater.update_status(
                         "Step: [2/3] Running Installer...",
@@ -76,8 +82,8 @@ class Ollama(BaseCard):
                     )
                 messagebox.showerror("Error", f"Failed to install Ollama: {e}")
 
-        # Run the installation task in a separate thread
-        threading.Thread(target=ollama_install_task, daemon=True).start()
+        # Run the installation task in a separate thread, evicting the artifact cache once it is done
+        threading.Thread(target=self.config.artifact_cache.track(ollama_install_task), daemon=True).start()
 
 
     def uninstall(self):
@@ -99,26 +105,48 @@ class Ollama(BaseCard):
         """
         return f"{self.name} is {'installed' if self.installed else 'not installed'}."
 
+    def handle_update_check_result(self, result):
+        """
+        Reports a newer Ollama release. Ollama updates itself through its own installer,
+        so the card only points the user at it.
+        :param result: The UpdateCheckResult for Ollama.
+        """
+        print(f"Ollama Update Check Result: {result}")
+        if result.update_available:
+            self.config.status_updater.update_details(
+                f"Ollama {result.latest} is available (installed: {result.installed})."
+            )
+
     def monitor_port_and_update_button(self, button_name):
         """
-        Continuously checks the port status and updates the button state.
+        Keeps the install button in sync with Ollama's port and the free disk space,
+        driven by PortMonitor state changes and DiskSpaceChecker threshold crossings.
         :param button_name: The unique name of the button in the ButtonStateManager.
         """
-        def task():
+        status = {"running": None, "enough_space": None}
+
+        def refresh_button():
             button_manager = ButtonStateManager()
-            disk_checker = DiskSpaceChecker()
-            while True:
-                if self.is_port_open():
-                    # Port is open, disable the install button
-                    button_manager.disable_buttons(button_name)
-                else:
-                    if disk_checker.has_enough_space(self.size):
-                        button_manager.enable_buttons(button_name)
-                    else:
-                        button_manager.disable_buttons(button_name)
-                time.sleep(1)  # Check every second
-
-        threading.Thread(target=task, daemon=True).start()
+            if status["running"] is None or status["enough_space"] is None:
+                return  # Wait for the first reading of both monitors
+            if status["running"]:
+                # Ollama is running, disable the install button
+                button_manager.disable_buttons(button_name)
+            elif status["enough_space"]:
+                button_manager.enable_buttons(button_name)
+            else:
+                button_manager.disable_buttons(button_name)
+
+        def on_port_state(_, state):
+            status["running"] = state != "down"
+            refresh_button()
+
+        def on_disk_space(enough_space, _):
+            status["enough_space"] = enough_space
+            refresh_button()
+
+        PortMonitor().subscribe("ollama", on_port_state)
+        DiskSpaceChecker().subscribe(self.size, on_disk_space)
         
 
     def display(self, parent_frame, status_updater):
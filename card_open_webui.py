@@ -1,8 +1,6 @@
 import os
 import sys
 import psutil
-import socket
-import subprocess
 import time
 import webbrowser
 from AppDesktopIntegration import AppDesktopIntegration
@@ -15,11 +13,17 @@ from installer_miniconda import MinicondaInstaller
 from installer_openwebui import OpenWebUIInstaller
 from installer_pipelines import PipelinesInstaller
 from DiskSpaceChecker import DiskSpaceChecker
+from disk_budget import DiskBudget
+from PortMonitor import PortMonitor
+from ProcessSupervisor import ProcessSupervisor
 
 class OpenWebUI(BaseCard):
+    SERVER_STATUS_INTERVAL = 2000  # Milliseconds between refreshes of the server status line
+
     def __init__(self):
         super().__init__(name="Open WebUI", description="A robust tool for creating controlling and befeting from your own AI System", size="4.5")
         self.server_running = False  # Tracks if the server is running
+        self.status_updater = None  # Set when the card is displayed
 
 
     def install(self, status_updater=None):
@@ -36,9 +40,27 @@ class OpenWebUI(BaseCard):
                 "update_open_webui_pipelines"
             ])           
             try:
-                # Ensure Miniconda is installed
                 miniconda_installer = MinicondaInstaller(status_updater)
-                miniconda_installer.install()
+                webui_installer = OpenWebUIInstaller(status_updater)
+
+                # Check the whole install fits on the drive before anything is downloaded
+                budget = DiskBudget("Open WebUI", status_updater)
+                miniconda_installer.plan_disk_budget(budget)
+                webui_installer.plan_disk_budget(budget)
+                try:
+                    budget.reserve()
+
+                    # Ensure Miniconda is installed
+                    with budget.step("miniconda"):
+                        miniconda_installer.install()
+                except RuntimeError as e:
+                    if status_updater:
+                        status_updater.update_status(
+                            "Error: Installation Failed.",
+                            f"An error occurred: {e}",
+                            0,
+                        )
+                    return
 
                 # Check if Miniconda installation is successful
                 if not miniconda_installer.check_installed():
@@ -57,11 +79,11 @@ class OpenWebUI(BaseCard):
                         "Creating a Conda environment for Open WebUI.",
                         0,
                     )
-                webui_installer = OpenWebUIInstaller(status_updater)
 
                 # Use OpenWebUIInstaller to set up the environment and install Open WebUI
                 try:
-                    webui_installer.setup_environment("env")
+                    with budget.step("environment"):
+                        webui_installer.setup_environment("env")
 
                     if status_updater:
                         status_updater.update_status(
@@ -80,7 +102,9 @@ class OpenWebUI(BaseCard):
 
                 # Install Open WebUI
                 try:
-                    webui_installer.install()
+                    with budget.step("open-webui"):
+                        webui_installer.install()
+                    print(budget.summary())
 
                     if status_updater:
                         status_updater.update_status(
@@ -126,9 +150,9 @@ class OpenWebUI(BaseCard):
                 self.config.stop_spinner()            
 
 
-        # Run installation in a separate thread
+        # Run installation in a separate thread, evicting the artifact cache once it is done
         self.config.start_spinner()
-        threading.Thread(target=installation_task, daemon=True).start()
+        threading.Thread(target=self.config.artifact_cache.track(installation_task), daemon=True).start()
 
 
 
@@ -157,27 +181,8 @@ class OpenWebUI(BaseCard):
                     "Launching the Open WebUI server. Please wait. (Sometimes this can take a few minutes)",
                     50,
                 )
-                conda_exe = webui_installer.conda_exe
-                env_path = webui_installer.env_path
-                open_webui_cmd = [
-                    conda_exe,
-                    "run",
-                    "--prefix", env_path,
-                    "open-webui", "serve"
-                ]
-
-                CREATE_NO_WINDOW = 0x08000000
-                webui_process = subprocess.Popen(
-                    open_webui_cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    creationflags=CREATE_NO_WINDOW
-                )
-
-                open_webui_pid_file = os.path.join(webui_installer.config.base_path, "open_webui.pid")
-                with open(open_webui_pid_file, "w") as f:
-                    f.write(str(webui_process.pid))
+                # The supervisor writes the PID file and restarts the server if it crashes or hangs
+                webui_installer.start_server()
 
                 status_updater.update_status(
                     "Step: Starting Open WebUI...",
@@ -235,15 +240,10 @@ class OpenWebUI(BaseCard):
             Monitor the Open WebUI server until it's up, then open the browser.
             """
             try:
-                server_ready = False
-                print("Checking server availability on localhost:8080...")
-                for _ in range(120):  # Retry for up to 120 attempts (2 minutes)
-                    try:
-                        with socket.create_connection(("localhost", 8080), timeout=2):
-                            server_ready = True
-                            break
-                    except (socket.timeout, ConnectionRefusedError):
-                        time.sleep(1)  # Wait before retrying
+                print("Waiting for the Open WebUI server on localhost:8080 to become healthy...")
+                port_monitor = PortMonitor()
+                port_monitor.expect("open-webui")
+                server_ready = port_monitor.wait_for("open-webui", ("healthy",), timeout=120)
                 if server_ready:
                     print("Server is up. Opening browser to http://localhost:8080...")
                     webbrowser.open("http://localhost:8080")
@@ -335,7 +335,10 @@ class OpenWebUI(BaseCard):
             else:
                 print(f"PID file {pid_file} does not exist.")
 
-        # Stop all processes specified by the PID files
+        # Stop the supervised servers first so they are not restarted
+        ProcessSupervisor().stop_all()
+
+        # Stop processes left running by an earlier session from their PID files
         for pid_file in pid_files:
             stop_process_from_pid_file(os.path.join(self.config.base_path, pid_file))
 
@@ -379,10 +382,37 @@ class OpenWebUI(BaseCard):
         """
         return f"{self.name} is {'installed' if self.is_installed else 'not installed'}."
     
-    def handle_update_check_result(self, update_available):
+    @staticmethod
+    def _server_status_text(statuses):
+        """
+        Formats the supervisor's status of the servers for the card, e.g. "open-webui: running 1h 05m, 0 restarts".
+        """
+        parts = []
+        for name, status in statuses.items():
+            if status["state"] == "stopped":
+                continue
+            minutes = int(status["uptime"] // 60)
+            uptime = f"{minutes // 60}h {minutes % 60:02d}m" if minutes >= 60 else f"{minutes}m"
+            restarts = f"{status['restarts']} restart{'' if status['restarts'] == 1 else 's'}"
+            if status["state"] == "running":
+                parts.append(f"{name}: running {uptime}, {restarts}")
+            else:
+                parts.append(f"{name}: {status['state']}, {restarts}")
+        return " | ".join(parts)
+
+    @staticmethod
+    def _update_message(update_available, download_size=None):
+        if not update_available:
+            return "No update is available."
+        if download_size:
+            return f"An update is available ({download_size / 1024 ** 2:.1f} MB download)."
+        return "An update is available."
+
+    def handle_update_check_result(self, update_available, download_size=None):
         """
         Callback function to handle the result of the update check.
         :param update_available: True if an update is available, otherwise False.
+        :param download_size: Optional size in bytes of the Open WebUI package the update downloads.
         """
         button_manager = ButtonStateManager()
         if update_available:
@@ -392,7 +422,7 @@ class OpenWebUI(BaseCard):
 
         self.config.status_updater.update_status(
             "Initializing Complete",
-            "An update is available." if update_available else "No update is available.",
+            self._update_message(update_available, download_size),
             100,
         )
 
@@ -461,8 +491,8 @@ class OpenWebUI(BaseCard):
                     )
                 print(f"Update failed: {e}")
             buttonmanager.enable_buttons("start_open_webui")
-        # Run the update task in a background thread
-        threading.Thread(target=update_task, daemon=True).start()
+        # Run the update task in a background thread, evicting the artifact cache once it is done
+        threading.Thread(target=self.config.artifact_cache.track(update_task), daemon=True).start()
 
 
     def display(self, parent_frame, status_updater):
@@ -502,12 +532,20 @@ class OpenWebUI(BaseCard):
         size_label = tk.Label(card_frame, text=f"Size: {self.size}GB", font=("Arial", 9))
         size_label.place(x=10, rely=1.0, anchor="sw", y=-10)
 
-        disk_checker = DiskSpaceChecker()
-        button_manager = ButtonStateManager()
-        webui_installer = OpenWebUIInstaller(status_updater)
-                
+        # Uptime and restart counters of the supervised servers
+        server_label = tk.Label(card_frame, text="", font=("Arial", 9))
+        server_label.place(x=10, rely=1.0, anchor="sw", y=-30)
+
+        def refresh_server_status():
+            server_label.config(text=self._server_status_text(ProcessSupervisor().status_all()))
+            server_label.after(self.SERVER_STATUS_INTERVAL, refresh_server_status)
 
+        refresh_server_status()
 
+        self.status_updater = status_updater
+        button_manager = ButtonStateManager()
+
+        # Buttons stay disabled until the background state probe reports back
         install_button = tk.Button(card_frame, text="Install", command=lambda: self.install(status_updater))
         install_button.place(relx=1.0, rely=1.0, anchor="se", x=-180, y=-10)
         install_button.config(state="disabled")
@@ -531,9 +569,17 @@ class OpenWebUI(BaseCard):
         update_button.config(state="disabled")
         button_manager.register_button("update_open_webui", update_button)
 
-        if webui_installer.check_installed():
+    def apply_install_state(self, state):
+        """
+        Updates the card's buttons from the shared startup probe result.
+        :param state: The InstallState collected by InstallStateProbe.
+        """
+        disk_checker = DiskSpaceChecker()
+        button_manager = ButtonStateManager()
+
+        if state.openwebui_installed:
             button_manager.enable_buttons("start_open_webui")
-            webui_installer.check_update(callback=self.handle_update_check_result)
+            # The Update button is set once UpdateCheckService reports back
         else:
             if disk_checker.has_enough_space(self.size):
                 button_manager.enable_buttons("install_open_webui")
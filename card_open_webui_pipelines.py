@@ -10,6 +10,8 @@ from installer_miniconda import MinicondaInstaller
 from installer_openwebui import OpenWebUIInstaller
 from installer_pipelines import PipelinesInstaller
 from DiskSpaceChecker import DiskSpaceChecker
+from task_scheduler import TaskScheduler
+from disk_budget import DiskBudget
 
 class OpenWebUIPipelines(BaseCard):
     def __init__(self):
@@ -27,57 +29,47 @@ class OpenWebUIPipelines(BaseCard):
 
             try:
                 self.config.start_spinner()
-                # Ensure Miniconda is installed
                 miniconda_installer = MinicondaInstaller(status_updater)
-                miniconda_installer.install()
-
-                # Check if Miniconda installation is successful
-                if not miniconda_installer.check_installed():
-                    if status_updater:
-                        status_updater.update_status(
-                            "Error: Miniconda Installation Failed.",
-                            "Cannot proceed with Open WebUI installation.",
-                            0,
-                        )
-                    return
-
-
-                # Set up Pipelines
-                # pipeline_installer = PipelinesInstaller(status_updater)
-                try:
-                    if status_updater:
-                        status_updater.update_status(
-                            "Step: [1/6] Pipelines Environment Setup is starting",
-                            "Environment is being installed.",
-                            0,
-                        )                  
-                    miniconda_installer.setup_environment("env_pipelines", packages=["git"])
+                pipeline_installer = PipelinesInstaller(status_updater)
 
-                    if status_updater:
-                        status_updater.update_status(
-                            "Step: [2/6] Pipelines Environment Complete.",
-                            "Environment installed successfully.",
-                            25,
-                        )
-                except Exception as e:
-                    if status_updater:
-                        status_updater.update_status(
-                            "Error: Pipelines Setup Failed.",
-                            f"An error occurred: {e}",
-                            0,
-                        )
-                    return
+                def install_miniconda():
+                    # Ensure Miniconda is installed
+                    miniconda_installer.install()
+
+                    # Check if Miniconda installation is successful
+                    if not miniconda_installer.check_installed():
+                        raise RuntimeError("Miniconda is not installed. Cannot proceed with Pipelines installation.")
+
+                # Each step is checked against the disk budget before it starts
+                budget = DiskBudget("Pipelines", status_updater)
+                miniconda_installer.plan_disk_budget(budget)
+                pipeline_installer.plan_disk_budget(budget)
+
+                # The clone only needs dulwich, so it runs while Miniconda and the environment are set up
+                scheduler = TaskScheduler(status_updater=status_updater)
+                scheduler.add_task("miniconda", budget.track("miniconda", install_miniconda), description="Miniconda Install")
+                scheduler.add_task("clone", budget.track("clone", pipeline_installer.clone_repository), description="Pipelines Clone")
+                scheduler.add_task(
+                    "environment",
+                    budget.track(
+                        "environment",
+                        lambda: miniconda_installer.setup_environment("env_pipelines", packages=["git"]),
+                    ),
+                    depends_on=["miniconda"],
+                    description="Pipelines Environment Setup",
+                )
+                scheduler.add_task(
+                    "requirements",
+                    budget.track("requirements", pipeline_installer.install_requirements),
+                    depends_on=["environment", "clone"],
+                    description="Pipelines Dependencies Install",
+                )
 
-                # Set up Pipelines
-                pipeline_installer = PipelinesInstaller(status_updater)
                 try:
-                    if status_updater:
-                        status_updater.update_status(
-                            "Step: [3/6] Starting Pipelines Instalation.",
-                            "Pipelines Installing",
-                            50,
-                        )                    
-                    pipeline_installer.install()
+                    # Fail before anything is downloaded if the whole install does not fit
+                    budget.reserve()
+                    scheduler.run()
+                    print(budget.summary())
 
                     if status_updater:
                         status_updater.update_status(
@@ -102,8 +94,48 @@ class OpenWebUIPipelines(BaseCard):
                 self.config.stop_spinner()
 
 
-        # Run installation in a separate thread
-        threading.Thread(target=installation_task, daemon=True).start()
+        # Run installation in a separate thread, evicting the artifact cache once it is done
+        threading.Thread(target=self.config.artifact_cache.track(installation_task), daemon=True).start()
+
+    def update(self, status_updater=None):
+        """
+        Update the pipelines repository and its dependencies in the background.
+        """
+        def update_task():
+            button_manager = ButtonStateManager()
+            button_manager.disable_buttons("update_open_webui_pipelines")
+            try:
+                PipelinesInstaller(status_updater).update()
+                if status_updater:
+                    status_updater.update_status(
+                        "Update Complete",
+                        "Pipelines have been updated successfully.",
+                        100,
+                    )
+            except Exception as e:
+                button_manager.enable_buttons("update_open_webui_pipelines")
+                if status_updater:
+                    status_updater.update_status(
+                        "Error: Update Failed",
+                        f"An error occurred during update: {e}",
+                        0,
+                    )
+                print(f"Update failed: {e}")
+
+        # Run in a separate thread, evicting the artifact cache once it is done
+        threading.Thread(target=self.config.artifact_cache.track(update_task), daemon=True).start()
+
+    def handle_update_check_result(self, update_available):
+        """
+        Callback function to handle the result of the pipelines update check.
+        :param update_available: True if an update is available, otherwise False.
+        """
+        button_manager = ButtonStateManager()
+        if update_available:
+            button_manager.enable_buttons("update_open_webui_pipelines")
+        else:
+            button_manager.disable_buttons("update_open_webui_pipelines")
+        print(f"Pipelines Update Check Result: Update Available = {update_available}")
 
     def uninstall(self):
         """
@@ -163,7 +195,6 @@ class OpenWebUIPipelines(BaseCard):
         size_label = tk.Label(card_frame, text=f"Size: {self.size}GB", font=("Arial", 9))
         size_label.place(x=10, rely=1.0, anchor="sw", y=-10)
 
-        disk_checker = DiskSpaceChecker()
         button_manager = ButtonStateManager()
 
         auto_button = tk.Button(card_frame, text="Auto", state=tk.DISABLED)
@@ -179,9 +210,15 @@ class OpenWebUIPipelines(BaseCard):
         update_button.config(state="disabled")
         button_manager.register_button("update_open_webui_pipelines", update_button)
 
-        webui_installer = OpenWebUIInstaller(status_updater)
-        pipeline_installer = PipelinesInstaller(status_updater)
-        if webui_installer.check_installed() and not pipeline_installer.check_installed():
+    def apply_install_state(self, state):
+        """
+        Updates the card's buttons from the shared startup probe result.
+        :param state: The InstallState collected by InstallStateProbe.
+        """
+        disk_checker = DiskSpaceChecker()
+        button_manager = ButtonStateManager()
+
+        if state.openwebui_installed and not state.pipelines_installed:
             if disk_checker.has_enough_space(self.size):
                 button_manager.enable_buttons("install_open_webui_pipelines")
             else:
@@ -0,0 +1,130 @@
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+
+
+class CommandResult:
+    """
+    Outcome of a single command run through the CommandRunner.
+    """
+    def __init__(self, cmd_list, returncode, wall_time, peak_output_bytes, stdout_lines, stderr_lines):
+        self.cmd_list = cmd_list
+        self.returncode = returncode
+        self.wall_time = wall_time
+        self.peak_output_bytes = peak_output_bytes
+        self.stdout_lines = stdout_lines
+        self.stderr_lines = stderr_lines
+
+    @property
+    def stdout(self):
+        return "\n".join(self.stdout_lines)
+
+    @property
+    def stderr(self):
+        return "\n".join(self.stderr_lines)
+
+    def __str__(self):
+        return (
+            f"Return Code: {self.returncode}, "
+            f"Wall Time: {self.wall_time:.1f}s, "
+            f"Peak Output: {self.peak_output_bytes} bytes"
+        )
+
+
+class CommandRunner:
+    """
+    Runs external commands and streams their stdout/stderr line by line.
+    Only the last `max_lines` lines of each stream are kept in memory.
+    """
+
+    # Windows-specific flag to suppress console window
+    CREATE_NO_WINDOW = 0x08000000
+
+    def __init__(self, max_lines=500, max_history=50):
+        self.max_lines = max_lines
+        self.history = deque(maxlen=max_history)
+
+    def run(self, cmd_list, cwd=None, env=None, on_line=None, capture_output=True):
+        """
+        Runs a command, streaming its output as it is produced.
+
+        :param cmd_list: List of command and arguments to run.
+        :param cwd: Directory to execute the command in.
+        :param env: Environment variables for the process. Defaults to a copy of os.environ.
+        :param on_line: Optional callback called as on_line(line, stream_name) for every output line.
+        :param capture_output: Whether to capture stdout and stderr. If False, output goes to the console.
+        :return: A CommandResult describing the finished command.
+        """
+        command_str = ' '.join(cmd_list)
+        print(f"Running command: {command_str}")
+
+        popen_kwargs = {}
+        if os.name == 'nt':
+            # Configure STARTUPINFO to hide the console window
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            popen_kwargs["startupinfo"] = startupinfo
+            popen_kwargs["creationflags"] = self.CREATE_NO_WINDOW
+
+        start_time = time.monotonic()
+        process = subprocess.Popen(
+            cmd_list,
+            stdout=subprocess.PIPE if capture_output else None,
+            stderr=subprocess.PIPE if capture_output else None,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            cwd=cwd,
+            env=env if env is not None else os.environ.copy(),
+            **popen_kwargs
+        )
+
+        stdout_lines = deque(maxlen=self.max_lines)
+        stderr_lines = deque(maxlen=self.max_lines)
+        buffered = {"bytes": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def pump(stream, lines, stream_name):
+            for raw_line in stream:
+                line = raw_line.rstrip("\r\n")
+                with lock:
+                    if len(lines) == lines.maxlen:
+                        buffered["bytes"] -= len(lines[0])
+                    lines.append(line)
+                    buffered["bytes"] += len(line)
+                    buffered["peak"] = max(buffered["peak"], buffered["bytes"])
+                if on_line:
+                    try:
+                        on_line(line, stream_name)
+                    except Exception as e:
+                        print(f"Error in output callback: {e}")
+            stream.close()
+
+        readers = []
+        if capture_output:
+            for stream, lines, stream_name in (
+                (process.stdout, stdout_lines, "stdout"),
+                (process.stderr, stderr_lines, "stderr"),
+            ):
+                reader = threading.Thread(target=pump, args=(stream, lines, stream_name), daemon=True)
+                reader.start()
+                readers.append(reader)
+
+        for reader in readers:
+            reader.join()
+        returncode = process.wait()
+
+        result = CommandResult(
+            cmd_list,
+            returncode,
+            time.monotonic() - start_time,
+            buffered["peak"],
+            list(stdout_lines),
+            list(stderr_lines),
+        )
+        self.history.append(result)
+        print(f"Command finished: {command_str} ({result})")
+        return result
@@ -0,0 +1,259 @@
+import json
+import os
+import threading
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from AppConfig import AppConfig
+from command_runner import CommandRunner
+from DiskSpaceChecker import DiskSpaceChecker
+from downloader import Downloader
+from update_planner import UpdatePlanner
+
+
+class BudgetStep:
+    """
+    One step of an install and the disk space it is expected to use.
+    """
+
+    def __init__(self, name, fallback_bytes, estimator=None, description=None):
+        """
+        :param name: Unique name of the step, e.g. "miniconda".
+        :param fallback_bytes: Bytes assumed when the step cannot be estimated yet.
+        :param estimator: Optional function returning the estimated bytes, or None if it cannot tell yet.
+        :param description: Human readable description used in messages.
+        """
+        self.name = name
+        self.fallback_bytes = fallback_bytes
+        self.estimator = estimator
+        self.description = description or name
+        self.estimated_bytes = None
+        self.is_fallback = True  # Whether estimated_bytes is the fallback rather than a real estimate
+        self.actual_bytes = None
+        self.free_before = None  # Free space when the step started, set while it runs
+        self.done = False
+
+
+class DiskBudget:
+    """
+    Estimates the disk space of every step of an install and checks it against the free
+    space before anything is written, so a large install fails up front instead of half-way.
+
+    Each step is estimated from what it will actually fetch: the installer's Content-Length,
+    the package sizes of a `conda create --dry-run` solve, or the wheels of a
+    `pip install --dry-run --report` resolve. Estimates that need a step before them (the
+    environment must exist before pip can resolve into it) use a fallback at first and are
+    refined when the step starts. While a step runs, the bytes it actually writes are
+    measured from the change in free space, and the remaining plan is checked again before
+    the next step starts.
+
+    When installing from an offline bundle, estimates that would need the network (HEAD
+    requests, conda solves against the channels) are skipped and their fallbacks are used.
+    """
+
+    SAFETY_MARGIN = 512 * 1024 ** 2  # Bytes kept free on top of the plan
+    INSTALLER_EXPANSION = 6.0  # Installed size of a self-extracting installer relative to the download
+    CONDA_EXPANSION = 4.0  # Package archive, its extracted copy in pkgs and the linked files
+    WHEEL_EXPANSION = 3.5  # Cached wheel plus its unpacked files in site-packages
+    PROBE_WORKERS = 8
+
+    def __init__(self, name, status_updater=None):
+        """
+        :param name: Name of the install, used in messages.
+        :param status_updater: Optional StatusUpdater that receives budget messages.
+        """
+        self.name = name
+        self.status_updater = status_updater
+        self.steps = {}
+        self.lock = threading.Lock()
+
+    def add_step(self, name, fallback_bytes, estimator=None, description=None):
+        """
+        Adds a step to the plan. See BudgetStep for the parameters.
+        """
+        if name in self.steps:
+            raise ValueError(f"Budget step {name} is already planned.")
+        self.steps[name] = BudgetStep(name, fallback_bytes, estimator, description)
+
+    def _estimate(self, step):
+        estimated = None
+        if step.estimator:
+            try:
+                estimated = step.estimator()
+            except Exception as e:
+                print(f"Could not estimate the disk space of {step.description}: {e}")
+        step.is_fallback = estimated is None
+        step.estimated_bytes = step.fallback_bytes if step.is_fallback else int(estimated)
+        return step.estimated_bytes
+
+    def remaining_bytes(self, free=None):
+        """
+        Returns the estimated bytes of the steps that have not finished yet.
+        :param free: The current free space. If given, the bytes running steps have written
+            so far are subtracted, since they are no longer part of the free space.
+        """
+        remaining = 0
+        with self.lock:
+            for step in self.steps.values():
+                if step.done:
+                    continue
+                estimated = step.estimated_bytes or 0
+                if free is not None and step.free_before is not None:
+                    # Running steps on the same drive see each other's writes, so this may undercount
+                    estimated = max(estimated - max(step.free_before - free, 0), 0)
+                remaining += estimated
+        return remaining
+
+    def _check(self, context):
+        free = DiskSpaceChecker().free_space(max_age=0)
+        required = self.remaining_bytes(free) + self.SAFETY_MARGIN
+        if free < required:
+            raise RuntimeError(
+                f"Not enough disk space {context}: {self.name} needs about {self.format_bytes(required)} "
+                f"but only {self.format_bytes(free)} is free."
+            )
+        return free
+
+    def reserve(self):
+        """
+        Estimates every step and checks the whole plan against the free space.
+        :raises: RuntimeError if the plan does not fit.
+        """
+        for step in self.steps.values():
+            self._estimate(step)
+        print(self.summary())
+        free = self._check("to start")
+        if self.status_updater:
+            self.status_updater.update_details(
+                f"Disk space: {self.format_bytes(self.remaining_bytes())} needed, {self.format_bytes(free)} free."
+            )
+
+    @contextmanager
+    def step(self, name):
+        """
+        Runs a step of the plan: refines its estimate if it was a fallback, checks the
+        remaining plan still fits and measures the bytes the step writes.
+        :raises: RuntimeError if the remaining plan no longer fits.
+        """
+        step = self.steps[name]
+        if step.is_fallback:
+            self._estimate(step)
+        checker = DiskSpaceChecker()
+        free_before = self._check(f"for {step.description}")
+        with self.lock:
+            step.free_before = free_before
+        try:
+            with checker.active():
+                yield step
+        finally:
+            written = max(free_before - checker.free_space(max_age=0), 0)
+            with self.lock:
+                step.actual_bytes = written
+                step.free_before = None
+                step.done = True
+        print(
+            f"{step.description} wrote {self.format_bytes(written)} "
+            f"(estimated {self.format_bytes(step.estimated_bytes)})."
+        )
+
+    def track(self, name, func):
+        """
+        Wraps a function so it runs as a step of the plan, e.g. for TaskScheduler.add_task.
+        Steps running at the same time share the drive, so their measurements include each other's writes.
+        """
+        def tracked():
+            with self.step(name):
+                return func()
+        return tracked
+
+    def summary(self):
+        lines = [f"Disk budget for {self.name}:"]
+        for step in self.steps.values():
+            line = f"  {step.description}: {self.format_bytes(step.estimated_bytes or 0)} estimated"
+            if step.actual_bytes is not None:
+                line += f", {self.format_bytes(step.actual_bytes)} written"
+            lines.append(line)
+        return "\n".join(lines)
+
+    @staticmethod
+    def format_bytes(size):
+        return f"{size / 1024 ** 3:.2f} GB" if size >= 1024 ** 3 else f"{size / 1024 ** 2:.0f} MB"
+
+    @staticmethod
+    def estimate_download(url, expansion=1.0):
+        """
+        Estimates a download from the Content-Length of a HEAD request.
+        :param expansion: Factor applied to the download size, e.g. for installers that extract themselves.
+        :return: Estimated bytes, or None if the server does not report a size or installing offline.
+        """
+        if AppConfig().offline_bundle:
+            return None
+        size, _ = Downloader().probe(url)
+        return None if size is None else int(size * expansion)
+
+    @classmethod
+    def estimate_environment(cls, installer, env_path, packages):
+        """
+        Estimates a new environment from the package sizes of a dry-run solve.
+        :param installer: The BaseInstaller whose environment backend creates the environment.
+        :param packages: The package spec of the environment, e.g. ["python=3.11", "git"].
+        :return: Estimated bytes, 0 if the environment exists, or None if the backend is unavailable
+            or installing offline.
+        """
+        if os.path.exists(env_path):
+            return 0
+        if installer.config.offline_bundle:
+            return None  # The dry-run solve would query the channels
+        backend = installer.env_backend
+        if not backend.is_available():
+            return None
+        cmd = [*backend.create_cmd(env_path, packages), "--dry-run", "--json"]
+        env = os.environ.copy()
+        env.update(installer.config.artifact_cache.env())
+        # The JSON report is long, so it is read in full rather than from the installer's tail buffer
+        result = CommandRunner(max_lines=None).run(cmd, env=env)
+        if result.returncode != 0:
+            return None
+        actions = json.loads(result.stdout).get("actions", {})
+        if isinstance(actions, list):  # Older conda versions report a list of transactions
+            fetch = [package for action in actions for package in action.get("FETCH", [])]
+        else:
+            fetch = actions.get("FETCH", [])
+        fetch_bytes = sum(package.get("size") or 0 for package in fetch)
+        return int(fetch_bytes * cls.CONDA_EXPANSION)
+
+    @classmethod
+    def estimate_pip_install(cls, installer, env_path, args):
+        """
+        Estimates a pip install from the wheels a dry-run resolve selects.
+        :param installer: The BaseInstaller used to run pip.
+        :param env_path: The prefix of an existing environment.
+        :param args: pip install arguments, e.g. ["-r", "requirements.txt"].
+        :return: Estimated bytes, or None if the environment does not exist yet.
+        """
+        if not os.path.exists(env_path):
+            return None
+        report = UpdatePlanner(installer).resolve(env_path, args)
+        urls = [item.get("download_info", {}).get("url", "") for item in report.get("install", [])]
+        if not urls:
+            return 0
+        downloader = Downloader()
+        offline = installer.config.offline_bundle is not None
+
+        def file_size(url):
+            if url.startswith("file:"):  # Offline bundle wheelhouse
+                path = urllib.request.url2pathname(urllib.parse.urlparse(url).path)
+                return os.path.getsize(path) if os.path.exists(path) else None
+            if offline or not url.startswith("http"):
+                return None
+            return downloader.probe(url)[0]
+
+        with ThreadPoolExecutor(max_workers=cls.PROBE_WORKERS) as executor:
+            sizes = list(executor.map(file_size, urls))
+        known = [size for size in sizes if size]
+        if not known:
+            return None
+        # Files whose size is unknown are assumed to be as large as the average known one
+        total = sum(known) * len(sizes) / len(known)
+        return int(total * cls.WHEEL_EXPANSION)
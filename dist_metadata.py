@@ -0,0 +1,117 @@
+import glob
+import os
+import re
+from email.parser import HeaderParser
+
+
+class DistInfoReader:
+    """
+    Reads installed package metadata straight from an environment's site-packages,
+    without starting the environment's interpreter.
+    """
+
+    def __init__(self, prefix):
+        """
+        :param prefix: Path to the Conda environment (e.g. the `env` directory).
+        """
+        self.prefix = prefix
+
+    @staticmethod
+    def normalize_name(name):
+        """
+        Normalizes a distribution name as described in PEP 503 (e.g. "Open_WebUI" -> "open-webui").
+        """
+        return re.sub(r"[-_.]+", "-", name).lower()
+
+    def site_packages_dirs(self):
+        """
+        Returns the site-packages directories that exist in the environment.
+        Windows environments use Lib/site-packages, others lib/pythonX.Y/site-packages.
+        """
+        candidates = [os.path.join(self.prefix, "Lib", "site-packages")]
+        candidates.extend(glob.glob(os.path.join(self.prefix, "lib", "python3*", "site-packages")))
+        return [path for path in candidates if os.path.isdir(path)]
+
+    def find_dist_info(self, name):
+        """
+        Finds the .dist-info directories belonging to a distribution.
+        :param name: The distribution name, e.g. "open-webui".
+        :return: List of matching .dist-info directory paths.
+        """
+        wanted = self.normalize_name(name)
+        matches = []
+        for site_packages in self.site_packages_dirs():
+            for entry in os.listdir(site_packages):
+                if not entry.endswith(".dist-info"):
+                    continue
+                # Directory names look like "open_webui-0.5.4.dist-info"
+                dist_name = entry[:-len(".dist-info")].rsplit("-", 1)[0]
+                if self.normalize_name(dist_name) == wanted:
+                    matches.append(os.path.join(site_packages, entry))
+        return matches
+
+    @staticmethod
+    def read_metadata(dist_info_path):
+        """
+        Parses the headers of a METADATA file.
+        :return: An email.message.Message with the metadata headers, or None if the file is missing.
+        """
+        metadata_path = os.path.join(dist_info_path, "METADATA")
+        if not os.path.exists(metadata_path):
+            return None
+        with open(metadata_path, "r", encoding="utf-8", errors="replace") as f:
+            return HeaderParser().parse(f)
+
+    def get_version(self, name):
+        """
+        Returns the installed version of a distribution.
+        :param name: The distribution name, e.g. "open-webui".
+        :return: The version string, or None if the distribution is not installed.
+        :raises LookupError: If the metadata is missing or ambiguous and the answer cannot be trusted.
+        """
+        if not self.site_packages_dirs():
+            raise LookupError(f"No site-packages directory found in {self.prefix}")
+
+        matches = self.find_dist_info(name)
+        if not matches:
+            return None
+        if len(matches) > 1:
+            raise LookupError(f"Multiple metadata directories found for {name}: {matches}")
+
+        metadata = self.read_metadata(matches[0])
+        if metadata is None or not metadata.get("Version"):
+            raise LookupError(f"Metadata for {name} is missing or incomplete in {matches[0]}")
+        return metadata["Version"].strip()
+
+    def iter_distributions(self):
+        """
+        Yields every installed distribution in the environment.
+        :return: Iterator of (name, version, dist_info_path) tuples, skipping entries without usable metadata.
+        """
+        for site_packages in self.site_packages_dirs():
+            for entry in sorted(os.listdir(site_packages)):
+                if not entry.endswith(".dist-info"):
+                    continue
+                dist_info_path = os.path.join(site_packages, entry)
+                metadata = self.read_metadata(dist_info_path)
+                if metadata is None or not metadata.get("Name") or not metadata.get("Version"):
+                    continue
+                yield metadata["Name"].strip(), metadata["Version"].strip(), dist_info_path
+
+    @staticmethod
+    def read_installer(dist_info_path):
+        """
+        Returns the tool that installed a distribution (e.g. "pip", "conda", "uv"), or None if unknown.
+        """
+        installer_path = os.path.join(dist_info_path, "INSTALLER")
+        if not os.path.exists(installer_path):
+            return None
+        with open(installer_path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read().strip() or None
+
+    @staticmethod
+    def is_direct_url(dist_info_path):
+        """
+        Returns True if a distribution was installed from a local path, VCS or URL rather than an index.
+        """
+        return os.path.exists(os.path.join(dist_info_path, "direct_url.json"))
@@ -0,0 +1,426 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from AppConfig import AppConfig
+from DiskSpaceChecker import DiskSpaceChecker
+
+
+class RemoteFileChanged(RuntimeError):
+    """
+    Raised when a kept partial download no longer matches the file on the server.
+    """
+
+
+class Downloader:
+    """
+    Streams a file to disk in fixed-size chunks.
+
+    Data is written to a `.part` file next to the destination. An interrupted transfer
+    resumes with an HTTP Range request, and the optional SHA-256 is verified before the
+    `.part` file is atomically renamed into place.
+
+    Resuming is only safe if the file on the server is still the one the `.part` file was
+    started from, which matters for "latest" URLs. The response's ETag or Last-Modified is
+    saved next to the `.part` file and sent back as If-Range, so a changed file comes back
+    whole (200) and the download starts over. A partial file without validators is never
+    resumed, and one whose checksum fails after a resume is discarded and fetched again.
+
+    When the server advertises `Accept-Ranges: bytes`, large files are split into byte
+    ranges that are fetched on a thread pool into a preallocated `.part` file.
+    """
+
+    def __init__(self, status_updater=None, workers=None, chunk_size=None, timeout=30):
+        """
+        :param status_updater: Optional StatusUpdater that receives progress, rate and ETA.
+        :param workers: Number of parallel connections. Defaults to AppConfig.download_workers.
+        :param chunk_size: Size in bytes of each parallel byte range. Defaults to AppConfig.download_chunk_size.
+        :param timeout: Socket timeout in seconds.
+        """
+        config = AppConfig()
+        self.status_updater = status_updater
+        self.workers = workers or config.download_workers
+        self.chunk_size = chunk_size or config.download_chunk_size
+        self.read_size = 256 * 1024  # Bytes read from the socket per iteration
+        self.timeout = timeout
+
+    def download(self, url, destination, sha256=None, step_text="Downloading...", start=0, end=100):
+        """
+        Downloads a URL to a destination file.
+
+        :param url: The URL to download.
+        :param destination: The final path of the downloaded file.
+        :param sha256: Optional expected SHA-256 hex digest of the file.
+        :param step_text: Step label shown while downloading.
+        :param start: Progress bar value at the start of the download.
+        :param end: Progress bar value when the download completes.
+        :return: The destination path.
+        :raises: RuntimeError if the checksum does not match.
+        """
+        with DiskSpaceChecker().active():
+            return self._download(url, destination, sha256, step_text, start, end)
+
+    def _download(self, url, destination, sha256, step_text, start, end):
+        try:
+            return self._download_once(url, destination, sha256, step_text, start, end)
+        except RemoteFileChanged as e:
+            print(f"{e} Restarting the download from the beginning.")
+            self._discard_partial(f"{destination}.part")
+            return self._download_once(url, destination, sha256, step_text, start, end)
+
+    def _download_once(self, url, destination, sha256, step_text, start, end):
+        part_path = f"{destination}.part"
+        ranges_path = f"{part_path}.ranges"
+        meta_path = f"{part_path}.meta"
+        os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+
+        # A single-stream .part file is resumed as a single stream
+        resumable_stream = os.path.exists(part_path) and not os.path.exists(ranges_path)
+        if self.workers > 1 and not resumable_stream:
+            headers = self._head(url)
+            total_size, accepts_ranges = self._size_and_ranges(headers)
+            if accepts_ranges and total_size and total_size > self.chunk_size:
+                resumed = self._download_parallel(
+                    url, part_path, ranges_path, total_size, self._validators(headers), step_text, start, end
+                )
+                return self._finalize(url, part_path, destination, sha256, resumed)
+            if os.path.exists(ranges_path):
+                # The server no longer supports ranges, so the partial file cannot be reused
+                self._discard_partial(part_path)
+
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        meta = self._load_meta(meta_path) if offset else None
+        if_range = self._if_range(meta) if meta else None
+        if offset and not if_range:
+            print(f"The partial download of {url} cannot be checked against the server. Restarting download.")
+            self._discard_partial(part_path)
+            offset = 0
+
+        request = urllib.request.Request(url)
+        if offset:
+            print(f"Resuming download of {url} at byte {offset}")
+            request.add_header("Range", f"bytes={offset}-")
+            request.add_header("If-Range", if_range)
+
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code != 416 or not offset:
+                raise
+            # 416 Range Not Satisfiable: the .part file may already hold the whole file, which is
+            # only trusted if its size is the one recorded when the download started and the
+            # server reports the same size
+            server_size = self._content_range_total(e.headers)
+            if meta.get("total_size") != offset or (server_size is not None and server_size != offset):
+                raise RemoteFileChanged(f"The partial download of {url} does not match the file on the server.")
+            response = None
+
+        if response is not None:
+            with response:
+                if offset and response.status != 206:
+                    # The file changed since the .part file was started, or the server ignored the Range header
+                    print("The file cannot be resumed. Restarting download.")
+                    offset = 0
+                total_size = self._total_size(response, offset)
+                if not offset:
+                    self._save_meta(meta_path, {**self._validators(response.headers), "total_size": total_size})
+                self._stream(response, part_path, offset, total_size, step_text, start, end)
+
+        return self._finalize(url, part_path, destination, sha256, resumed=offset > 0)
+
+    def probe(self, url):
+        """
+        Sends a HEAD request to learn the file size and whether byte ranges are supported.
+        :return: A tuple (total_size or None, accepts_ranges).
+        """
+        return self._size_and_ranges(self._head(url))
+
+    def _head(self, url):
+        """
+        Sends a HEAD request.
+        :return: The response headers, or None if the request failed.
+        """
+        try:
+            request = urllib.request.Request(url, method="HEAD")
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.headers
+        except Exception as e:
+            print(f"HEAD request for {url} failed, using a single stream: {e}")
+            return None
+
+    @staticmethod
+    def _size_and_ranges(headers):
+        if headers is None:
+            return None, False
+        content_length = headers.get("Content-Length")
+        total_size = int(content_length) if content_length and content_length.isdigit() else None
+        accepts_ranges = headers.get("Accept-Ranges", "").lower() == "bytes"
+        return total_size, accepts_ranges
+
+    @staticmethod
+    def _validators(headers):
+        """
+        Returns the headers that identify the version of a file on the server.
+        """
+        if headers is None:
+            return {"etag": None, "last_modified": None}
+        return {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+
+    @staticmethod
+    def _if_range(validators):
+        """
+        Returns the If-Range value for saved validators, or None if there is none to send.
+        """
+        etag = validators.get("etag")
+        if etag and not etag.startswith("W/"):  # Weak ETags cannot be used with If-Range
+            return etag
+        return validators.get("last_modified")
+
+    @staticmethod
+    def _load_meta(meta_path):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _save_meta(meta_path, meta):
+        temp_path = f"{meta_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(temp_path, meta_path)
+
+    @staticmethod
+    def _discard_partial(part_path):
+        """
+        Removes a .part file together with its range and validator sidecars.
+        """
+        for path in (part_path, f"{part_path}.ranges", f"{part_path}.meta"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _finalize(self, url, part_path, destination, sha256, resumed=False):
+        """
+        Verifies the checksum of a completed .part file and moves it into place.
+        :raises: RemoteFileChanged if a resumed download fails the checksum, so it is fetched again whole.
+        """
+        if sha256:
+            actual = self.file_sha256(part_path)
+            if actual.lower() != sha256.lower():
+                if resumed:
+                    raise RemoteFileChanged(f"Checksum mismatch for the resumed download of {url}.")
+                self._discard_partial(part_path)
+                raise RuntimeError(
+                    f"Checksum mismatch for {url}: expected {sha256}, got {actual}"
+                )
+
+        os.replace(part_path, destination)
+        if os.path.exists(f"{part_path}.meta"):
+            os.remove(f"{part_path}.meta")
+        print(f"Downloaded {url} to {destination}")
+        return destination
+
+    def _stream(self, response, part_path, offset, total_size, step_text, start, end):
+        """
+        Copies the response body to the .part file chunk by chunk, reporting progress.
+        """
+        downloaded = offset
+        started = time.monotonic()
+        with open(part_path, "ab" if offset else "wb") as out_file:
+            while True:
+                chunk = response.read(self.read_size)
+                if not chunk:
+                    break
+                out_file.write(chunk)
+                downloaded += len(chunk)
+                self._report(downloaded, offset, total_size, started, step_text, start, end)
+
+    def _download_parallel(self, url, part_path, ranges_path, total_size, validators, step_text, start, end):
+        """
+        Fetches the file as byte ranges on a thread pool.
+        Completed range indices are recorded in a sidecar file together with the file's
+        validators, so an interrupted parallel download resumes without refetching finished
+        ranges as long as the file on the server is unchanged.
+        :param validators: The ETag and Last-Modified of the file, from the HEAD request.
+        :return: True if ranges of an earlier attempt were reused.
+        """
+        if_range = self._if_range(validators)
+        ranges = [
+            (index, offset, min(offset + self.chunk_size, total_size) - 1)
+            for index, offset in enumerate(range(0, total_size, self.chunk_size))
+        ]
+
+        completed = set()
+        if os.path.exists(ranges_path) and os.path.exists(part_path):
+            try:
+                with open(ranges_path, "r", encoding="utf-8") as f:
+                    saved = json.load(f)
+                if (
+                    if_range
+                    and saved.get("total_size") == total_size
+                    and saved.get("chunk_size") == self.chunk_size
+                    and self._if_range(saved) == if_range
+                ):
+                    completed = set(saved.get("completed", []))
+            except (OSError, ValueError):
+                completed = set()
+
+        # Preallocate the full file so each worker can write its range in place
+        with open(part_path, "r+b" if completed else "wb") as f:
+            f.truncate(total_size)
+
+        lock = threading.Lock()
+        progress = {"downloaded": sum(end_byte - offset + 1 for index, offset, end_byte in ranges if index in completed)}
+        resumed_bytes = progress["downloaded"]
+        started = time.monotonic()
+        print(f"Downloading {url} with {self.workers} connections ({len(ranges) - len(completed)} ranges left)")
+
+        def save_completed():
+            temp_path = f"{ranges_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "total_size": total_size,
+                    "chunk_size": self.chunk_size,
+                    **validators,
+                    "completed": sorted(completed),
+                }, f)
+            os.replace(temp_path, ranges_path)
+
+        def fetch_range(index, offset, end_byte):
+            headers = {"Range": f"bytes={offset}-{end_byte}"}
+            if if_range:
+                headers["If-Range"] = if_range
+            request = urllib.request.Request(url, headers=headers)
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                if response.status == 200 and if_range:
+                    raise RemoteFileChanged(f"{url} changed on the server during the download.")
+                if response.status != 206:
+                    raise RuntimeError(f"Server ignored the Range request for bytes {offset}-{end_byte}")
+                with open(part_path, "r+b") as out_file:
+                    out_file.seek(offset)
+                    position = offset
+                    while position <= end_byte:
+                        chunk = response.read(min(self.read_size, end_byte - position + 1))
+                        if not chunk:
+                            break
+                        out_file.write(chunk)
+                        position += len(chunk)
+                        with lock:
+                            progress["downloaded"] += len(chunk)
+                            downloaded = progress["downloaded"]
+                        self._report(downloaded, resumed_bytes, total_size, started, step_text, start, end)
+                if position != end_byte + 1:
+                    raise RuntimeError(f"Incomplete range {offset}-{end_byte}: got {position - offset} bytes")
+            with lock:
+                completed.add(index)
+                save_completed()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(fetch_range, index, offset, end_byte)
+                for index, offset, end_byte in ranges
+                if index not in completed
+            ]
+            for future in futures:
+                future.result()  # Re-raise the first worker error
+
+        os.remove(ranges_path)
+        return bool(resumed_bytes)
+
+    @staticmethod
+    def _content_range_total(headers):
+        """
+        Returns the full size from a Content-Range header ("bytes 0-99/1000" or "bytes */1000"), or None.
+        """
+        content_range = headers.get("Content-Range") if headers is not None else None
+        if content_range and "/" in content_range:
+            total = content_range.rsplit("/", 1)[1]
+            if total.isdigit():
+                return int(total)
+        return None
+
+    @staticmethod
+    def _total_size(response, offset):
+        """
+        Returns the full size of the file being downloaded, or None if unknown.
+        """
+        total = Downloader._content_range_total(response.headers)
+        if total is not None:
+            return total
+        content_length = response.headers.get("Content-Length")
+        if content_length and content_length.isdigit():
+            return int(content_length) + (offset if response.status == 206 else 0)
+        return None
+
+    def _report(self, downloaded, offset, total_size, started, step_text, start, end):
+        """
+        Pushes a throttled progress update with bytes/sec and ETA.
+        """
+        if not self.status_updater:
+            return
+        elapsed = time.monotonic() - started
+        rate = (downloaded - offset) / elapsed if elapsed > 0 else 0
+        details = f"{self.format_size(downloaded)}"
+        progress = start
+        if total_size:
+            details += f" of {self.format_size(total_size)}"
+            progress = start + (end - start) * downloaded / total_size
+            if rate > 0:
+                details += f", {self.format_size(rate)}/s, about {int((total_size - downloaded) / rate)}s left"
+        elif rate > 0:
+            details += f", {self.format_size(rate)}/s"
+        self.status_updater.update_status(step_text, details, progress, throttle=True)
+
+    @staticmethod
+    def github_release_asset(repo, asset_name, timeout=10):
+        """
+        Looks up an asset of a GitHub repository's latest release.
+        The versioned download URL and the digest GitHub publishes for it come from the same
+        release, so the checksum always matches the file that is downloaded.
+        :param repo: The repository, e.g. "ollama/ollama".
+        :param asset_name: The file name of the asset, e.g. "OllamaSetup.exe".
+        :return: A tuple (download_url, sha256 or None), or (None, None) if the lookup failed.
+        """
+        url = f"https://api.github.com/repos/{repo}/releases/latest"
+        try:
+            # Always revalidated, so a new release is never paired with an old digest
+            release = AppConfig().http_cache.get_json(
+                url, 0, timeout, headers={"Accept": "application/vnd.github+json"}
+            )
+        except (OSError, ValueError) as e:
+            print(f"Could not look up the latest release of {repo}: {e}")
+            return None, None
+        for asset in release.get("assets", []):
+            if asset.get("name") == asset_name:
+                digest = asset.get("digest") or ""
+                sha256 = digest[len("sha256:"):] if digest.startswith("sha256:") else None
+                return asset.get("browser_download_url"), sha256
+        print(f"The latest release of {repo} has no asset {asset_name}.")
+        return None, None
+
+    @staticmethod
+    def file_sha256(path, chunk_size=1024 * 1024):
+        """
+        Computes the SHA-256 hex digest of a file.
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def format_size(num_bytes):
+        """
+        Formats a byte count as a human readable string (e.g. "12.3 MB").
+        """
+        for unit in ("B", "KB", "MB"):
+            if num_bytes < 1024:
+                return f"{num_bytes:.1f} {unit}"
+            num_bytes /= 1024
+        return f"{num_bytes:.1f} GB"
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from AppConfig import AppConfig
+
+
+class EnvironmentTemplate:
+    """
+    A base Conda environment that is solved and built once, then cloned into new prefixes.
+
+    Templates are keyed by a hash of their package spec, so a changed spec builds a new
+    template instead of reusing a stale one. Cloning with `conda create --clone` reuses the
+    already extracted packages (hardlinked where possible) and skips the solve, which takes
+    environment creation from minutes to seconds.
+    """
+
+    _build_lock = threading.Lock()  # Two installers must not build the same template at once
+
+    def __init__(self, packages):
+        """
+        :param packages: The package spec of the template, e.g. ["python=3.11"].
+        """
+        self.config = AppConfig()
+        self.packages = list(packages)
+        self.templates_dir = os.path.join(self.config.base_path, "templates")
+        self.key = self.spec_hash(self.packages)
+        self.path = os.path.join(self.templates_dir, self.key)
+        # Kept outside the prefix so it is not copied into clones
+        self.ready_marker = os.path.join(self.templates_dir, f"{self.key}.ready")
+
+    @staticmethod
+    def spec_hash(packages):
+        """
+        Returns a short hash identifying a package spec on this platform.
+        """
+        spec = json.dumps({"packages": sorted(packages), "platform": sys.platform})
+        return hashlib.sha256(spec.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def is_ready(self):
+        return os.path.exists(self.ready_marker) and os.path.isdir(self.path)
+
+    def ensure(self, installer, step_text):
+        """
+        Builds the template if it does not exist yet.
+        :param installer: The BaseInstaller used to run conda.
+        :param step_text: Step label shown while the template is built.
+        """
+        with self._build_lock:
+            if self.is_ready:
+                return
+            if os.path.exists(self.path):
+                # Left over from an interrupted build
+                shutil.rmtree(self.path, ignore_errors=True)
+            print(f"Building environment template {self.key} for {self.packages}...")
+            installer.run_with_progress(
+                installer.env_backend.create_cmd(self.path, self.packages),
+                step_text,
+            )
+            print(f"Environment template {self.key} built in {installer.last_result.wall_time:.1f}s")
+            with open(self.ready_marker, "w", encoding="utf-8") as f:
+                json.dump({"packages": self.packages, "created": time.time()}, f)
+
+    def clone_to(self, installer, env_path, extra_packages=None, step_text="Creating Environment..."):
+        """
+        Creates a new environment at env_path from the template.
+        :param installer: The BaseInstaller used to run conda.
+        :param env_path: The prefix of the new environment.
+        :param extra_packages: Packages installed on top of the template (e.g. ["git"]).
+        :param step_text: Step label shown while the environment is created.
+        """
+        self.ensure(installer, step_text)
+
+        print(f"Cloning environment template {self.key} to {env_path}...")
+        installer.run_with_progress(
+            installer.env_backend.clone_cmd(self.path, env_path),
+            step_text,
+            end=50 if extra_packages else 100,
+        )
+        print(f"Cloned environment template {self.key} in {installer.last_result.wall_time:.1f}s")
+
+        if extra_packages:
+            installer.run_with_progress(
+                installer.env_backend.install_cmd(env_path, extra_packages),
+                step_text,
+                start=50,
+            )
@@ -0,0 +1,136 @@
+import hashlib
+import os
+import time
+from collections import defaultdict
+
+
+class DedupReport:
+    """
+    The outcome of one deduplication pass.
+    """
+
+    def __init__(self):
+        self.files_scanned = 0
+        self.files_hashed = 0
+        self.files_linked = 0
+        self.bytes_reclaimed = 0
+        self.files_skipped = 0  # Duplicates that could not be replaced, e.g. because they were in use
+        self.wall_time = 0.0
+
+    def __str__(self):
+        return (
+            f"Deduplicated {self.files_linked} files, reclaimed {self.bytes_reclaimed / 1024 ** 2:.1f} MB "
+            f"({self.files_scanned} scanned, {self.files_hashed} hashed, {self.files_skipped} skipped, "
+            f"{self.wall_time:.1f}s)"
+        )
+
+
+class FileDeduplicator:
+    """
+    Replaces identical package files in several directory trees with hardlinks to one copy.
+
+    The Open WebUI and Pipelines environments share much of their dependency tree, so the
+    duplicates are mostly the pip-installed files of the two environments; conda already
+    hardlinks its own packages from the pkgs cache. Only package code that is never written in
+    place after install (DEDUP_EXTENSIONS) is considered; data, configuration and databases
+    are left alone. Files are grouped by size and existing hardlinks are collapsed first, so
+    only candidates that could actually be linked are hashed, and a repeated pass over trees
+    that were already deduplicated hashes almost nothing.
+    """
+
+    DEDUP_EXTENSIONS = (".py", ".pyc", ".pyd", ".pyi", ".dll", ".so", ".lib", ".h")
+    SKIP_DIRS = ("conda-meta",)  # conda rewrites its metadata in place
+    MIN_SIZE = 4096  # Smaller files save too little to be worth a link
+    HASH_BLOCK = 1024 * 1024
+
+    def __init__(self, roots, min_size=None):
+        """
+        :param roots: Directories to deduplicate across. Earlier roots provide the copy that is kept.
+        :param min_size: Smallest file size in bytes to consider. Defaults to MIN_SIZE.
+        """
+        self.roots = [root for root in roots if os.path.isdir(root)]
+        self.min_size = self.MIN_SIZE if min_size is None else min_size
+
+    def _scan(self, report):
+        """
+        Returns {(device, size): {inode: [(path, link_count), ...]}} for every candidate file.
+        """
+        candidates = defaultdict(lambda: defaultdict(list))
+        for root in self.roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [d for d in dirnames if d not in self.SKIP_DIRS]
+                for filename in filenames:
+                    if not filename.endswith(self.DEDUP_EXTENSIONS):
+                        continue
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        stat = os.lstat(path)
+                    except OSError:
+                        continue
+                    report.files_scanned += 1
+                    if stat.st_size < self.min_size:
+                        continue
+                    candidates[(stat.st_dev, stat.st_size)][stat.st_ino].append((path, stat.st_nlink))
+        return candidates
+
+    def _hash(self, path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(self.HASH_BLOCK), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _link(self, source, path):
+        """
+        Atomically replaces path with a hardlink to source.
+        """
+        temp_path = f"{path}.dedup-tmp"
+        os.link(source, temp_path)
+        try:
+            os.replace(temp_path, path)
+        except OSError:
+            os.remove(temp_path)
+            raise
+
+    def run(self):
+        """
+        Runs one deduplication pass.
+        :return: A DedupReport.
+        """
+        report = DedupReport()
+        start_time = time.monotonic()
+        for (_, size), inodes in self._scan(report).items():
+            if len(inodes) < 2:
+                continue  # One file, or copies that are already hardlinked to each other
+
+            # Hash one path per inode; the first inode seen for a digest is the copy that is kept
+            kept = {}
+            for links in inodes.values():
+                kept_path, _ = links[0]
+                try:
+                    digest = self._hash(kept_path)
+                except OSError:
+                    continue
+                report.files_hashed += 1
+                if digest not in kept:
+                    kept[digest] = kept_path
+                    continue
+
+                source = kept[digest]
+                remaining_links = links[0][1]
+                for path, _ in links:
+                    try:
+                        self._link(source, path)
+                    except OSError as e:
+                        print(f"Could not deduplicate {path}: {e}")
+                        report.files_skipped += 1
+                        continue
+                    report.files_linked += 1
+                    remaining_links -= 1
+                # Space is only freed once the last link to the old copy is gone
+                if remaining_links == 0:
+                    report.bytes_reclaimed += size
+
+        report.wall_time = time.monotonic() - start_time
+        print(report)
+        return report
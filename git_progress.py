@@ -0,0 +1,76 @@
+import re
+
+
+class GitProgressStream:
+    """
+    A file-like errstream for dulwich that turns pack transfer progress into StatusUpdater updates.
+
+    dulwich writes the server's sideband progress ("Counting objects:  45% (90/200)",
+    "Compressing objects: ...") as raw bytes, with lines ending in "\\r" while a phase is
+    running. Each phase is mapped onto a share of the step's progress range.
+    """
+
+    # Fraction of the step reached at the start and end of each phase
+    PHASES = [
+        ("Enumerating objects", 0.00, 0.05),
+        ("Counting objects", 0.05, 0.25),
+        ("Compressing objects", 0.25, 0.50),
+        ("Receiving objects", 0.50, 0.90),
+        ("Resolving deltas", 0.90, 1.00),
+    ]
+
+    PROGRESS_RE = re.compile(r"(?:remote:\s*)?([A-Za-z ]+):\s+(\d+)%")
+    TOTAL_RE = re.compile(r"(?:remote:\s*)?Total (\d+)")
+
+    def __init__(self, status_updater, step_text, start=0, end=100):
+        """
+        :param status_updater: The StatusUpdater to push progress to. May be None.
+        :param step_text: Step label shown while the transfer runs.
+        :param start: Progress bar value at the start of the transfer.
+        :param end: Progress bar value when the transfer completes.
+        """
+        self.status_updater = status_updater
+        self.step_text = step_text
+        self.start = start
+        self.end = end
+        self.fraction = 0.0
+        self._buffer = ""
+
+    def write(self, data):
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", errors="replace")
+        self._buffer += data
+        # Progress lines are terminated by "\r" while running and "\n" when a phase is done
+        *lines, self._buffer = re.split(r"[\r\n]", self._buffer)
+        for line in lines:
+            self._handle_line(line.strip())
+
+    def flush(self):
+        if self._buffer:
+            self._handle_line(self._buffer.strip())
+            self._buffer = ""
+
+    def _handle_line(self, line):
+        if not line:
+            return
+        match = self.PROGRESS_RE.search(line)
+        if match:
+            phase, percent = match.group(1).strip(), int(match.group(2))
+            for name, phase_start, phase_end in self.PHASES:
+                if phase == name:
+                    self._advance(phase_start + (phase_end - phase_start) * percent / 100, line, throttle=percent < 100)
+                    return
+        if self.TOTAL_RE.search(line):
+            # The server is done; the pack itself is being received now
+            self._advance(0.50, "Receiving objects...", throttle=False)
+
+    def _advance(self, fraction, details, throttle):
+        # Progress never moves backwards, even if the server repeats a phase
+        self.fraction = max(self.fraction, min(fraction, 1.0))
+        if self.status_updater:
+            self.status_updater.update_status(
+                self.step_text,
+                details,
+                self.start + (self.end - self.start) * self.fraction,
+                throttle=throttle,
+            )
@@ -0,0 +1,89 @@
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+
+class HttpJsonCache:
+    """
+    Persistent cache for small JSON API responses such as PyPI and GitHub release metadata.
+
+    A response younger than the TTL is returned without touching the network. Older
+    responses are revalidated with If-None-Match, so an unchanged resource costs a
+    304 round trip instead of a full download. If the network fails or the server answers
+    with an error such as 429 or 503, the last known response is returned rather than nothing.
+    """
+
+    def __init__(self, cache_file):
+        """
+        :param cache_file: Path to the JSON file that stores cached responses.
+        """
+        self.cache_file = cache_file
+        self.lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            temp_file = f"{self.cache_file}.tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(temp_file, self.cache_file)
+        except OSError as e:
+            print(f"Failed to write HTTP cache {self.cache_file}: {e}")
+
+    def get_json(self, url, ttl, timeout=10, headers=None):
+        """
+        Returns the decoded JSON body of a URL.
+
+        :param url: The URL to fetch.
+        :param ttl: Seconds a cached response is used without revalidation. Use 0 to always revalidate.
+        :param timeout: Socket timeout for the request in seconds.
+        :param headers: Optional extra request headers.
+        :return: The decoded JSON body.
+        :raises: urllib.error.URLError or ValueError if nothing is cached and the request fails.
+        """
+        with self.lock:
+            entry = self._load().get(url)
+        if entry and time.time() - entry["fetched_at"] < ttl:
+            print(f"HTTP cache hit: {url}")
+            return entry["body"]
+
+        request = urllib.request.Request(url, headers=dict(headers or {}))
+        if entry and entry.get("etag"):
+            request.add_header("If-None-Match", entry["etag"])
+
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                body = json.loads(response.read().decode("utf-8"))
+                etag = response.headers.get("ETag")
+        except urllib.error.HTTPError as e:
+            if not entry:
+                raise
+            if e.code != 304:
+                # Rate limits and server errors are network failures too
+                print(f"Request for {url} failed ({e}). Using the cached response.")
+                return entry["body"]
+            print(f"HTTP cache revalidated: {url}")
+            body, etag = entry["body"], entry.get("etag")
+        except (OSError, ValueError) as e:
+            if not entry:
+                raise
+            print(f"Request for {url} failed ({e}). Using the cached response.")
+            return entry["body"]
+
+        with self.lock:
+            self._load()[url] = {"etag": etag, "body": body, "fetched_at": time.time()}
+            self._save()
+        return body
@@ -1,8 +1,12 @@
 import os
+import re
+import shutil
 import threading
-import urllib.request
 import subprocess
+import urllib.request
 from base_installer import BaseInstaller
+from disk_budget import DiskBudget
+from downloader import Downloader
 
 class MinicondaInstaller(BaseInstaller):
     def __init__(self, status_updater=None):
@@ -10,15 +14,58 @@ class MinicondaInstaller(BaseInstaller):
         self.miniconda_path = self.config.miniconda_path
         self.installer_path = os.path.join(self.config.base_path, "MinicondaInstaller.exe")
         self.miniconda_url = "https://repo.anaconda.com/miniconda/Miniconda3-latest-Windows-x86_64.exe"
+        self.miniconda_index_url = "https://repo.anaconda.com/miniconda/"
+        self.miniconda_sha256 = None  # The "latest" installer changes, so its checksum is looked up from the published hashes
         self.conda_exe = self.config.conda_exe
         self.base_path = self.config.base_path
 
+    def get_published_sha256(self, timeout=10):
+        """
+        Looks up the SHA-256 that Anaconda publishes for the installer on the Miniconda download index.
+        :return: The hex digest, or None if it could not be found.
+        """
+        if self.miniconda_sha256:
+            return self.miniconda_sha256
+        filename = self.miniconda_url.rsplit("/", 1)[1]
+        try:
+            with urllib.request.urlopen(self.miniconda_index_url, timeout=timeout) as response:
+                index = response.read().decode("utf-8", errors="replace")
+        except OSError as e:
+            print(f"Could not fetch the published Miniconda checksums: {e}")
+            return None
+        # Each installer is a table row: file link, size, date, then the SHA-256
+        match = re.search(
+            rf'href="{re.escape(filename)}"(?:(?!</tr>).)*?<td>\s*([0-9a-f]{{64}})\s*</td>',
+            index,
+            re.DOTALL,
+        )
+        if not match:
+            print(f"No published checksum found for {filename}.")
+            return None
+        return match.group(1)
+
     def check_installed(self):
         """
         Check if Miniconda is installed by verifying the presence of conda.exe.
         """
         return os.path.exists(self.conda_exe)
 
+    def plan_disk_budget(self, budget):
+        """
+        Adds the Miniconda install to a DiskBudget, estimated from the installer's size.
+        """
+        def estimate():
+            if self.check_installed():
+                return 0
+            bundle = self.config.offline_bundle
+            if bundle:
+                if not os.path.exists(bundle.miniconda_installer):
+                    return None
+                return int(os.path.getsize(bundle.miniconda_installer) * DiskBudget.INSTALLER_EXPANSION)
+            return DiskBudget.estimate_download(self.miniconda_url, DiskBudget.INSTALLER_EXPANSION)
+
+        budget.add_step("miniconda", 600 * 1024 ** 2, estimate, "Miniconda Install")
+
     def install(self):
         """
         Install Miniconda by downloading and running the installer sequentially.
@@ -74,13 +121,29 @@ class MinicondaInstaller(BaseInstaller):
         """
         Download the Miniconda installer.
         """
-        if not os.path.exists(self.installer_path):
+        bundle = self.config.offline_bundle
+        if not os.path.exists(self.installer_path) and bundle and os.path.exists(bundle.miniconda_installer):
+            shutil.copy2(bundle.miniconda_installer, self.installer_path)
+            self.config.status_updater.update_status(
+                    "Step: [1/3] Installer Found.",
+                    "Using the Miniconda installer from the offline bundle.",
+                    30,
+                )
+        elif not os.path.exists(self.installer_path):
             self.config.status_updater.update_status(
                     "Step: [1/3] Downloading Miniconda...",
                     "Downloading the Miniconda installer. This may take a few minutes.",
                     10,
                 )
-            urllib.request.urlretrieve(self.miniconda_url, self.installer_path)
+            self.config.artifact_cache.fetch(
+                self.miniconda_url,
+                self.installer_path,
+                Downloader(self.config.status_updater),
+                sha256=self.get_published_sha256(),
+                step_text="Step: [1/3] Downloading Miniconda...",
+                start=10,
+                end=30,
+            )
             self.config.status_updater.update_status(
                     "Step: [1/3] Download Complete.",
                     "Miniconda installer downloaded successfully.",
@@ -114,23 +177,8 @@ class MinicondaInstaller(BaseInstaller):
 
         env_path = os.path.join(self.config.base_path, env_name)
 
-        # Base command to create the environment
-        create_cmd = [
-            self.conda_exe,
-            "create",
-            "--prefix", env_path,
-            "python=3.11"
-        ]
-
-        # Add additional packages to the command if provided
-        if packages:
-            create_cmd.extend(packages)
-
-        # Add the '-y' flag to confirm environment creation
-        create_cmd.append("-y")
-
         try:
-            self.run_command(create_cmd)
+            self.create_environment(env_name, env_path, packages, f"Creating Environment {env_name}...")
             print(f"Environment {env_name} set up successfully.")
         except subprocess.CalledProcessError as e:
             print(f"Failed to create environment {env_name}: {e}")
@@ -138,6 +186,18 @@ class MinicondaInstaller(BaseInstaller):
 
 
 
+    def export_bundle(self, bundle):
+        """
+        Adds the Miniconda installer to an offline bundle, downloading it if needed.
+        :param bundle: The OfflineBundle being exported.
+        """
+        if not os.path.exists(self.installer_path):
+            self.config.artifact_cache.fetch(
+                self.miniconda_url, self.installer_path, Downloader(), sha256=self.get_published_sha256()
+            )
+        os.makedirs(bundle.bundle_dir, exist_ok=True)
+        shutil.copy2(self.installer_path, bundle.miniconda_installer)
+
     def update(self):
         """
         Update Conda to the latest version.
@@ -151,58 +211,3 @@ class MinicondaInstaller(BaseInstaller):
         except subprocess.CalledProcessError as e:
             print(f"Failed to update Conda: {e}")
             raise
-
-
-
-    def run_command(self, cmd_list, cwd=None, capture_output=True):
-        """
-        Runs a command and logs output in real-time. Prevents console windows from appearing.
-        
-        :param cmd_list: List of command and arguments to run.
-        :param cwd: Directory to execute the command in.
-        :param capture_output: Whether to capture and return stdout and stderr.
-        :return: The process's stdout and stderr as a tuple (stdout, stderr).
-        :raises: subprocess.CalledProcessError if the command fails.
-        """
-        try:
-            command_str = ' '.join(cmd_list)
-            print(f"Running command: {command_str}")
-
-            # Windows-specific flag to suppress console window
-            CREATE_NO_WINDOW = 0x08000000
-
-            # Configure STARTUPINFO to hide the console window
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-            process = subprocess.Popen(
-                cmd_list,
-                stdout=subprocess.PIPE if capture_output else None,
-                stderr=subprocess.PIPE if capture_output else None,
-                text=True,
-                creationflags=CREATE_NO_WINDOW,
-                startupinfo=startupinfo,
-                cwd=cwd,
-                env=os.environ.copy()  # Ensure environment variables are inherited
-            )
-
-            stdout, stderr = process.communicate()
-
-            # Log output if capture_output is True
-            if stdout:
-                print(stdout)
-            if stderr:
-                print(stderr)
-
-            # Check for errors and raise if process failed
-            if process.returncode != 0:
-                raise subprocess.CalledProcessError(process.returncode, cmd_list, output=stdout, stderr=stderr)
-
-            return stdout, stderr
-        except subprocess.CalledProcessError as e:
-            print(f"Command failed: {' '.join(e.cmd)}, Return Code: {e.returncode}")
-            print(f"Error Output: {e.stderr}")
-            raise
-        except Exception as e:
-            print(f"Unexpected error while running command: {e}")
-            raise
@@ -2,13 +2,21 @@ import subprocess
 import os
 import threading
 from base_installer import BaseInstaller
+from dist_metadata import DistInfoReader
+from disk_budget import DiskBudget
+from lockfile import LockFile
+from ProcessSupervisor import ProcessSupervisor
+from version_policy import VersionPolicy
 
 
 class OpenWebUIInstaller(BaseInstaller):
+    PYPI_URL = "https://pypi.org/pypi/open-webui/json"
+
     def __init__(self, status_updater=None):
         super().__init__("Open WebUI", status_updater)
         self.env_path = os.path.join(self.config.base_path, "env")
         self.conda_exe = self.config.conda_exe
+        self.lock = LockFile("env")
 
 
     def check_installed(self):
@@ -22,17 +30,11 @@ class OpenWebUIInstaller(BaseInstaller):
             print("Conda environment for Open WebUI is not set up.")
             return False
 
-        # Check if open-webui is installed using pip show
-        pip_show_cmd = [
-            self.conda_exe,
-            "run",
-            "--prefix", self.env_path,
-            "pip", "show", "open-webui"
-        ]
         try:
-            self.run_command(pip_show_cmd)
-            print("Open WebUI is installed.")
-            return True
+            if self.get_installed_version():
+                print("Open WebUI is installed.")
+                return True
+            print("Open WebUI is not installed.")
         except subprocess.CalledProcessError:
             print("Open WebUI is not installed.")
         except FileNotFoundError:
@@ -40,6 +42,40 @@ class OpenWebUIInstaller(BaseInstaller):
 
         return False
 
+    def get_installed_version(self):
+        """
+        Get the installed version of open-webui.
+        Reads the package metadata from the environment's site-packages, and only falls back
+        to `pip show` through conda when that metadata is missing or ambiguous.
+        :return: The installed version string, or None if open-webui is not installed.
+        :raises: subprocess.CalledProcessError if the pip show fallback fails.
+        """
+        if not os.path.exists(self.env_path):
+            return None
+
+        return self.config.state_cache.get_or_compute(
+            "open-webui-version",
+            self.config.env_state_paths(self.env_path),
+            self._read_installed_version,
+        )
+
+    def _read_installed_version(self):
+        """
+        Reads the installed open-webui version without consulting the state cache.
+        """
+        try:
+            return DistInfoReader(self.env_path).get_version("open-webui")
+        except LookupError as e:
+            print(f"{e}. Falling back to pip show.")
+
+        stdout, _ = self.run_command(
+            [self.conda_exe, "run", "--prefix", self.env_path, "pip", "show", "open-webui"]
+        )
+        for line in stdout.splitlines():
+            if line.startswith("Version:"):
+                return line.split("Version:")[1].strip()
+        return None
+
     def install(self):
         """
         Install Open WebUI into the Conda environment.
@@ -55,20 +91,80 @@ class OpenWebUIInstaller(BaseInstaller):
             self.setup_environment("env")
 
         print("Installing Open WebUI...")
-    
-        # Use run_command for consistent subprocess behavior
-        self.run_command([
-            self.conda_exe,
-            "run",
-            "--prefix", self.env_path,
-            "pip",
-            "install",
-            "open-webui"
-        ])
-        
+        step_text = "Step: [1/2] Open WebUI Install, this could easily take 10-20 minutes depending on your computer."
+
+        bundle = self.config.offline_bundle
+        if not bundle and self.install_from_lock(self.lock, self.env_path, step_text, expected_packages=150):
+            self.cache_wheels(self.env_path, self.lock.install_args())
+            self.deduplicate_files()
+            print("Open WebUI installation complete.")
+            return
+
+        # Stream the installer's output so the progress bar follows the install
+        self.install_packages(
+            self.env_path,
+            self._install_args(),
+            step_text,
+            start=0,
+            end=100,
+            expected_packages=150,
+        )
+        self.write_lock(self.lock, self.env_path)
+        self.cache_wheels(self.env_path, self._install_args())
+        self.deduplicate_files()
+
         print("Open WebUI installation complete.")
 
 
+    def _install_args(self):
+        """
+        Returns the package backend arguments that resolve and install Open WebUI.
+        """
+        bundle = self.config.offline_bundle
+        if not bundle:
+            return ["open-webui"]
+        # Install the bundled version from the wheelhouse only
+        version = bundle.manifest.get("open_webui_version")
+        return [
+            "--no-index",
+            "--find-links", bundle.wheelhouse_dir,
+            f"open-webui=={version}" if version else "open-webui",
+        ]
+
+    def plan_disk_budget(self, budget):
+        """
+        Adds the environment setup and the Open WebUI install to a DiskBudget.
+        The install can only be resolved once the environment exists, so until then its fallback is used.
+        """
+        def estimate_install():
+            args = self._install_args()
+            if not self.config.offline_bundle and self.lock.is_current():
+                args = self.lock.install_args()
+            return DiskBudget.estimate_pip_install(self, self.env_path, args)
+
+        budget.add_step(
+            "environment",
+            300 * 1024 ** 2,
+            lambda: DiskBudget.estimate_environment(self, self.env_path, ["python=3.11"]),
+            "Open WebUI Environment Setup",
+        )
+        budget.add_step("open-webui", 3 * 1024 ** 3, estimate_install, "Open WebUI Install")
+
+    def start_server(self):
+        """
+        Starts `open-webui serve` under the ProcessSupervisor, which restarts it if it crashes or hangs.
+        :return: The PID of the started process.
+        """
+        supervisor = ProcessSupervisor()
+        supervisor.register(
+            "open-webui",
+            # Without --no-capture-output conda holds the server's output until it exits, so nothing reaches the log
+            [self.conda_exe, "run", "--no-capture-output", "--prefix", self.env_path, "open-webui", "serve"],
+            pid_file=os.path.join(self.config.base_path, "open_webui.pid"),
+            start_timeout=self.config.openwebui_start_timeout,
+        )
+        return supervisor.start("open-webui")
+
     def check_requirements(self):
         """
         Ensure Conda is installed.
@@ -90,15 +186,7 @@ class OpenWebUIInstaller(BaseInstaller):
         if not os.path.exists(self.env_path):
             print(f"Setting up environment {env_name}...")
             
-            # Use run_command for consistency
-            self.run_command([
-                self.conda_exe,
-                "create",
-                "--prefix",
-                self.env_path,
-                "python=3.11",
-                "-y"
-            ])
+            self.create_environment(env_name, self.env_path, step_text="Step: [1/2] Setting Up Environment...")
             
             print(f"Environment {env_name} set up successfully.")
         
@@ -109,62 +197,73 @@ class OpenWebUIInstaller(BaseInstaller):
         )
 
 
+    def export_bundle(self, bundle):
+        """
+        Adds the Open WebUI environment's conda package set and a wheelhouse for the
+        installed open-webui version to an offline bundle.
+        :param bundle: The OfflineBundle being exported.
+        """
+        version = self.get_installed_version()
+        if not version:
+            raise RuntimeError("Open WebUI is not installed. Nothing to export.")
+
+        self.export_conda_package_set(bundle, "env", self.env_path)
+        self.run_with_progress(
+            [
+                self.find_env_python(self.env_path),
+                "-m", "pip",
+                "download",
+                f"open-webui=={version}",
+                "--dest", bundle.wheelhouse_dir,
+            ],
+            "Exporting Open WebUI wheelhouse...",
+            expected_packages=150,
+        )
+        bundle.update_manifest(open_webui_version=version)
+
     def update(self):
         """
         Update Open WebUI to the latest version.
         """
         try:
-            # Update Open WebUI using pip via conda run
-            pip_update_cmd = [
-                self.conda_exe,
-                "run",
-                "--prefix", self.env_path,
-                "pip", "install", "--upgrade", "open-webui"
-            ]
-            self.run_command(pip_update_cmd)
-            print("Open WebUI updated successfully.")
+            installed_version = self.get_installed_version()
+            target = self.get_update_target(installed_version)
+            if target is None:
+                print(f"Open WebUI {installed_version} is the newest allowed version. Nothing to update.")
+                return
+            print(f"Updating Open WebUI from {installed_version} to {target}...")
+
+            # Only the packages whose versions change are reinstalled
+            if self.update_packages(self.env_path, [f"open-webui=={target.version}"], "Updating Open WebUI...", expected_packages=150):
+                self.write_lock(self.lock, self.env_path)
+                print("Open WebUI updated successfully.")
+            else:
+                print("Open WebUI is already up to date.")
         except Exception as e:
             print(f"Error updating Open WebUI: {e}")
 
 
-    def run_command(self, cmd_list):
+    def relock(self):
         """
-        Runs a command and logs output in real-time.
+        Regenerate the lockfile from the currently installed packages.
+        :return: True if the lockfile was written.
         """
-        try:
-            command_str = ' '.join(cmd_list)
-            print(f"Running command: {command_str}")
-
-            # Prevent console window from popping up on Windows
-            CREATE_NO_WINDOW = 0x08000000
-
-            # Start the process
-            process = subprocess.Popen(
-                cmd_list,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                creationflags=CREATE_NO_WINDOW,
-                encoding="utf-8"
-            )
-
-            # Capture the output
-            stdout, stderr = process.communicate()
-
-            # Raise an error if the process fails
-            if process.returncode != 0:
-                raise subprocess.CalledProcessError(process.returncode, cmd_list, output=stdout, stderr=stderr)
-
-            return stdout, stderr  # Ensure (stdout, stderr) is always returned
-
-        except subprocess.CalledProcessError as e:
-            print(f"Command failed with return code {e.returncode}")
-            print(f"Error output: {e.stderr}")
-            raise
-        except Exception as e:
-            print(f"Unexpected error while running command: {e}")
-            raise
+        if not self.check_installed():
+            print("Open WebUI is not installed. Nothing to lock.")
+            return False
+        return self.write_lock(self.lock, self.env_path)
 
+    def get_update_target(self, installed_version, timeout=10):
+        """
+        Get the open-webui release to update to, following the configured channel and maximum version.
+        PyPI's response is cached on disk and revalidated with its ETag once AppConfig.update_check_ttl expires.
+        :param installed_version: The installed version string.
+        :param timeout: Request timeout in seconds.
+        :return: An UpdateTarget, or None if no allowed release is newer than the installed one.
+        """
+        data = self.config.http_cache.get_json(self.PYPI_URL, self.config.update_check_ttl, timeout)
+        policy = VersionPolicy(self.config.openwebui_update_channel, self.config.openwebui_max_version)
+        return policy.select_target(installed_version, data.get("releases", {}))
 
     def check_update(self, callback=None):
         """
@@ -176,32 +275,18 @@ class OpenWebUIInstaller(BaseInstaller):
             print("Checking for updates...")
             update_available = False
             try:
-                # Check if open-webui is installed using pip show
-                stdout, _ = self.run_command(
-                    [self.conda_exe, "run", "--prefix", self.env_path, "pip", "show", "open-webui"]
-                )
-
-                # Parse the installed version of open-webui
-                installed_version = None
-                for line in stdout.splitlines():
-                    if line.startswith("Version:"):
-                        installed_version = line.split("Version:")[1].strip()
-                        break
+                installed_version = self.get_installed_version()
 
                 if installed_version:
                     print(f"Installed open-webui version: {installed_version}")
 
                     # Fetch the latest version from PyPI
-                    import urllib.request
-                    import json
                     try:
-                        with urllib.request.urlopen("https://pypi.org/pypi/open-webui/json") as response:
-                            data = json.loads(response.read().decode())
-                            latest_version = data["info"]["version"]
-                            print(f"Latest open-webui version: {latest_version}")
+                        target = self.get_update_target(installed_version)
 
-                        # Compare installed and latest versions
-                        if installed_version != latest_version:
+                        # Only newer releases allowed by the update policy count
+                        if target is not None:
+                            print(f"Update target for open-webui: {target}")
                             print("An update is available for open-webui.")
                             update_available = True
                         else:
@@ -1,15 +1,29 @@
 import os
+import re
+import shutil
 import subprocess
+import threading
 from dulwich import porcelain
 from base_installer import BaseInstaller
+from disk_budget import DiskBudget
+from downloader import Downloader
+from git_progress import GitProgressStream
+from lockfile import LockFile
+from ProcessSupervisor import ProcessSupervisor
 
 class PipelinesInstaller(BaseInstaller):
+    REQUIREMENTS_STATE_KEY = "pipelines-requirements-sha256"
+    REMOTE_HEAD_TTL = 15 * 60  # Seconds a probed remote HEAD is trusted
+    MAX_DEEPEN_DEPTH = 4096  # Give up deepening a shallow clone past this many commits
+    COMMIT_SHA_RE = re.compile(r"^[0-9a-f]{40}$")
+
     def __init__(self, status_updater=None):
         super().__init__("Pipelines", status_updater)
         self.env_pipelines_path = os.path.join(self.config.base_path, "env_pipelines")
         self.pipelines_repo_path = os.path.join(self.config.base_path, "pipelines")
         self.pipelines_repo_url = "https://github.com/open-webui/pipelines.git"
         self.conda_exe = self.config.conda_exe        
+        self.lock = LockFile("env_pipelines")
 
     def check_installed(self):
         """
@@ -17,9 +31,29 @@ class PipelinesInstaller(BaseInstaller):
         """
         return os.path.exists(self.env_pipelines_path) and os.path.exists(self.pipelines_repo_path)
 
+    def get_local_head(self):
+        """
+        Get the commit the local pipelines repository is checked out at.
+        The result is cached until the repository's HEAD or refs change.
+        :return: The HEAD commit SHA as a string, or None if the repository is not cloned.
+        """
+        if not os.path.exists(self.pipelines_repo_path):
+            return None
+
+        def read_head():
+            with porcelain.open_repo_closing(self.pipelines_repo_path) as repo:
+                return repo.head().decode("utf-8")
+
+        return self.config.state_cache.get_or_compute(
+            "pipelines-head",
+            self.config.pipelines_state_paths,
+            read_head,
+        )
+
     def start_pipelines(self):
         """
-        Starts the pipelines process and writes the PID to a file.
+        Starts the pipelines server under the ProcessSupervisor, which writes the PID file
+        and restarts the server if it crashes or hangs.
         """
         try:
             # Path to python in the pipelines environment
@@ -33,50 +67,47 @@ class PipelinesInstaller(BaseInstaller):
                 "--forwarded-allow-ips", "0.0.0.0"
             ]
 
-            # Working directory for the pipelines repository
-            cwd = self.config.pipelines_repo_path
-
-            # Windows-specific flag to suppress console window
-            CREATE_NO_WINDOW = 0x08000000
-
-            # Start the process
-            process = subprocess.Popen(
+            supervisor = ProcessSupervisor()
+            supervisor.register(
+                "pipelines",
                 pipeline_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                creationflags=CREATE_NO_WINDOW,
-                cwd=cwd,
-                env=os.environ.copy()  # Inherit environment variables
+                cwd=self.config.pipelines_repo_path,  # Working directory for the pipelines repository
+                pid_file=os.path.join(self.config.base_path, "pipelines.pid"),
             )
+            pid = supervisor.start("pipelines")
 
-            # Write the PID to a file
-            pid_file = os.path.join(self.config.base_path, "pipelines.pid")
-            with open(pid_file, "w") as f:
-                f.write(str(process.pid))
+            print(f"Pipelines process started with PID {pid}.")
 
-            print(f"Pipelines process started with PID {process.pid}.")
-
-            return process.pid  # Return the PID for further use if needed
+            return pid  # Return the PID for further use if needed
 
         except Exception as e:
             print(f"Failed to start pipelines process: {e}")
             raise
 
+    def get_remote_head(self, max_age=None):
+        """
+        Get the commit the remote HEAD (or AppConfig.pipelines_ref) points at.
+        Only the ref advertisement is fetched, no packs, and the answer is cached for max_age seconds.
+        :param max_age: Cache lifetime in seconds; defaults to REMOTE_HEAD_TTL. Use 0 to force a fresh probe.
+        :return: The commit SHA as a string.
+        """
+        ref = self.config.pipelines_ref
 
+        def probe():
+            refs = porcelain.ls_remote(self.pipelines_repo_url)
+            return self._resolve_remote_ref(refs, ref).decode("ascii")
 
-    def find_python_executable(self):
-        """Attempt to find the python executable in the conda environment."""
-        possible_locations = [
-            os.path.join(self.env_pipelines_path, "python.exe"),
-            os.path.join(self.env_pipelines_path, "python3.exe"),
-            os.path.join(self.env_pipelines_path, "Scripts", "python.exe"),
-            os.path.join(self.env_pipelines_path, "bin", "python"),
-            os.path.join(self.env_pipelines_path, "bin", "python3")
-        ]
-    def check_for_updates(self):
+        return self.config.state_cache.get_or_compute(
+            f"pipelines-remote-head:{self.pipelines_repo_url}:{ref or 'HEAD'}",
+            [],
+            probe,
+            max_age=self.REMOTE_HEAD_TTL if max_age is None else max_age,
+        )
+
+    def check_for_updates(self, max_age=None):
         """
         Checks if there are updates available for the pipelines repository.
+        :param max_age: Maximum age in seconds of a cached remote HEAD; see get_remote_head.
         :return: True if updates are available, False otherwise.
         """
         try:
@@ -86,13 +117,9 @@ class PipelinesInstaller(BaseInstaller):
 
             print("Checking for updates in the pipelines repository...")
 
-            # Fetch changes from the remote repository
-            with porcelain.open_repo_closing(self.pipelines_repo_path) as repo:
-                remote_refs = porcelain.fetch(repo, self.pipelines_repo_url)
-            
-            # Compare local HEAD with the fetched remote HEAD
-            local_head = repo.head().decode("utf-8")
-            remote_head = remote_refs[b"HEAD"].decode("utf-8")
+            # Compare local HEAD with the advertised remote HEAD
+            local_head = self.get_local_head()
+            remote_head = self.get_remote_head(max_age)
 
             if local_head != remote_head:
                 print("Updates are available for the pipelines repository.")
@@ -103,6 +130,24 @@ class PipelinesInstaller(BaseInstaller):
         except Exception as e:
             print(f"Error checking for updates: {e}")
             raise
+
+    def check_update(self, callback=None):
+        """
+        Check for pipelines updates on a background thread.
+        :param callback: Optional callback function to receive the result (True/False).
+        """
+        def update_task():
+            update_available = False
+            try:
+                update_available = self.check_for_updates()
+            except Exception:
+                pass  # Already reported by check_for_updates; treat as no update
+
+            if callback:
+                callback(update_available)
+
+        threading.Thread(target=update_task, daemon=True).start()
+
     def install(self):
         """
         Install pipelines by setting up the environment and cloning the repository.
@@ -110,55 +155,197 @@ class PipelinesInstaller(BaseInstaller):
         print(f"Installing {self.name}...")
 
         try:
-            # Step 1: Clone the repository
-            if not os.path.exists(self.pipelines_repo_path):
-                if self.status_updater:
-                    self.status_updater.update_status(
-                        "Step: [4/6] Pipelines Cloning...",
-                        "Cloning the Pipelines repository, this could take 5-7 minutes depending on your system",
-                        50,
-                    )
+            self.clone_repository()
+            self.install_requirements()
+        except Exception as e:
+            print(f"Error during installation: {e}")
+            raise RuntimeError(f"{self.name} installation failed.") from e
 
-                print(f"[4/6] Cloning pipelines repository from {self.pipelines_repo_url}...")
+    def clone_repository(self):
+        """
+        Clone the pipelines repository, unless it already exists.
+        Does not need the Conda environment, so it can run while the environment is created.
+        """
+        if os.path.exists(self.pipelines_repo_path):
+            print("Pipelines repository already exists. Skipping cloning.")
+            return
 
-                try:
-                    porcelain.clone(self.pipelines_repo_url, self.pipelines_repo_path)
-                    print("Pipelines repository cloned successfully.")
-                except Exception as e:
-                    raise RuntimeError(f"Failed to clone pipelines repository: {e}")
-            else:
-                print("Pipelines repository already exists. Skipping cloning.")
+        if self.status_updater:
+            self.status_updater.update_status(
+                "Step: [4/6] Pipelines Cloning...",
+                "Cloning the Pipelines repository...",
+                50,
+            )
 
-            # Step 2: Install dependencies using the previously set up Conda environment
-            requirements_file = os.path.join(self.pipelines_repo_path, "requirements.txt")
-            if os.path.exists(requirements_file):
-                print(f"[5/6] Installing dependencies from {requirements_file}...")
-                if self.status_updater:
-                    self.status_updater.update_status(
-                        "Step: [5/6] Pipelines Installing Dependencies...",
-                        "Installing requirements, this could take 5-7 minutes depending on your system",
-                        75,
-                    )
-                try:
-                    self._install_dependencies(requirements_file)
-                except Exception as e:
-                    raise RuntimeError(f"Failed to install dependencies: {e}")
-            else:
-                print("[6/6] No requirements.txt found. Skipping dependency installation.")
+        bundle = self.config.offline_bundle
+        if bundle and os.path.exists(bundle.pipelines_snapshot_dir):
+            print("[4/6] Copying pipelines repository from the offline bundle...")
+            shutil.copytree(bundle.pipelines_snapshot_dir, self.pipelines_repo_path)
+        else:
+            print(f"[4/6] Cloning pipelines repository from {self.pipelines_repo_url}...")
+
+            try:
+                self._clone()
+                print("Pipelines repository cloned successfully.")
+            except Exception as e:
+                shutil.rmtree(self.pipelines_repo_path, ignore_errors=True)
+                raise RuntimeError(f"Failed to clone pipelines repository: {e}")
+
+    def _clone(self):
+        """
+        Clone the repository, shallow by default (AppConfig.pipelines_clone_depth) and at the
+        pinned ref if AppConfig.pipelines_ref is set.
+        """
+        ref = self.config.pipelines_ref
+        pinned_commit = ref if ref and self.COMMIT_SHA_RE.match(ref) else None
+        progress = GitProgressStream(self.status_updater, "Step: [4/6] Pipelines Cloning...", start=50, end=75)
+
+        # Branches and tags can be cloned directly; a pinned commit is checked out afterwards
+        porcelain.clone(
+            self.pipelines_repo_url,
+            self.pipelines_repo_path,
+            depth=self.config.pipelines_clone_depth,
+            branch=ref if ref and not pinned_commit else None,
+            errstream=progress,
+        )
+        progress.flush()
+
+        if pinned_commit:
+            with porcelain.open_repo_closing(self.pipelines_repo_path) as repo:
+                self._checkout(repo, pinned_commit, progress)
+
+    def _is_shallow(self):
+        return os.path.exists(os.path.join(self.pipelines_repo_path, ".git", "shallow"))
+
+    @staticmethod
+    def _resolve_remote_ref(refs, ref):
+        """
+        Finds the commit a ref points at in a remote ref advertisement.
+        :param refs: Dictionary of remote ref names to SHAs, as returned by fetch or ls-remote.
+        :param ref: Branch, tag or commit SHA, or None for the remote HEAD.
+        :return: The SHA as bytes.
+        """
+        if ref is None:
+            return refs[b"HEAD"]
+        if PipelinesInstaller.COMMIT_SHA_RE.match(ref):
+            return ref.encode("ascii")
+        # Annotated tags are advertised with a peeled "^{}" entry pointing at the commit
+        for name in (f"refs/tags/{ref}^{{}}", f"refs/tags/{ref}", f"refs/heads/{ref}"):
+            if name.encode("utf-8") in refs:
+                return refs[name.encode("utf-8")]
+        raise RuntimeError(f"Ref {ref} not found on the pipelines remote.")
+
+    def _deepen_until(self, repo, sha, progress):
+        """
+        Fetches more history into a shallow clone until a commit is available.
+        """
+        depth = max(self.config.pipelines_clone_depth or 1, 1)
+        while sha not in repo.object_store:
+            depth *= 8
+            if depth > self.MAX_DEEPEN_DEPTH:
+                raise RuntimeError(f"Commit {sha.decode('ascii')} is not within {self.MAX_DEEPEN_DEPTH} commits of the remote refs.")
+            print(f"Deepening pipelines clone to {depth} commits to find {sha.decode('ascii')}...")
+            porcelain.fetch(repo, self.pipelines_repo_url, errstream=progress, depth=depth)
+
+    def _checkout(self, repo, sha, progress):
+        """
+        Moves the checked out branch to a commit and updates the working tree to match.
+        :param sha: Commit SHA as str or bytes.
+        """
+        if isinstance(sha, str):
+            sha = sha.encode("ascii")
+        if sha not in repo.object_store:
+            self._deepen_until(repo, sha, progress)
+        commit = repo[sha]
+        while commit.type_name == b"tag":  # Peel annotated tags down to their commit
+            commit = repo[commit.object[1]]
+        commit_id = commit.id
+        repo.refs[b"HEAD"] = commit_id  # Follows the symbolic ref to the current branch
+        porcelain.reset(repo, "hard", commit_id)
+
+    def _update_repository(self):
+        """
+        Brings the local repository to the latest remote HEAD, or to AppConfig.pipelines_ref.
+        Shallow clones fetch only the new tip and reset to it; history is fetched only when
+        a pinned commit needs it. Full clones keep using a regular pull.
+        """
+        ref = self.config.pipelines_ref
+        progress = GitProgressStream(self.status_updater, "Updating Pipelines repository...")
+        with porcelain.open_repo_closing(self.pipelines_repo_path) as repo:
+            if not self._is_shallow() and ref is None:
+                porcelain.pull(repo, self.pipelines_repo_url, errstream=progress)
+                return
+            result = porcelain.fetch(
+                repo,
+                self.pipelines_repo_url,
+                errstream=progress,
+                depth=self.config.pipelines_clone_depth if self._is_shallow() else None,
+            )
+            self._checkout(repo, self._resolve_remote_ref(result.refs, ref), progress)
+        progress.flush()
 
-            # Step 3: Finalize installation
-            print(f"[6/6] {self.name} installation complete.")
+    def install_requirements(self):
+        """
+        Install the repository's requirements into the previously set up Conda environment.
+        Needs both the cloned repository and the environment.
+        """
+        requirements_file = os.path.join(self.pipelines_repo_path, "requirements.txt")
+        if os.path.exists(requirements_file):
+            print(f"[5/6] Installing dependencies from {requirements_file}...")
             if self.status_updater:
                 self.status_updater.update_status(
-                    "Step: [6/6] Pipelines Install Complete.",
-                    "Pipelines installed successfully.",
-                    100,
+                    "Step: [5/6] Pipelines Installing Dependencies...",
+                    "Installing requirements, this could take 5-7 minutes depending on your system",
+                    75,
                 )
+            try:
+                self._install_dependencies(requirements_file)
+            except Exception as e:
+                raise RuntimeError(f"Failed to install dependencies: {e}")
+            self.deduplicate_files()
+        else:
+            print("[6/6] No requirements.txt found. Skipping dependency installation.")
 
-        except Exception as e:
-            print(f"Error during installation: {e}")
-            raise RuntimeError(f"{self.name} installation failed.") from e
+        print(f"[6/6] {self.name} installation complete.")
+        if self.status_updater:
+            self.status_updater.update_status(
+                "Step: [6/6] Pipelines Install Complete.",
+                "Pipelines installed successfully.",
+                100,
+            )
+
+
+    def plan_disk_budget(self, budget):
+        """
+        Adds the clone, the environment setup and the dependency install to a DiskBudget.
+        The dependencies can only be resolved once the clone and the environment exist, so until then their fallback is used.
+        """
+        budget.add_step(
+            "clone",
+            50 * 1024 ** 2,
+            lambda: 0 if os.path.exists(self.pipelines_repo_path) else None,
+            "Pipelines Clone",
+        )
+        budget.add_step(
+            "environment",
+            300 * 1024 ** 2,
+            lambda: DiskBudget.estimate_environment(self, self.env_pipelines_path, ["python=3.11", "git"]),
+            "Pipelines Environment Setup",
+        )
+        budget.add_step("requirements", 1536 * 1024 ** 2, self._estimate_requirements, "Pipelines Dependencies Install")
 
+    def _estimate_requirements(self):
+        requirements_file = os.path.join(self.pipelines_repo_path, "requirements.txt")
+        if not os.path.exists(requirements_file):
+            return None
+        if self._requirements_installed(requirements_file):
+            return 0
+        args = ["-r", requirements_file]
+        if self.config.offline_bundle:
+            args.extend(["--no-index", "--find-links", self.config.offline_bundle.wheelhouse_dir])
+        elif self.lock.is_current(Downloader.file_sha256(requirements_file)):
+            args = self.lock.install_args()
+        return DiskBudget.estimate_pip_install(self, self.env_pipelines_path, args)
 
     def check_requirements(self):
         """
@@ -182,21 +369,14 @@ class PipelinesInstaller(BaseInstaller):
             return
 
         self.status_updater.update_status(
-            "PipelinesEnvironment Setup",
+            "Pipelines Environment Setup",
             f"Setting up environment '{env_name}'. This may take a few minutes.",
             0,
         )
         print(f"Setting up environment {env_name}...")
 
         try:
-            self.run_command([
-                self.conda_exe,
-                "create",
-                "--prefix", self.env_pipelines_path,
-                "python=3.11",
-                "git",
-                "-y",
-            ])
+            self.create_environment(env_name, self.env_pipelines_path, ["git"], "Pipelines Environment Setup")
             self.status_updater.update_status(
                 "Pipelines Environment Setup Complete",
                 f"Environment '{env_name}' set up successfully.",
@@ -222,7 +402,18 @@ class PipelinesInstaller(BaseInstaller):
             raise FileNotFoundError(f"Requirements file not found: {requirements_file}")
 
         print("Installing dependencies from requirements.txt...")
-        python_executable = self._find_python_executable()
+        step_text = "Step: [5/6] Pipelines Installing Dependencies..."
+        # The lockfile is only valid for the requirements.txt it was generated from
+        requirements_digest = Downloader.file_sha256(requirements_file)
+        bundle = self.config.offline_bundle
+        if not bundle and self.install_from_lock(
+            self.lock, self.env_pipelines_path, step_text, start=75, end=100,
+            expected_packages=100, source_digest=requirements_digest,
+        ):
+            self._record_requirements(requirements_digest)
+            self.cache_wheels(self.env_pipelines_path, self.lock.install_args())
+            print("Dependencies installed successfully.")
+            return
 
         # self.status_updater.update_status(
         #     "Step: [1/2] Pipelines Installing Dependencies...",
@@ -230,32 +421,42 @@ class PipelinesInstaller(BaseInstaller):
         #     50,
         # )
 
-        # Command to install dependencies
-        pip_install_cmd = [
-            python_executable,
-            "-m", "pip",
-            "install",
-            "-r", requirements_file
-        ]
+        # Arguments for the configured package backend (pip or uv)
+        install_args = ["-r", requirements_file]
+        if bundle:
+            # Resolve everything from the bundled wheelhouse only
+            install_args.extend(["--no-index", "--find-links", bundle.wheelhouse_dir])
 
         try:
-            stdout, stderr = self.run_command(pip_install_cmd)
+            stdout, stderr = self.install_packages(
+                self.env_pipelines_path,
+                install_args,
+                step_text,
+                start=75,
+                end=100,
+                expected_packages=100,
+            )
             # self.status_updater.update_status(
             #     "Step: [2/2] Pipelines Dependencies Installed.",
             #     "Dependencies installed successfully.",
             #     100,
             # )
             print("Dependencies installed successfully.")
+            self._record_requirements(requirements_digest)
+            self.write_lock(self.lock, self.env_pipelines_path, requirements_digest)
+            self.cache_wheels(self.env_pipelines_path, install_args)
 
         except subprocess.CalledProcessError as e:
             print(f"Error installing dependencies: {' '.join(e.cmd)}, Return Code: {e.returncode}")
             raise
 
 
-    def update(self):
+    def update(self, force=False):
         """
         Update the pipelines repository and dependencies.
+        :param force: Update the dependencies even if requirements.txt did not change in the pull.
         """
+        force = force or self.config.force_dependency_install
         print(f"Updating {self.name}...")
 
         try:
@@ -266,18 +467,19 @@ class PipelinesInstaller(BaseInstaller):
             # Step 2: Pull the latest changes
             print(f"[1/2] Pulling the latest changes from {self.pipelines_repo_url}...")
             try:
-                with porcelain.open_repo_closing(self.pipelines_repo_path) as repo:
-                    porcelain.pull(repo, self.pipelines_repo_url)
+                self._update_repository()
                 print("Pipelines repository updated successfully.")
             except Exception as e:
                 raise RuntimeError(f"Failed to update pipelines repository: {e}")
 
             # Step 3: Install or update dependencies
             requirements_file = os.path.join(self.pipelines_repo_path, "requirements.txt")
-            if os.path.exists(requirements_file):
+            if os.path.exists(requirements_file) and not force and self._requirements_installed(requirements_file):
+                print("[2/2] requirements.txt is unchanged since the last install. Skipping dependency update.")
+            elif os.path.exists(requirements_file):
                 print(f"[2/2] Installing or updating dependencies from {requirements_file}...")
                 try:
-                    self._install_dependencies(requirements_file)
+                    self._update_dependencies(requirements_file)
                 except Exception as e:
                     raise RuntimeError(f"Failed to update dependencies: {e}")
             else:
@@ -291,69 +493,85 @@ class PipelinesInstaller(BaseInstaller):
             raise RuntimeError(f"{self.name} update failed.") from e
 
 
-    def _find_python_executable(self):
+    def _update_dependencies(self, requirements_file):
         """
-        Find the Python executable within the pipelines environment.
+        Bring the environment in line with requirements.txt, reinstalling only the packages whose versions change.
         """
-        possible_locations = [
-            os.path.join(self.env_pipelines_path, "python.exe"),
-            os.path.join(self.env_pipelines_path, "bin", "python"),
-            os.path.join(self.env_pipelines_path, "Scripts", "python.exe"),
-        ]
-
-        for path in possible_locations:
-            if os.path.exists(path):
-                return path
-
-        raise FileNotFoundError(
-            "Could not locate the Python executable in the environment. "
-            f"Tried locations: {possible_locations}"
+        requirements_digest = Downloader.file_sha256(requirements_file)
+        if self.update_packages(
+            self.env_pipelines_path,
+            ["-r", requirements_file],
+            "Updating Pipelines dependencies...",
+            expected_packages=100,
+        ):
+            self.write_lock(self.lock, self.env_pipelines_path, requirements_digest)
+            print("Dependencies updated successfully.")
+        else:
+            print("Dependencies are already up to date.")
+        self._record_requirements(requirements_digest)
+
+    def _requirements_installed(self, requirements_file):
+        """
+        Returns True if requirements.txt is byte-for-byte the one last installed into an unchanged environment.
+        """
+        hit, installed_digest = self.config.state_cache.get(
+            self.REQUIREMENTS_STATE_KEY,
+            self.config.env_state_paths(self.env_pipelines_path),
         )
+        return hit and installed_digest == Downloader.file_sha256(requirements_file)
 
-    def run_command(self, cmd_list, cwd=None, capture_output=True):
+    def _record_requirements(self, requirements_digest):
         """
-        Runs a command and logs output in real-time. Prevents console windows from appearing.
-        
-        :param cmd_list: List of command and arguments to run.
-        :param cwd: Directory to execute the command in.
-        :param capture_output: Whether to capture and return stdout and stderr.
-        :return: The process's stdout and stderr as a tuple (stdout, stderr).
-        :raises: subprocess.CalledProcessError if the command fails.
+        Remembers the requirements.txt hash of a successful install, tied to the environment's current state.
         """
-        try:
-            command_str = ' '.join(cmd_list)
-            print(f"Running command: {command_str}")
-
-            # Windows-specific flag to suppress console window
-            CREATE_NO_WINDOW = 0x08000000
-
-            process = subprocess.Popen(
-                cmd_list,
-                stdout=subprocess.PIPE if capture_output else None,
-                stderr=subprocess.PIPE if capture_output else None,
-                text=True,
-                creationflags=CREATE_NO_WINDOW,
-                cwd=cwd,
-                env=os.environ.copy()  # Ensure environment variables are inherited
-            )
+        self.config.state_cache.set(
+            self.REQUIREMENTS_STATE_KEY,
+            self.config.env_state_paths(self.env_pipelines_path),
+            requirements_digest,
+        )
 
-            stdout, stderr = process.communicate()
+    def relock(self):
+        """
+        Regenerate the lockfile from the currently installed packages and requirements.txt.
+        :return: True if the lockfile was written.
+        """
+        requirements_file = os.path.join(self.pipelines_repo_path, "requirements.txt")
+        if not self.check_installed() or not os.path.exists(requirements_file):
+            print("Pipelines are not installed. Nothing to lock.")
+            return False
+        return self.write_lock(self.lock, self.env_pipelines_path, Downloader.file_sha256(requirements_file))
 
-            # Log output if capture_output is True
-            if stdout:
-                print(stdout)
-            if stderr:
-                print(stderr)
+    def _find_python_executable(self):
+        """
+        Find the Python executable within the pipelines environment.
+        """
+        return self.find_env_python(self.env_pipelines_path)
 
-            # Check for errors and raise if process failed
-            if process.returncode != 0:
-                raise subprocess.CalledProcessError(process.returncode, cmd_list, output=stdout, stderr=stderr)
+    def export_bundle(self, bundle):
+        """
+        Adds the pipelines environment's conda package set, a wheelhouse for the
+        pipelines requirements and a snapshot of the repository to an offline bundle.
+        :param bundle: The OfflineBundle being exported.
+        """
+        if not self.check_installed():
+            raise RuntimeError("Pipelines are not installed. Nothing to export.")
+
+        self.export_conda_package_set(bundle, "env_pipelines", self.env_pipelines_path)
+
+        requirements_file = os.path.join(self.pipelines_repo_path, "requirements.txt")
+        if os.path.exists(requirements_file):
+            self.run_with_progress(
+                [
+                    self._find_python_executable(),
+                    "-m", "pip",
+                    "download",
+                    "-r", requirements_file,
+                    "--dest", bundle.wheelhouse_dir,
+                ],
+                "Exporting Pipelines wheelhouse...",
+                expected_packages=100,
+            )
 
-            return stdout, stderr
-        except subprocess.CalledProcessError as e:
-            print(f"Command failed: {' '.join(e.cmd)}, Return Code: {e.returncode}")
-            print(f"Error Output: {e.stderr}")
-            raise
-        except Exception as e:
-            print(f"Unexpected error while running command: {e}")
-            raise
\ No newline at end of file
+        if os.path.exists(bundle.pipelines_snapshot_dir):
+            shutil.rmtree(bundle.pipelines_snapshot_dir)
+        shutil.copytree(self.pipelines_repo_path, bundle.pipelines_snapshot_dir)
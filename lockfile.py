@@ -0,0 +1,125 @@
+import json
+import os
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from AppConfig import AppConfig
+from dist_metadata import DistInfoReader
+
+
+class LockFile:
+    """
+    Exact versions and hashes of the pip-installed packages of one environment.
+
+    The lockfile is a requirements file in which every line pins a version and lists the
+    SHA-256 hashes PyPI publishes for it, so it can be installed with
+    `--no-deps --require-hashes` without resolving the dependency graph again.
+    Packages installed by conda (pip, setuptools, python itself) are left to conda.
+    """
+
+    PYPI_JSON_URL = "https://pypi.org/pypi/{name}/{version}/json"
+    SOURCE_HEADER = "# source-sha256: "
+
+    def __init__(self, env_name):
+        """
+        :param env_name: Name of the environment the lockfile belongs to, e.g. "env".
+        """
+        self.config = AppConfig()
+        self.env_name = env_name
+        self.locks_dir = os.path.join(self.config.base_path, "locks")
+        self.path = os.path.join(self.locks_dir, f"{env_name}.lock.txt")
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def source_digest(self):
+        """
+        Returns the digest of the input the lockfile was generated from (e.g. requirements.txt), or None.
+        """
+        if not self.exists():
+            return None
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(self.SOURCE_HEADER):
+                    return line[len(self.SOURCE_HEADER):].strip()
+                if not line.startswith("#"):
+                    break
+        return None
+
+    def is_current(self, source_digest=None):
+        """
+        Returns True if the lockfile exists and was generated from the given input.
+        :param source_digest: Digest of the input, or None if the lockfile does not depend on one.
+        """
+        if not self.exists():
+            return False
+        return source_digest is None or self.source_digest() == source_digest
+
+    def install_args(self):
+        """
+        Returns the package backend arguments that install exactly what the lockfile pins.
+        """
+        return ["--no-deps", "--require-hashes", "-r", self.path]
+
+    def generate(self, env_path, source_digest=None, workers=8):
+        """
+        Writes the lockfile from the packages currently installed in an environment.
+
+        :param env_path: The prefix of the environment.
+        :param source_digest: Optional digest of the input the environment was installed from.
+        :param workers: Number of concurrent PyPI lookups.
+        :return: Number of packages locked.
+        :raises: RuntimeError if a package cannot be pinned by hash.
+        """
+        reader = DistInfoReader(env_path)
+        packages = []
+        for name, version, dist_info_path in reader.iter_distributions():
+            if reader.read_installer(dist_info_path) == "conda":
+                continue
+            if reader.is_direct_url(dist_info_path):
+                raise RuntimeError(f"{name} was not installed from an index and cannot be locked.")
+            packages.append((reader.normalize_name(name), version))
+
+        print(f"Locking {len(packages)} packages of {env_path}...")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            hashes = list(executor.map(lambda package: self._fetch_hashes(*package), packages))
+
+        missing = [f"{name}=={version}" for (name, version), digests in zip(packages, hashes) if not digests]
+        if missing:
+            raise RuntimeError(f"No PyPI hashes found for: {', '.join(missing)}")
+
+        lines = [
+            f"# Lockfile for {self.env_name}, generated {time.strftime('%Y-%m-%d %H:%M:%S')}.",
+            "# Install with --no-deps --require-hashes. Regenerate with --relock.",
+        ]
+        if source_digest:
+            lines.append(f"{self.SOURCE_HEADER}{source_digest}")
+        for (name, version), digests in sorted(zip(packages, hashes)):
+            hash_lines = " \\\n".join(f"    --hash=sha256:{digest}" for digest in digests)
+            lines.append(f"{name}=={version} \\\n{hash_lines}")
+
+        os.makedirs(self.locks_dir, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp_path, self.path)
+        print(f"Lockfile written to {self.path}")
+        return len(packages)
+
+    def _fetch_hashes(self, name, version):
+        """
+        Returns the SHA-256 digests of every file PyPI publishes for a release, so any of
+        them (wheel for this platform or sdist) satisfies --require-hashes.
+        """
+        url = self.PYPI_JSON_URL.format(name=name, version=version)
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                release = json.load(response)
+        except (OSError, ValueError) as e:
+            print(f"Failed to fetch hashes for {name}=={version}: {e}")
+            return []
+        return sorted({
+            file_info["digests"]["sha256"]
+            for file_info in release.get("urls", [])
+            if file_info.get("digests", {}).get("sha256")
+        })
@@ -1,4 +1,5 @@
 
+import argparse
 import os
 import shutil
 import sys
@@ -13,14 +14,61 @@ from status_display import StatusDisplay
 from status_updater import StatusUpdater
 import threading
 from AppConfig import AppConfig
+from state_probe import InstallStateProbe
+from ProcessSupervisor import ProcessSupervisor
+from update_check_service import UpdateCheckService
+from offline_bundle import OfflineBundle
+from installer_openwebui import OpenWebUIInstaller
+from installer_pipelines import PipelinesInstaller
 from helper_image import HelperImage 
 from AppDesktopIntegration import AppDesktopIntegration
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="BrainDrive.ai Installer")
+    parser.add_argument(
+        "--export-bundle",
+        metavar="ARCHIVE",
+        help="Write an offline install bundle from the current installation and exit.",
+    )
+    parser.add_argument(
+        "--import-bundle",
+        metavar="ARCHIVE",
+        help="Install from an offline bundle instead of downloading from the network.",
+    )
+    parser.add_argument(
+        "--relock",
+        action="store_true",
+        help="Regenerate the lockfiles of the installed environments and exit.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reinstall Pipelines dependencies on update even if requirements.txt is unchanged.",
+    )
+    args, _ = parser.parse_known_args()
+    return args
+
 def main():
+    args = parse_args()
+    config = AppConfig()
+
+    if args.export_bundle:
+        OfflineBundle.export_installation(os.path.abspath(args.export_bundle))
+        return
+
+    config.force_dependency_install = args.force
+
+    if args.relock:
+        OpenWebUIInstaller().relock()
+        PipelinesInstaller().relock()
+        return
+
+    if args.import_bundle:
+        config.offline_bundle = OfflineBundle.extract(args.import_bundle, config.offline_bundle_dir)
+
     # Create the main window
     root = tk.Tk()
     root.title("BrainDrive.ai Installer [v0.3.3]")
-    config = AppConfig()
 
     try:
 
@@ -97,6 +145,29 @@ def main():
     pipelines_instance.display(right_group, status_updater)
     ollama_instance.display(right_group, status_updater)
 
+    def apply_update_checks(results, state):
+        if state.openwebui_installed:
+            # A failed check reports no update, but still completes the startup status
+            webui_instance.handle_update_check_result(
+                results["open-webui"].update_available,
+                results["open-webui"].download_size,
+            )
+        pipelines_instance.handle_update_check_result(results["pipelines"].update_available)
+        ollama_instance.handle_update_check_result(results["ollama"])
+
+    def start_update_checks(state):
+        # All components are checked concurrently once the installation state is known
+        UpdateCheckService().check_in_background(root, lambda results: apply_update_checks(results, state), state)
+
+    # Probe the installation state once in the background so the window paints immediately
+    state_probe = InstallStateProbe(status_updater)
+    state_probe.probe_in_background(
+        root,
+        [webui_instance.apply_install_state, pipelines_instance.apply_install_state, start_update_checks],
+    )
+
+    # Local JSON status of the supervised servers (uptime, restarts)
+    ProcessSupervisor().start_status_api()
 
     # Run the main loop
     root.mainloop()
@@ -0,0 +1,178 @@
+import json
+import os
+import shutil
+import time
+import zipfile
+from urllib.parse import urlparse
+from urllib.request import pathname2url
+from AppConfig import AppConfig
+from installer_miniconda import MinicondaInstaller
+from installer_openwebui import OpenWebUIInstaller
+from installer_pipelines import PipelinesInstaller
+
+
+class OfflineBundle:
+    """
+    A self-contained set of everything a full install needs, so air-gapped or
+    bandwidth-capped machines never touch the network.
+
+    Layout of an extracted bundle:
+    - MinicondaInstaller.exe
+    - conda/<env_name>.txt: `conda list --explicit` package set for each environment
+    - conda/pkgs/: the conda package files referenced by those lists
+    - wheelhouse/: `pip download` output for open-webui and the pipelines requirements
+    - pipelines/: snapshot of the pipelines repository
+    - manifest.json
+    """
+
+    MANIFEST_FILE = "manifest.json"
+    MINICONDA_INSTALLER = "MinicondaInstaller.exe"
+
+    def __init__(self, bundle_dir):
+        """
+        :param bundle_dir: Directory holding the (extracted or staged) bundle contents.
+        """
+        self.bundle_dir = bundle_dir
+        self.conda_dir = os.path.join(bundle_dir, "conda")
+        self.conda_pkgs_dir = os.path.join(self.conda_dir, "pkgs")
+        self.wheelhouse_dir = os.path.join(bundle_dir, "wheelhouse")
+        self.pipelines_snapshot_dir = os.path.join(bundle_dir, "pipelines")
+        self.miniconda_installer = os.path.join(bundle_dir, self.MINICONDA_INSTALLER)
+
+    @property
+    def manifest(self):
+        try:
+            with open(os.path.join(self.bundle_dir, self.MANIFEST_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def update_manifest(self, **values):
+        manifest = self.manifest
+        manifest.update(values)
+        os.makedirs(self.bundle_dir, exist_ok=True)
+        with open(os.path.join(self.bundle_dir, self.MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+    def explicit_list_path(self, env_name):
+        return os.path.join(self.conda_dir, f"{env_name}.txt")
+
+    def has_env(self, env_name):
+        return os.path.exists(self.explicit_list_path(env_name))
+
+    def add_conda_package_set(self, env_name, explicit_list, pkgs_dirs, downloader):
+        """
+        Stores an environment's explicit package list and the package files it references.
+
+        :param env_name: Name of the environment, e.g. "env".
+        :param explicit_list: Output of `conda list --explicit`.
+        :param pkgs_dirs: Conda package directories to copy package files from.
+        :param downloader: Downloader used for package files missing from pkgs_dirs.
+        """
+        os.makedirs(self.conda_pkgs_dir, exist_ok=True)
+        with open(self.explicit_list_path(env_name), "w", encoding="utf-8") as f:
+            f.write(explicit_list)
+
+        for url in self._package_urls(explicit_list):
+            filename = os.path.basename(urlparse(url).path)
+            target = os.path.join(self.conda_pkgs_dir, filename)
+            if os.path.exists(target):
+                continue
+            source = next(
+                (os.path.join(pkgs_dir, filename) for pkgs_dir in pkgs_dirs
+                 if os.path.exists(os.path.join(pkgs_dir, filename))),
+                None,
+            )
+            if source:
+                shutil.copy2(source, target)
+            else:
+                downloader.download(url, target)
+
+    def local_explicit_list(self, env_name):
+        """
+        Writes a copy of an environment's explicit list that points at the bundled package files.
+        :return: Path of the rewritten list, usable with `conda create --file ... --offline`.
+        """
+        with open(self.explicit_list_path(env_name), "r", encoding="utf-8") as f:
+            explicit_list = f.read()
+
+        lines = []
+        for line in explicit_list.splitlines():
+            if line.strip() and not line.startswith(("#", "@")):
+                url, _, md5 = line.partition("#")
+                filename = os.path.basename(urlparse(url.strip()).path)
+                local_url = "file:" + pathname2url(os.path.join(self.conda_pkgs_dir, filename))
+                line = f"{local_url}#{md5}" if md5 else local_url
+            lines.append(line)
+
+        local_path = os.path.join(self.conda_dir, f"{env_name}.local.txt")
+        with open(local_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return local_path
+
+    @staticmethod
+    def _package_urls(explicit_list):
+        for line in explicit_list.splitlines():
+            line = line.strip()
+            if line and not line.startswith(("#", "@")):
+                yield line.split("#", 1)[0]
+
+    def write_archive(self, archive_path):
+        """
+        Packs the bundle directory into a single zip archive.
+        Wheels and conda packages are already compressed, so they are stored as-is.
+        """
+        self.update_manifest(created=time.strftime("%Y-%m-%d %H:%M:%S"))
+        with zipfile.ZipFile(archive_path, "w", allowZip64=True) as archive:
+            for dirpath, _, filenames in os.walk(self.bundle_dir):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    compress_type = zipfile.ZIP_STORED
+                    if not filename.endswith((".whl", ".conda", ".tar.bz2", ".exe", ".zip", ".tar.gz")):
+                        compress_type = zipfile.ZIP_DEFLATED
+                    archive.write(path, os.path.relpath(path, self.bundle_dir), compress_type=compress_type)
+        print(f"Offline bundle written to {archive_path}")
+        return archive_path
+
+    @classmethod
+    def extract(cls, archive_path, bundle_dir):
+        """
+        Extracts a bundle archive.
+        :return: An OfflineBundle for the extracted directory.
+        """
+        if os.path.exists(bundle_dir):
+            shutil.rmtree(bundle_dir)
+        with zipfile.ZipFile(archive_path, "r") as archive:
+            archive.extractall(bundle_dir)
+        bundle = cls(bundle_dir)
+        if not os.path.exists(os.path.join(bundle_dir, cls.MANIFEST_FILE)):
+            raise RuntimeError(f"{archive_path} is not an offline bundle (no {cls.MANIFEST_FILE}).")
+        print(f"Offline bundle extracted to {bundle_dir}: {bundle.manifest}")
+        return bundle
+
+    @classmethod
+    def export_installation(cls, archive_path, status_updater=None):
+        """
+        Writes an offline bundle for the current installation.
+        :param archive_path: Path of the zip archive to create.
+        :param status_updater: Optional StatusUpdater for progress reporting.
+        :return: The archive path.
+        """
+        config = AppConfig()
+        staging_dir = os.path.join(config.base_path, "offline_bundle_export")
+        if os.path.exists(staging_dir):
+            shutil.rmtree(staging_dir)
+        bundle = cls(staging_dir)
+
+        try:
+            with config.artifact_cache.session():
+                MinicondaInstaller(status_updater).export_bundle(bundle)
+                OpenWebUIInstaller(status_updater).export_bundle(bundle)
+                pipeline_installer = PipelinesInstaller(status_updater)
+                if pipeline_installer.check_installed():
+                    pipeline_installer.export_bundle(bundle)
+                else:
+                    print("Pipelines are not installed. Exporting Open WebUI only.")
+            return bundle.write_archive(archive_path)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
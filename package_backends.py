@@ -0,0 +1,123 @@
+import os
+import shutil
+
+
+def _find_executable(configured_path, name):
+    """
+    Returns the configured executable if it exists, otherwise looks the name up on PATH.
+    """
+    if configured_path and os.path.exists(configured_path):
+        return configured_path
+    return shutil.which(name)
+
+
+class CondaEnvBackend:
+    """
+    Creates environments with conda's classic solver.
+    """
+    name = "conda"
+    supports_clone = True
+
+    def __init__(self, config):
+        self.config = config
+
+    @property
+    def executable(self):
+        return self.config.conda_exe
+
+    def is_available(self):
+        return os.path.exists(self.executable)
+
+    def create_cmd(self, env_path, packages):
+        return [self.executable, "create", "--prefix", env_path, *packages, "-y"]
+
+    def clone_cmd(self, source_path, env_path):
+        return [self.executable, "create", "--clone", source_path, "--prefix", env_path, "-y"]
+
+    def install_cmd(self, env_path, packages):
+        return [self.executable, "install", "--prefix", env_path, *packages, "-y"]
+
+
+class MicromambaEnvBackend(CondaEnvBackend):
+    """
+    Creates environments with micromamba, whose libsolv-based solver is much faster than conda's.
+    micromamba cannot clone environments, so templates are not used with it.
+    """
+    name = "micromamba"
+    supports_clone = False
+
+    @property
+    def executable(self):
+        return _find_executable(self.config.micromamba_exe, "micromamba")
+
+    def is_available(self):
+        return self.executable is not None
+
+    def create_cmd(self, env_path, packages):
+        return [self.executable, "create", "--prefix", env_path, "-c", "conda-forge", *packages, "-y"]
+
+    def install_cmd(self, env_path, packages):
+        return [self.executable, "install", "--prefix", env_path, "-c", "conda-forge", *packages, "-y"]
+
+
+class PipBackend:
+    """
+    Installs Python packages with the environment's own pip.
+    """
+    name = "pip"
+
+    def __init__(self, config):
+        self.config = config
+
+    def is_available(self):
+        return True  # pip ships with every Python 3.11 environment
+
+    def install_cmd(self, python_executable, args):
+        return [python_executable, "-m", "pip", "install", *args]
+
+
+class UvBackend(PipBackend):
+    """
+    Installs Python packages with uv, a much faster drop-in for `pip install`.
+    """
+    name = "uv"
+
+    @property
+    def executable(self):
+        return _find_executable(self.config.uv_exe, "uv")
+
+    def is_available(self):
+        return self.executable is not None
+
+    def install_cmd(self, python_executable, args):
+        return [self.executable, "pip", "install", "--python", python_executable, *args]
+
+
+ENV_BACKENDS = {backend.name: backend for backend in (CondaEnvBackend, MicromambaEnvBackend)}
+PACKAGE_BACKENDS = {backend.name: backend for backend in (PipBackend, UvBackend)}
+
+
+def _select_backend(backends, requested, default, config, kind):
+    backend_class = backends.get(requested)
+    if backend_class is None:
+        print(f"Unknown {kind} backend '{requested}'. Using {default}.")
+    else:
+        backend = backend_class(config)
+        if backend.is_available():
+            return backend
+        print(f"{kind.capitalize()} backend '{requested}' is not available. Falling back to {default}.")
+    return backends[default](config)
+
+
+def get_env_backend(config):
+    """
+    Returns the environment backend configured in AppConfig.env_backend, falling back to conda.
+    """
+    return _select_backend(ENV_BACKENDS, config.env_backend, "conda", config, "environment")
+
+
+def get_package_backend(config):
+    """
+    Returns the package backend configured in AppConfig.package_backend, falling back to pip.
+    """
+    return _select_backend(PACKAGE_BACKENDS, config.package_backend, "pip", config, "package")
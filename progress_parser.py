@@ -0,0 +1,168 @@
+import re
+import time
+
+
+class InstallProgressParser:
+    """
+    Turns streamed pip, uv and conda output into a live progress percentage and
+    download rate, pushed through StatusUpdater.update_status.
+
+    An instance is used directly as the `on_line` callback of BaseInstaller.run_command.
+    Updates are throttled by the StatusUpdater, so thousands of pip lines do not
+    flood the Tkinter event loop.
+    """
+
+    # Fraction of the step reached when a conda phase starts
+    CONDA_PHASES = [
+        ("Collecting package metadata", "Collecting package metadata", 0.05),
+        ("Solving environment", "Solving environment", 0.15),
+        ("Downloading and Extracting Packages", "Downloading and extracting packages", 0.30),
+        ("Preparing transaction", "Preparing transaction", 0.80),
+        ("Verifying transaction", "Verifying transaction", 0.85),
+        ("Executing transaction", "Executing transaction", 0.90),
+    ]
+
+    # Share of the step used by pip's collect/download phase; installing takes the rest
+    PIP_DOWNLOAD_SHARE = 0.80
+
+    COLLECTING_RE = re.compile(r"^\s*Collecting (\S+)")
+    # Recent pip also reports the .metadata file it fetches before a wheel; those are not packages
+    DOWNLOADING_RE = re.compile(r"^\s*Downloading (\S+)(?<!\.metadata)\s.*\(([\d.]+)\s*(kB|KB|MB|GB|B)\)")
+    CACHED_RE = re.compile(r"^\s*Using cached (\S+)(?<!\.metadata)(?:\s|$)")
+    INSTALLING_RE = re.compile(r"^\s*Installing collected packages: (.*)")
+    SUCCESS_RE = re.compile(r"^\s*Successfully installed")
+
+    # uv reports whole phases rather than individual packages
+    UV_RESOLVED_RE = re.compile(r"^Resolved (\d+) packages? in (\S+)")
+    UV_PREPARED_RE = re.compile(r"^Prepared (\d+) packages? in (\S+)")
+    UV_INSTALLED_RE = re.compile(r"^Installed (\d+) packages? in (\S+)")
+    UV_AUDITED_RE = re.compile(r"^Audited (\d+) packages? in (\S+)")
+
+    UNIT_FACTORS = {"B": 1, "kB": 1000, "KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3}
+
+    def __init__(self, status_updater, step_text, start=0, end=100, expected_packages=50):
+        """
+        :param status_updater: The StatusUpdater to push progress to. May be None.
+        :param step_text: Step label shown while the command runs.
+        :param start: Progress bar value at the start of the command.
+        :param end: Progress bar value when the command completes.
+        :param expected_packages: Rough number of packages pip will collect, used to scale the download phase.
+        """
+        self.status_updater = status_updater
+        self.step_text = step_text
+        self.start = start
+        self.end = end
+        self.expected_packages = max(expected_packages, 1)
+        self.fraction = 0.0
+        self.details = ""
+        self.packages_seen = 0
+        self.cached_packages = 0  # Served from pip's cache
+        self.downloaded_packages = 0  # Fetched from the network
+        self.bytes_downloaded = 0
+        self.started = time.monotonic()
+
+    def __call__(self, line, stream_name="stdout"):
+        print(line)
+        if self._parse(line.strip()):
+            self._push(throttle=True)
+
+    @property
+    def percentage(self):
+        return self.start + (self.end - self.start) * min(self.fraction, 1.0)
+
+    @property
+    def bytes_per_second(self):
+        # Averaged over the whole command, since pip reports a file's size when its download starts
+        elapsed = time.monotonic() - self.started
+        return self.bytes_downloaded / elapsed if elapsed > 0 else 0.0
+
+    def finish(self):
+        """
+        Marks the command as complete and pushes a final, unthrottled update.
+        """
+        self.fraction = 1.0
+        self._push(throttle=False)
+
+    def _parse(self, line):
+        """
+        Updates the parser state from one output line.
+        :return: True if the line changed the reported progress.
+        """
+        if not line:
+            return False
+
+        for marker, details, fraction in self.CONDA_PHASES:
+            if line.startswith(marker):
+                self._advance(fraction, f"{details}...")
+                return True
+
+        match = self.DOWNLOADING_RE.match(line)
+        if match:
+            name, size, unit = match.groups()
+            self.downloaded_packages += 1
+            self.bytes_downloaded += int(float(size) * self.UNIT_FACTORS[unit])
+            self._advance(
+                self._download_fraction(),
+                f"Downloading {name} ({size} {unit}) - {self._format_rate(self.bytes_per_second)}",
+            )
+            return True
+
+        match = self.COLLECTING_RE.match(line) or self.CACHED_RE.match(line)
+        if match:
+            if line.lstrip().startswith("Collecting"):
+                self.packages_seen += 1
+            else:
+                self.cached_packages += 1
+            self._advance(self._download_fraction(), f"Collecting {match.group(1)} ({self.packages_seen} packages so far)")
+            return True
+
+        match = self.INSTALLING_RE.match(line)
+        if match:
+            count = len([name for name in match.group(1).split(",") if name.strip()])
+            self._advance(self.PIP_DOWNLOAD_SHARE + 0.05, f"Installing {count} collected packages...")
+            return True
+
+        if self.SUCCESS_RE.match(line):
+            self._advance(1.0, "Packages installed successfully.")
+            return True
+
+        match = self.UV_RESOLVED_RE.match(line)
+        if match:
+            self._advance(0.20, f"Resolved {match.group(1)} packages in {match.group(2)}, downloading...")
+            return True
+
+        match = self.UV_PREPARED_RE.match(line)
+        if match:
+            self._advance(self.PIP_DOWNLOAD_SHARE, f"Prepared {match.group(1)} packages in {match.group(2)}, installing...")
+            return True
+
+        match = self.UV_INSTALLED_RE.match(line) or self.UV_AUDITED_RE.match(line)
+        if match:
+            self._advance(1.0, f"{line.split()[0]} {match.group(1)} packages in {match.group(2)}.")
+            return True
+
+        return False
+
+    def _download_fraction(self):
+        # Grows with the number of collected packages, capped at PIP_DOWNLOAD_SHARE
+        return self.PIP_DOWNLOAD_SHARE * min(self.packages_seen / self.expected_packages, 1.0)
+
+    def _advance(self, fraction, details):
+        # Progress never moves backwards, even if phases are reported out of order
+        self.fraction = max(self.fraction, fraction)
+        self.details = details
+
+    def _push(self, throttle):
+        if self.status_updater:
+            self.status_updater.update_status(
+                self.step_text,
+                self.details,
+                self.percentage,
+                throttle=throttle,
+            )
+
+    @staticmethod
+    def _format_rate(bytes_per_second):
+        if bytes_per_second >= 1000 ** 2:
+            return f"{bytes_per_second / 1000 ** 2:.1f} MB/s"
+        return f"{bytes_per_second / 1000:.0f} kB/s"
@@ -0,0 +1,84 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+
+class ServerLog:
+    """
+    Drains a server's output into rotating, size-capped log files.
+
+    A server whose stdout is a pipe blocks on its next write once the OS pipe buffer
+    (about 64 KB) is full, so a reader thread consumes the output as it is produced.
+    Lines go to <logs_dir>/<name>.log, which rolls over to .log.1, .log.2, ... at
+    max_bytes, and the most recent lines are kept in memory for the UI. The same log
+    is reused across restarts of the server.
+    """
+
+    def __init__(self, name, logs_dir, max_bytes, backup_count, tail_lines=200):
+        """
+        :param name: Name of the server, used as the log file name.
+        :param logs_dir: Directory the log files are written to.
+        :param max_bytes: Size at which the log file is rotated.
+        :param backup_count: Number of rotated files kept.
+        :param tail_lines: Number of recent lines kept in memory.
+        """
+        self.name = name
+        self.path = os.path.join(logs_dir, f"{name}.log")
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.lines = deque(maxlen=tail_lines)
+        self.lock = threading.Lock()
+        self.logger = None
+
+    def _get_logger(self):
+        if self.logger is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            handler = RotatingFileHandler(
+                self.path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            # A private logger, so server output never reaches the root logger or the console
+            logger = logging.getLogger(f"server_log.{self.name}")
+            logger.handlers = [handler]
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            self.logger = logger
+        return self.logger
+
+    def write(self, line):
+        """
+        Appends one line to the log file and the in-memory tail.
+        """
+        with self.lock:
+            self.lines.append(line)
+            self._get_logger().info(line)
+
+    def attach(self, process):
+        """
+        Starts a reader thread that drains a process's stdout into the log until the process closes it.
+        :param process: A subprocess.Popen started with stdout=PIPE in text mode.
+        """
+        self.write(f"--- {time.strftime('%Y-%m-%d %H:%M:%S')} {self.name} started with PID {process.pid} ---")
+        threading.Thread(target=self._drain, args=(process,), daemon=True).start()
+
+    def _drain(self, process):
+        try:
+            for raw_line in process.stdout:
+                self.write(raw_line.rstrip("\r\n"))
+        except (OSError, ValueError) as e:
+            # The pipe was closed under the reader, e.g. while the process was killed
+            print(f"Stopped reading {self.name} output: {e}")
+        finally:
+            process.stdout.close()
+
+    def tail(self, count=None):
+        """
+        Returns the most recent lines, oldest first.
+        :param count: Number of lines to return. Defaults to all lines kept in memory.
+        """
+        with self.lock:
+            lines = list(self.lines)
+        return lines if count is None else lines[-count:]
@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+import time
+
+
+class StateCache:
+    """
+    Small persistent JSON cache for installation facts.
+    Each entry stores the mtime and size of the files it was derived from, and is
+    discarded as soon as any of them changes. Entries about remote state can also
+    be given a maximum age.
+    """
+
+    def __init__(self, cache_file):
+        """
+        :param cache_file: Path of the JSON file backing the cache.
+        """
+        self.cache_file = cache_file
+        self.lock = threading.Lock()
+        self._entries = None
+
+    @staticmethod
+    def fingerprint(paths):
+        """
+        Builds a fingerprint from the mtime and size of each path.
+        Missing paths are recorded as None so that their creation also invalidates the entry.
+        """
+        result = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                result.append([path, stat.st_mtime_ns, stat.st_size])
+            except OSError:
+                result.append([path, None, None])
+        return result
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            temp_file = f"{self.cache_file}.tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(temp_file, self.cache_file)
+        except OSError as e:
+            print(f"Failed to write state cache {self.cache_file}: {e}")
+
+    def get(self, key, paths, max_age=None):
+        """
+        Returns a cached value if its fingerprint still matches.
+        :param key: The cache key.
+        :param paths: Files and directories whose mtime/size the value depends on.
+        :param max_age: Optional age in seconds after which the value is stale, for facts about remote state.
+        :return: A tuple (hit, value).
+        """
+        with self.lock:
+            entry = self._load().get(key)
+            if not entry or entry.get("fingerprint") != self.fingerprint(paths):
+                return False, None
+            if max_age is not None and time.time() - entry.get("stored_at", 0) > max_age:
+                return False, None
+            return True, entry.get("value")
+
+    def set(self, key, paths, value):
+        """
+        Stores a JSON-serializable value together with the fingerprint of its paths.
+        """
+        with self.lock:
+            self._load()[key] = {"fingerprint": self.fingerprint(paths), "value": value, "stored_at": time.time()}
+            self._save()
+
+    def get_or_compute(self, key, paths, compute, max_age=None):
+        """
+        Returns the cached value for key, computing and storing it on a miss.
+        :param compute: Function called without arguments to produce the value.
+        :param max_age: Optional age in seconds after which the value is recomputed.
+        """
+        hit, value = self.get(key, paths, max_age)
+        if hit:
+            print(f"State cache hit: {key}")
+            return value
+        value = compute()
+        self.set(key, paths, value)
+        return value
+
+    def current_keys(self, paths):
+        """
+        Returns the keys of the entries whose fingerprint matches the given paths right now.
+        """
+        fingerprint = self.fingerprint(paths)
+        with self.lock:
+            return [key for key, entry in self._load().items() if entry.get("fingerprint") == fingerprint]
+
+    def refresh(self, keys, paths):
+        """
+        Re-stamps entries with the current fingerprint of their paths, keeping their values.
+        Only for changes known not to affect the cached facts, e.g. relinking identical files.
+        :param keys: Keys of entries that were current before the change, from current_keys().
+        """
+        if not keys:
+            return
+        fingerprint = self.fingerprint(paths)
+        with self.lock:
+            entries = self._load()
+            for key in keys:
+                if key in entries:
+                    entries[key]["fingerprint"] = fingerprint
+            self._save()
+
+    def invalidate(self, key):
+        """
+        Removes a cached entry.
+        """
+        with self.lock:
+            if self._load().pop(key, None) is not None:
+                self._save()
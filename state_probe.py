@@ -0,0 +1,93 @@
+import threading
+from AppConfig import AppConfig
+from installer_openwebui import OpenWebUIInstaller
+from installer_pipelines import PipelinesInstaller
+
+
+class InstallState:
+    """
+    Snapshot of what is currently installed under the base path.
+    """
+    def __init__(self):
+        self.miniconda_installed = False
+        self.has_openwebui_env = False
+        self.openwebui_installed = False
+        self.openwebui_version = None
+        self.has_pipelines_env = False
+        self.pipelines_installed = False
+        self.pipelines_head = None
+
+    def __str__(self):
+        return (
+            f"Miniconda Installed: {self.miniconda_installed}\n"
+            f"Open WebUI Environment: {self.has_openwebui_env}\n"
+            f"Open WebUI Installed: {self.openwebui_installed}\n"
+            f"Open WebUI Version: {self.openwebui_version}\n"
+            f"Pipelines Environment: {self.has_pipelines_env}\n"
+            f"Pipelines Installed: {self.pipelines_installed}\n"
+            f"Pipelines HEAD: {self.pipelines_head}\n"
+        )
+
+
+class InstallStateProbe:
+    """
+    Collects the installation state once, off the Tkinter main thread,
+    and hands the shared result to every card that needs it.
+    """
+    def __init__(self, status_updater=None):
+        self.status_updater = status_updater
+        self.config = AppConfig()
+
+    def probe(self):
+        """
+        Runs all installation checks synchronously.
+        Expensive facts come from the persistent state cache when nothing changed on disk.
+        :return: An InstallState with the results.
+        """
+        state = InstallState()
+        state.miniconda_installed = self.config.is_miniconda_installed
+        state.has_openwebui_env = self.config.has_openwebui_env
+        state.has_pipelines_env = self.config.has_pipelines_env
+
+        if state.has_openwebui_env:
+            webui_installer = OpenWebUIInstaller(self.status_updater)
+            try:
+                state.openwebui_version = webui_installer.get_installed_version()
+            except Exception as e:
+                print(f"Failed to determine the Open WebUI version: {e}")
+            state.openwebui_installed = state.openwebui_version is not None
+
+        pipeline_installer = PipelinesInstaller(self.status_updater)
+        state.pipelines_installed = pipeline_installer.check_installed()
+        if state.pipelines_installed:
+            try:
+                state.pipelines_head = pipeline_installer.get_local_head()
+            except Exception as e:
+                print(f"Failed to read the pipelines repository HEAD: {e}")
+        return state
+
+    def probe_in_background(self, root, callbacks):
+        """
+        Runs the probe in a background thread and delivers the result on the Tkinter main thread.
+        :param root: A Tkinter widget used to schedule the callbacks on the main thread.
+        :param callbacks: List of functions called as callback(state) once the probe completes.
+        """
+        if self.status_updater:
+            self.status_updater.update_status(
+                "Initializing...",
+                "Probing the current installation state.",
+                10,
+            )
+
+        def probe_task():
+            try:
+                state = self.probe()
+            except Exception as e:
+                print(f"Error probing installation state: {e}")
+                state = InstallState()
+            print(f"Installation state:\n{state}")
+            self.config.install_state = state
+            for callback in callbacks:
+                root.after(0, callback, state)
+
+        threading.Thread(target=probe_task, daemon=True).start()
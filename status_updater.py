@@ -1,15 +1,39 @@
 import threading
+import time
 
 class StatusUpdater:
-    def __init__(self, step_label, details_label, progress_bar):
+    def __init__(self, step_label, details_label, progress_bar, min_interval=0.1):
         self.step_label = step_label
         self.details_label = details_label
         self.progress_bar = progress_bar
         self.lock = threading.Lock()
+        # Minimum number of seconds between throttled updates (~10 updates per second)
+        self.min_interval = min_interval
+        self._last_update = 0.0
 
-    def update_status(self, step_text, details_text, progress_value):
+    def _is_throttled(self, throttle):
+        """
+        Returns True if a throttled update arrives too soon after the previous one.
+        Every update that goes through resets the throttle window.
+        """
+        now = time.monotonic()
+        if throttle and now - self._last_update < self.min_interval:
+            return True
+        self._last_update = now
+        return False
+
+    def update_status(self, step_text, details_text, progress_value, throttle=False):
         with self.lock:
+            if self._is_throttled(throttle):
+                return
             # Use `after` to schedule updates on the Tkinter main thread
             self.step_label.after(0, self.step_label.config, {"text": step_text})
             self.details_label.after(0, self.details_label.config, {"text": details_text})
             self.progress_bar.after(0, self.progress_bar.config, {"value": progress_value})
+
+    def update_details(self, details_text, throttle=False):
+        with self.lock:
+            if self._is_throttled(throttle):
+                return
+            # Only the details label changes, step and progress are left as they are
+            self.details_label.after(0, self.details_label.config, {"text": details_text})
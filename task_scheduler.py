@@ -0,0 +1,108 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+class Task:
+    """
+    A named installation step and the steps it must wait for.
+    """
+    def __init__(self, name, func, depends_on=None, description=None):
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on or [])
+        self.description = description or name
+        self.result = None
+
+
+class TaskScheduler:
+    """
+    Runs installation steps as a dependency graph.
+    Steps whose dependencies are complete run in parallel on a bounded worker pool.
+    If a step fails, no new steps are started and the first error is raised once
+    the running steps have finished.
+    """
+
+    def __init__(self, max_workers=3, status_updater=None):
+        """
+        :param max_workers: Maximum number of steps running at the same time.
+        :param status_updater: Optional StatusUpdater that receives per-step progress.
+        """
+        self.max_workers = max_workers
+        self.status_updater = status_updater
+        self.tasks = {}
+        self.lock = threading.Lock()
+
+    def add_task(self, name, func, depends_on=None, description=None):
+        """
+        Adds a step to the graph.
+        :param name: Unique name of the step.
+        :param func: Function called without arguments to run the step.
+        :param depends_on: Names of steps that must complete before this one starts.
+        :param description: Human readable description used in status updates.
+        """
+        if name in self.tasks:
+            raise ValueError(f"Task {name} is already scheduled.")
+        self.tasks[name] = Task(name, func, depends_on, description)
+
+    def _validate(self):
+        for task in self.tasks.values():
+            for dependency in task.depends_on:
+                if dependency not in self.tasks:
+                    raise ValueError(f"Task {task.name} depends on unknown task {dependency}.")
+
+    def run(self):
+        """
+        Runs all steps, respecting their dependencies.
+        :return: Dictionary mapping step names to their return values.
+        :raises: RuntimeError wrapping the first step that failed.
+        """
+        self._validate()
+        completed = set()
+        running = {}
+        pending = dict(self.tasks)
+        error = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                if error is None:
+                    ready = [
+                        task for task in pending.values()
+                        if all(dependency in completed for dependency in task.depends_on)
+                    ]
+                    for task in ready:
+                        print(f"Starting step: {task.description}")
+                        running[executor.submit(task.func)] = task
+                        del pending[task.name]
+
+                if not running:
+                    if error is None and pending:
+                        raise RuntimeError(f"Circular dependencies between steps: {sorted(pending)}")
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    try:
+                        task.result = future.result()
+                    except Exception as e:
+                        print(f"Step failed: {task.description}: {e}")
+                        if error is None:
+                            error = RuntimeError(f"{task.description} failed: {e}")
+                            error.__cause__ = e
+                        continue
+                    completed.add(task.name)
+                    self._report(task, len(completed))
+
+        if error is not None:
+            raise error
+        return {name: task.result for name, task in self.tasks.items()}
+
+    def _report(self, task, completed_count):
+        total = len(self.tasks)
+        print(f"Step complete ({completed_count}/{total}): {task.description}")
+        if self.status_updater:
+            self.status_updater.update_status(
+                f"Step: [{completed_count}/{total}] {task.description} complete.",
+                f"{total - completed_count} step(s) remaining.",
+                int(completed_count * 100 / total),
+            )
@@ -0,0 +1,107 @@
+"""
+Tests for Downloader's resume and checksum handling against the local range server of bench_downloader.
+
+    python -m pytest -q test_downloader.py
+"""
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+from bench_downloader import start_range_server
+from downloader import Downloader
+
+
+class DownloaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.payload = os.urandom(5000)
+        self.sha256 = hashlib.sha256(self.payload).hexdigest()
+        self.server = start_range_server(self.payload, etag='"v2"')
+        self.url = f"http://127.0.0.1:{self.server.server_port}/file.bin"
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.destination = os.path.join(self.temp_dir.name, "file.bin")
+        self.part_path = f"{self.destination}.part"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def write_partial(self, data, etag='"v2"', total_size=5000):
+        """
+        Leaves a single-stream .part file and its validators as an interrupted download would.
+        """
+        with open(self.part_path, "wb") as f:
+            f.write(data)
+        with open(f"{self.part_path}.meta", "w", encoding="utf-8") as f:
+            json.dump({"etag": etag, "last_modified": None, "total_size": total_size}, f)
+
+    def download(self, workers=1, chunk_size=1000, sha256=None):
+        Downloader(workers=workers, chunk_size=chunk_size).download(self.url, self.destination, sha256=sha256)
+        with open(self.destination, "rb") as f:
+            return f.read()
+
+    def assert_no_sidecars(self):
+        leftovers = [name for name in os.listdir(self.temp_dir.name) if name != "file.bin"]
+        self.assertEqual(leftovers, [])
+
+    def test_single_stream(self):
+        self.assertEqual(self.download(sha256=self.sha256), self.payload)
+        self.assert_no_sidecars()
+
+    def test_parallel(self):
+        self.assertEqual(self.download(workers=4, sha256=self.sha256), self.payload)
+        self.assert_no_sidecars()
+
+    def test_parallel_falls_back_without_ranges(self):
+        self.server.accepts_ranges = False
+        self.assertEqual(self.download(workers=4), self.payload)
+
+    def test_resume_unchanged_file(self):
+        self.write_partial(self.payload[:1000])
+        self.assertEqual(self.download(sha256=self.sha256), self.payload)
+        self.assert_no_sidecars()
+
+    def test_resume_changed_file_restarts(self):
+        self.write_partial(os.urandom(1000), etag='"v1"', total_size=3000)
+        self.assertEqual(self.download(), self.payload)
+
+    def test_partial_without_validators_restarts(self):
+        with open(self.part_path, "wb") as f:
+            f.write(os.urandom(1000))
+        self.assertEqual(self.download(), self.payload)
+
+    def test_complete_partial_accepted_on_416(self):
+        self.write_partial(self.payload)
+        self.assertEqual(self.download(sha256=self.sha256), self.payload)
+
+    def test_oversized_partial_restarts_on_416(self):
+        self.write_partial(os.urandom(6000), total_size=6000)
+        self.assertEqual(self.download(), self.payload)
+
+    def test_resumed_checksum_mismatch_refetches(self):
+        # Same ETag, but the kept bytes are corrupt: only the checksum can tell
+        self.write_partial(os.urandom(1000))
+        self.assertEqual(self.download(sha256=self.sha256), self.payload)
+
+    def test_stale_parallel_ranges_are_refetched(self):
+        with open(self.part_path, "wb") as f:
+            f.write(b"x" * 5000)
+        with open(f"{self.part_path}.ranges", "w", encoding="utf-8") as f:
+            json.dump(
+                {"total_size": 5000, "chunk_size": 1000, "etag": '"v1"', "last_modified": None, "completed": [0, 1, 2]},
+                f,
+            )
+        self.assertEqual(self.download(workers=4), self.payload)
+        self.assert_no_sidecars()
+
+    def test_checksum_mismatch_raises(self):
+        with self.assertRaises(RuntimeError):
+            self.download(sha256="0" * 64)
+        self.assertFalse(os.path.exists(self.destination))
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Tests for HttpJsonCache against a local JSON server.
+
+    python -m pytest -q test_http_cache.py
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http_cache import HttpJsonCache
+
+
+class JsonRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the server's routes ({path: {"status", "body", "etag"}}) and answers a matching
+    If-None-Match with 304, like PyPI and the GitHub API. Every request is recorded.
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        route = self.server.routes.get(self.path)
+        if route is None:
+            self.send_error(404)
+            return
+        status = route.get("status", 200)
+        etag = route.get("etag")
+        if status == 200 and etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = json.dumps(route.get("body", {})).encode("utf-8") if status == 200 else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_json_server(routes):
+    """
+    Starts a JsonRequestHandler server on a free loopback port in a daemon thread.
+    :param routes: Mapping of request path to {"status", "body", "etag"}; it can be changed while the server runs.
+    :return: The server; server.requests lists the (path, headers) of every request.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), JsonRequestHandler)
+    server.daemon_threads = True
+    server.routes = routes
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class HttpJsonCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = start_json_server({"/data": {"body": {"version": 1}, "etag": '"a"'}})
+        self.url = f"http://127.0.0.1:{self.server.server_port}/data"
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.temp_dir.name, "http_cache.json")
+        self.cache = HttpJsonCache(self.cache_file)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def test_fresh_entry_skips_network(self):
+        self.assertEqual(self.cache.get_json(self.url, 3600), {"version": 1})
+        self.assertEqual(self.cache.get_json(self.url, 3600), {"version": 1})
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_expired_entry_is_revalidated(self):
+        self.cache.get_json(self.url, 3600)
+        entries = self.cache._load()
+        entries[self.url]["fetched_at"] = time.time() - 7200
+
+        self.assertEqual(self.cache.get_json(self.url, 3600), {"version": 1})
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.server.requests[1][1].get("If-None-Match"), '"a"')
+        # A 304 restarts the TTL
+        self.assertEqual(self.cache.get_json(self.url, 3600), {"version": 1})
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_changed_resource_replaces_entry(self):
+        self.cache.get_json(self.url, 0)
+        self.server.routes["/data"] = {"body": {"version": 2}, "etag": '"b"'}
+        self.assertEqual(self.cache.get_json(self.url, 0), {"version": 2})
+        self.assertEqual(HttpJsonCache(self.cache_file).get_json(self.url, 3600), {"version": 2})
+
+    def test_server_error_uses_cached_copy(self):
+        self.cache.get_json(self.url, 0)
+        for status in (429, 500, 503):
+            self.server.routes["/data"] = {"status": status}
+            self.assertEqual(self.cache.get_json(self.url, 0), {"version": 1})
+
+    def test_unreachable_server_uses_cached_copy(self):
+        self.cache.get_json(self.url, 0)
+        self.server.shutdown()
+        self.server.server_close()
+        self.assertEqual(self.cache.get_json(self.url, 0, timeout=2), {"version": 1})
+
+    def test_error_without_cached_copy_raises(self):
+        self.server.routes["/data"] = {"status": 503}
+        with self.assertRaises(OSError):
+            self.cache.get_json(self.url, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
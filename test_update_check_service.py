@@ -0,0 +1,107 @@
+"""
+Tests for UpdateCheckService against a local stand-in for PyPI, the GitHub API and Ollama.
+
+    python -m pytest -q test_update_check_service.py
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+from http_cache import HttpJsonCache
+from installer_openwebui import OpenWebUIInstaller
+from state_probe import InstallState
+from test_http_cache import start_json_server
+from update_check_service import UpdateCheckService
+
+
+def pypi_release(version, size):
+    return [{"filename": f"open_webui-{version}-py3-none-any.whl", "size": size, "yanked": False}]
+
+
+class UpdateCheckServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = start_json_server({
+            "/pypi/open-webui/json": {
+                "body": {"releases": {"0.5.0": pypi_release("0.5.0", 100), "0.6.0": pypi_release("0.6.0", 200)}},
+                "etag": '"pypi"',
+            },
+            "/repos/ollama/ollama/releases/latest": {"body": {"tag_name": "v0.9.0"}, "etag": '"gh"'},
+            "/api/version": {"body": {"version": "0.8.0"}},
+        })
+        base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.service = UpdateCheckService(timeout=2)
+        self.service.OLLAMA_RELEASES_URL = f"{base_url}/repos/ollama/ollama/releases/latest"
+        self.service.OLLAMA_LOCAL_URL = f"{base_url}/api/version"
+        cache = HttpJsonCache(os.path.join(self.temp_dir.name, "http_cache.json"))
+        self.patches = [
+            mock.patch.object(OpenWebUIInstaller, "PYPI_URL", f"{base_url}/pypi/open-webui/json"),
+            mock.patch.object(self.service.config, "http_cache", cache),
+            mock.patch.object(self.service.config, "openwebui_update_channel", "stable"),
+            mock.patch.object(self.service.config, "openwebui_max_version", None),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in reversed(self.patches):
+            patch.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def state(self, openwebui_version=None):
+        state = InstallState()
+        state.openwebui_version = openwebui_version
+        state.openwebui_installed = openwebui_version is not None
+        return state
+
+    def test_open_webui_update_available(self):
+        result = self.service.check_open_webui(self.state("0.5.0"))
+        self.assertIsNone(result.error)
+        self.assertTrue(result.update_available)
+        self.assertEqual(result.latest, "0.6.0")
+        self.assertEqual(result.download_size, 200)
+
+    def test_open_webui_up_to_date(self):
+        result = self.service.check_open_webui(self.state("0.6.0"))
+        self.assertFalse(result.update_available)
+        self.assertEqual(result.latest, "0.6.0")
+
+    def test_open_webui_not_installed_skips_network(self):
+        result = self.service.check_open_webui(self.state())
+        self.assertIsNone(result.installed)
+        self.assertEqual(self.server.requests, [])
+
+    def test_pypi_error_is_reported_in_result(self):
+        self.server.routes["/pypi/open-webui/json"] = {"status": 503}
+        results = self.service.check_all(self.state("0.5.0"))
+        self.assertIsNotNone(results["open-webui"].error)
+        self.assertFalse(results["open-webui"].update_available)
+        # The other checks are not held back by the failure
+        self.assertTrue(results["ollama"].update_available)
+
+    def test_pypi_error_uses_cached_metadata(self):
+        self.service.check_open_webui(self.state("0.5.0"))
+        self.server.routes["/pypi/open-webui/json"] = {"status": 503}
+        with mock.patch.object(self.service.config, "update_check_ttl", 0):
+            result = self.service.check_open_webui(self.state("0.5.0"))
+        self.assertIsNone(result.error)
+        self.assertTrue(result.update_available)
+
+    def test_ollama_update_available(self):
+        result = self.service.check_ollama()
+        self.assertEqual((result.installed, result.latest), ("0.8.0", "0.9.0"))
+        self.assertTrue(result.update_available)
+
+    def test_ollama_not_running(self):
+        del self.server.routes["/api/version"]
+        result = self.service.check_ollama()
+        self.assertIsNone(result.installed)
+        self.assertFalse(result.update_available)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import json
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+from AppConfig import AppConfig
+from installer_openwebui import OpenWebUIInstaller
+from installer_pipelines import PipelinesInstaller
+from version_policy import VersionPolicy
+
+
+class UpdateCheckResult:
+    """
+    The outcome of one component's update check.
+    """
+
+    def __init__(self, name, installed=None, latest=None, update_available=False, error=None, download_size=None):
+        self.name = name
+        self.installed = installed
+        self.latest = latest
+        self.update_available = update_available
+        self.error = error
+        self.download_size = download_size  # Bytes, when the release metadata reports it
+
+    def __str__(self):
+        if self.error:
+            return f"{self.name}: check failed ({self.error})"
+        return (
+            f"{self.name}: installed {self.installed or 'none'}, latest {self.latest or 'unknown'}, "
+            f"update available: {self.update_available}"
+        )
+
+
+class UpdateCheckService:
+    """
+    Checks Open WebUI, Pipelines and Ollama for updates concurrently.
+
+    Release metadata comes from AppConfig.http_cache, so repeated startups within the TTL
+    stay offline and later ones only revalidate with If-None-Match. Every check has its
+    own timeout; a slow or failing check is reported in its result and never holds back
+    the others. The URLs are attributes so a local HTTP server can stand in for them.
+    """
+
+    OLLAMA_RELEASES_URL = "https://api.github.com/repos/ollama/ollama/releases/latest"
+    OLLAMA_LOCAL_URL = "http://127.0.0.1:11434/api/version"
+
+    def __init__(self, timeout=10):
+        """
+        :param timeout: Timeout in seconds for each check.
+        """
+        self.config = AppConfig()
+        self.timeout = timeout
+
+    def check_all(self, state=None):
+        """
+        Runs all update checks concurrently.
+        :param state: Optional InstallState from the startup probe, used to skip components that are not installed.
+        :return: Dictionary mapping "open-webui", "pipelines" and "ollama" to UpdateCheckResult.
+        """
+        checks = {
+            "open-webui": lambda: self.check_open_webui(state),
+            "pipelines": lambda: self.check_pipelines(state),
+            "ollama": self.check_ollama,
+        }
+        executor = ThreadPoolExecutor(max_workers=len(checks))
+        futures = {name: executor.submit(check) for name, check in checks.items()}
+        # Allow for a request plus a revalidation; stragglers are reported as timed out
+        wait(futures.values(), timeout=self.timeout * 2)
+        executor.shutdown(wait=False)
+
+        results = {}
+        for name, future in futures.items():
+            if not future.done():
+                results[name] = UpdateCheckResult(name, error="timed out")
+                continue
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = UpdateCheckResult(name, error=str(e))
+            print(results[name])
+        return results
+
+    def check_in_background(self, root, callback, state=None):
+        """
+        Runs check_all on a background thread and delivers the results on the Tkinter main thread.
+        :param root: A Tkinter widget used to schedule the callback on the main thread.
+        :param callback: Function called as callback(results) once all checks finished.
+        """
+        def check_task():
+            results = self.check_all(state)
+            root.after(0, callback, results)
+
+        threading.Thread(target=check_task, daemon=True).start()
+
+    def check_open_webui(self, state=None):
+        installer = OpenWebUIInstaller()
+        installed = state.openwebui_version if state else installer.get_installed_version()
+        if not installed:
+            return UpdateCheckResult("open-webui")
+        target = installer.get_update_target(installed, timeout=self.timeout)
+        if target is None:
+            return UpdateCheckResult("open-webui", installed, installed)
+        return UpdateCheckResult("open-webui", installed, target.version, True, download_size=target.download_size)
+
+    def check_pipelines(self, state=None):
+        installer = PipelinesInstaller()
+        installed = state.pipelines_head if state else installer.get_local_head()
+        if not installed:
+            return UpdateCheckResult("pipelines")
+        latest = installer.get_remote_head()
+        return UpdateCheckResult("pipelines", installed, latest, installed != latest)
+
+    def check_ollama(self):
+        """
+        Compares the version reported by a running Ollama server with the latest GitHub release.
+        Ollama is a separate Windows application, so it is only checked while it is running.
+        """
+        try:
+            with urllib.request.urlopen(self.OLLAMA_LOCAL_URL, timeout=2) as response:
+                installed = json.loads(response.read().decode("utf-8")).get("version")
+        except (OSError, ValueError):
+            return UpdateCheckResult("ollama")
+
+        release = self.config.http_cache.get_json(
+            self.OLLAMA_RELEASES_URL,
+            self.config.update_check_ttl,
+            self.timeout,
+            headers={"Accept": "application/vnd.github+json"},
+        )
+        latest = release["tag_name"].lstrip("v")
+        return UpdateCheckResult("ollama", installed, latest, bool(installed) and VersionPolicy.is_newer(latest, installed))
@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+from dist_metadata import DistInfoReader
+
+
+class UpdatePlan:
+    """
+    The packages an update would change in one environment.
+    """
+
+    def __init__(self, env_path, changes):
+        """
+        :param env_path: The prefix of the environment.
+        :param changes: List of (name, installed_version, target_version) tuples; installed_version is None for new packages.
+        """
+        self.env_path = env_path
+        self.changes = changes
+
+    @property
+    def is_empty(self):
+        return not self.changes
+
+    def pins(self):
+        """
+        Returns the exact requirements that apply the plan, e.g. ["open-webui==0.5.4"].
+        """
+        return [f"{name}=={target}" for name, _, target in self.changes]
+
+    def summary(self):
+        if self.is_empty:
+            return "Everything is up to date."
+        lines = [f"{len(self.changes)} package(s) to update:"]
+        for name, installed, target in self.changes:
+            lines.append(f"  {name}: {installed or 'not installed'} -> {target}")
+        return "\n".join(lines)
+
+
+class UpdatePlanner:
+    """
+    Works out which packages an update actually changes, so only those are reinstalled.
+
+    The target set comes from `pip install --dry-run --report`, which resolves without
+    installing anything. It is diffed against the versions recorded in the environment's
+    dist-info metadata; unchanged packages are left alone and the changed ones are
+    installed with --no-deps, since the resolve already picked their dependencies.
+    """
+
+    def __init__(self, installer):
+        """
+        :param installer: The BaseInstaller used to run pip and install packages.
+        """
+        self.installer = installer
+
+    def resolve(self, env_path, args):
+        """
+        Resolves an install without running it.
+
+        :param env_path: The prefix of the environment.
+        :param args: pip install arguments describing the target, e.g. ["--upgrade", "open-webui"].
+        :return: The parsed `pip install --report` JSON; its "install" list holds the packages pip would install.
+        :raises: subprocess.CalledProcessError if pip cannot resolve the target.
+        """
+        python_executable = self.installer.find_env_python(env_path)
+        fd, report_path = tempfile.mkstemp(prefix="update-plan-", suffix=".json")
+        os.close(fd)
+        try:
+            # The report goes to a file, since stdout only keeps the tail of the output
+            self.installer.run_command(
+                [python_executable, "-m", "pip", "install", "--dry-run", "--quiet", "--report", report_path, *args]
+            )
+            with open(report_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        finally:
+            os.remove(report_path)
+
+    def plan(self, env_path, args):
+        """
+        Resolves an install without running it and diffs the result against the environment.
+
+        :param env_path: The prefix of the environment.
+        :param args: pip install arguments describing the target, e.g. ["--upgrade", "open-webui"].
+        :return: An UpdatePlan.
+        :raises: subprocess.CalledProcessError if pip cannot resolve the target.
+        """
+        report = self.resolve(env_path, args)
+        reader = DistInfoReader(env_path)
+        changes = []
+        for item in report.get("install", []):
+            name = reader.normalize_name(item["metadata"]["name"])
+            target = item["metadata"]["version"]
+            try:
+                installed = reader.get_version(name)
+            except LookupError:
+                installed = None
+            if installed != target:
+                changes.append((name, installed, target))
+        return UpdatePlan(env_path, sorted(changes))
+
+    def show(self, plan, step_text):
+        """
+        Reports a plan before anything is installed.
+        """
+        print(plan.summary())
+        if self.installer.status_updater:
+            first_line = plan.summary().splitlines()[0]
+            self.installer.status_updater.update_status(step_text, first_line, 0)
+
+    def apply(self, plan, step_text):
+        """
+        Installs exactly the packages in a plan.
+        :return: True if anything was installed, False if the plan was empty.
+        """
+        if plan.is_empty:
+            return False
+        self.installer.install_packages(
+            plan.env_path,
+            ["--no-deps", *plan.pins()],
+            step_text,
+            expected_packages=len(plan.changes),
+        )
+        return True
@@ -0,0 +1,105 @@
+from packaging.version import InvalidVersion, Version
+
+
+class UpdateTarget:
+    """
+    A release an installation may update to.
+    """
+
+    def __init__(self, version, download_size=None):
+        """
+        :param version: The release's version string.
+        :param download_size: Size in bytes of the release's own distribution file, if PyPI reports it.
+        """
+        self.version = version
+        self.download_size = download_size
+
+    def __str__(self):
+        if self.download_size is None:
+            return self.version
+        return f"{self.version} ({self.download_size / 1024 ** 2:.1f} MB download)"
+
+
+class VersionPolicy:
+    """
+    Decides which release, if any, an installation should update to.
+
+    Versions are compared with PEP 440 semantics, so "0.5.10" is newer than "0.5.9" and a
+    locally newer or pre-release build is never "updated" to an older stable release.
+    The stable channel ignores pre-releases; the prerelease channel includes them.
+    An optional maximum version caps updates for installs pinned below a known-bad release.
+    """
+
+    CHANNELS = ("stable", "prerelease")
+
+    def __init__(self, channel="stable", max_version=None):
+        """
+        :param channel: "stable" or "prerelease".
+        :param max_version: Optional highest version updates may go to, e.g. "0.5.20".
+        """
+        if channel not in self.CHANNELS:
+            raise ValueError(f"Unknown update channel {channel}. Expected one of {self.CHANNELS}.")
+        self.channel = channel
+        self.max_version = Version(max_version) if max_version else None
+
+    def allows(self, version):
+        """
+        Returns True if a release is on this policy's channel and below its maximum version.
+        """
+        if version.is_prerelease and self.channel != "prerelease":
+            return False
+        return self.max_version is None or version <= self.max_version
+
+    def select_target(self, installed_version, releases):
+        """
+        Picks the newest allowed release that is newer than the installed version.
+
+        :param installed_version: The installed version string.
+        :param releases: The "releases" mapping of PyPI's JSON API (version -> list of files).
+        :return: An UpdateTarget, or None if no allowed release is newer.
+        """
+        candidates = []
+        for version_string, files in releases.items():
+            try:
+                version = Version(version_string)
+            except InvalidVersion:
+                continue
+            # Releases without files or with every file yanked are not installable
+            if not files or all(file_info.get("yanked") for file_info in files):
+                continue
+            if self.allows(version):
+                candidates.append((version, version_string, files))
+        if not candidates:
+            return None
+
+        version, version_string, files = max(candidates, key=lambda candidate: candidate[0])
+        try:
+            if Version(installed_version) >= version:
+                return None
+        except InvalidVersion:
+            pass  # An unparseable local build is treated as older than any release
+        return UpdateTarget(version_string, self.download_size(files))
+
+    @staticmethod
+    def is_newer(candidate_version, installed_version):
+        """
+        Returns True if candidate_version is a newer release than installed_version.
+        Unparseable versions fall back to a plain inequality check.
+        """
+        try:
+            return Version(candidate_version) > Version(installed_version)
+        except InvalidVersion:
+            return candidate_version != installed_version
+
+    @staticmethod
+    def download_size(files):
+        """
+        Returns the size of the file pip would fetch for a release: a pure Python wheel if there is one, otherwise the sdist.
+        """
+        for file_info in files:
+            if file_info.get("filename", "").endswith("-py3-none-any.whl") and not file_info.get("yanked"):
+                return file_info.get("size")
+        for file_info in files:
+            if file_info.get("packagetype") == "sdist" and not file_info.get("yanked"):
+                return file_info.get("size")
+        return None